@@ -20,6 +20,29 @@ class TushareAvailableIndicesQueryParams(AvailableIndicesQueryParams):
 
     Source: https://tushare.pro/document/2?doc_id=94
     """
+
+    __json_schema_extra__ = {
+        "market": {"multiple_items_allowed": True},
+        "publisher": {"multiple_items_allowed": True},
+        "category": {"multiple_items_allowed": True},
+    }
+
+    market: Optional[str] = Field(
+        default=None,
+        description="Market of the index: MSCI, CSI, SSE, SZSE, CICC, SW or OTH.",
+    )
+    publisher: Optional[str] = Field(
+        default=None,
+        description="Publisher of the index, e.g. 中证公司.",
+    )
+    category: Optional[str] = Field(
+        default=None,
+        description="Category of the index, e.g. 规模指数.",
+    )
+    name: Optional[str] = Field(
+        default=None,
+        description="Text the short or full name of the index contains.",
+    )
     use_cache: bool = Field(
         default=True,
         description="Whether to use a cached request. The quote is cached for one hour.",
@@ -28,6 +51,10 @@ class TushareAvailableIndicesQueryParams(AvailableIndicesQueryParams):
 class TushareAvailableIndicesData(AvailableIndicesData):
     """Tushare Available Indices Data."""
 
+    __alias_dict__ = {
+        "symbol": "ts_code",
+    }
+
 class TushareAvailableIndicesFetcher(
     Fetcher[
         TushareAvailableIndicesQueryParams,
@@ -48,10 +75,17 @@ class TushareAvailableIndicesFetcher(
         **kwargs: Any,
     ) -> List[Dict]:
         """Extract the data."""
-        from openbb_tushare.utils.ts_available_indices import get_available_indices
+        from openbb_tushare.utils.reference_data import get_reference_registry
+        from openbb_tushare.utils.ts_available_indices import query_available_indices
         api_key = credentials.get("tushare_api_key") if credentials else ""
 
-        return get_available_indices(query.use_cache, api_key=api_key).to_dict(orient="records")
+        if query.market or query.publisher or query.category or query.name:
+            # Filtered in SQL, only the matching rows are materialized
+            data = query_available_indices(query.market, query.publisher, query.category, query.name,
+                                           use_cache=query.use_cache, api_key=api_key)
+        else:
+            data = get_reference_registry().get("indices", use_cache=query.use_cache, api_key=api_key)
+        return data.astype(object).where(data.notna(), None).to_dict(orient="records")
 
     @staticmethod
     def transform_data(
@@ -2,7 +2,7 @@
 
 # pylint: disable=unused-argument
 import pandas as pd
-from datetime import datetime
+from datetime import date as dateType, datetime
 from typing import Any, Literal, Optional
 
 from openbb_core.provider.abstract.fetcher import Fetcher
@@ -21,9 +21,10 @@ class TushareBalanceSheetQueryParams(BalanceSheetQueryParams):
     """
 
     __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
         "period": {
             "choices": ["annual", "quarter"],
-        }
+        },
     }
 
     period: Literal["annual", "quarter"] = Field(
@@ -39,6 +40,26 @@ class TushareBalanceSheetQueryParams(BalanceSheetQueryParams):
         default=True,
         description="Whether to use a cached request. The quote is cached for one hour.",
     )
+    as_of: Optional[dateType] = Field(
+        default=None,
+        description="Return the statements as they were known on this date, ignoring later restatements"
+        " and reports announced after it. Use for backtests without lookahead bias.",
+    )
+    max_workers: int = Field(
+        default=8,
+        description="Maximum number of symbols fetched concurrently. Values above the size of the shared"
+        " thread pool (the TUSHARE_MAX_WORKERS environment variable, 8 by default) are lowered to it.",
+        gt=0,
+    )
+
+    @field_validator("max_workers")
+    @classmethod
+    def validate_max_workers(cls, v: int) -> int:
+        """Clamp to the size of the shared thread pool."""
+        # pylint: disable=import-outside-toplevel
+        from openbb_tushare.utils.concurrency import clamp_workers
+
+        return clamp_workers(v)
 
 
 class TushareBalanceSheetData(BalanceSheetData):
@@ -67,19 +88,30 @@ class TushareBalanceSheetFetcher(
         return TushareBalanceSheetQueryParams(**params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         query: TushareBalanceSheetQueryParams,
         credentials: Optional[dict[str, str]],
         **kwargs: Any,
     ) -> list[dict]:
         """Extract the data from the Tushare endpoints."""
         # pylint: disable=import-outside-toplevel
+        from openbb_core.provider.utils.errors import EmptyDataError
+        from openbb_tushare.utils.concurrency import gather_symbols
         from openbb_tushare.utils.ts_balance_sheet import get_balance_sheet
         api_key = credentials.get("tushare_api_key") if credentials else ""
 
-        balance_sheet = get_balance_sheet(query.symbol, query.period, query.limit, query.use_cache, api_key=api_key)
-
-        return balance_sheet.to_dict(orient="records")
+        def get_one(symbol: str) -> list[dict]:
+            """Get the data for one ticker symbol."""
+            data = get_balance_sheet(
+                symbol, query.period, query.limit, query.use_cache, api_key=api_key, as_of=query.as_of
+            )
+            if data.empty:
+                raise EmptyDataError(f"No balance sheet data for {symbol}")
+            return data.assign(symbol=symbol).to_dict(orient="records")
+
+        # Uncached symbols are downloaded on a bounded thread pool, rows keep the symbol order
+        symbols = [s.strip() for s in query.symbol.split(",") if s.strip()]
+        return await gather_symbols(get_one, symbols, max_workers=query.max_workers)
 
     @staticmethod
     def transform_data(
@@ -0,0 +1,137 @@
+"""Tushare Dividend Calendar Model."""
+
+# pylint: disable=unused-argument
+from datetime import (
+    date as dateType,
+    datetime,
+    timedelta,
+)
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import Field, field_validator
+
+from openbb_core.provider.abstract.fetcher import Fetcher
+from openbb_core.provider.standard_models.calendar_dividend import (
+    CalendarDividendData,
+    CalendarDividendQueryParams,
+)
+
+import logging
+from mysharelib.tools import setup_logger
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+
+class TushareCalendarDividendQueryParams(CalendarDividendQueryParams):
+    """Tushare Dividend Calendar Query.
+
+    Source: https://tushare.pro/document/2?doc_id=103
+    """
+
+    __json_schema_extra__ = {
+        "by": {
+            "choices": ["ex_date", "record_date"],
+        },
+    }
+
+    by: Literal["ex_date", "record_date"] = Field(
+        default="ex_date",
+        description="Date the start_date and end_date range applies to, the ex-dividend date or the record date.",
+    )
+    use_cache: bool = Field(
+        default=True,
+        description="Whether to use the dividends already ingested. Dates not passed yet are synced again every 12 hours.",
+    )
+
+
+class TushareCalendarDividendData(CalendarDividendData):
+    """Tushare Dividend Calendar Data."""
+
+    __alias_dict__ = {
+        "amount": "cash_div",
+        "payment_date": "pay_date",
+        "declaration_date": "imp_ann_date",
+    }
+
+    amount_before_tax: Optional[float] = Field(
+        default=None,
+        description="The dividend amount per share before tax.",
+        alias="cash_div_tax",
+    )
+    stock_dividend: Optional[float] = Field(
+        default=None,
+        description="The stock dividend per share.",
+        alias="stk_div",
+    )
+
+    @field_validator(
+        "ex_dividend_date",
+        "record_date",
+        "payment_date",
+        "declaration_date",
+        mode="before",
+        check_fields=False,
+    )
+    @classmethod
+    def date_validate(cls, v):  # pylint: disable=E0213
+        """Return date object from a YYYYMMDD string."""
+        if isinstance(v, str):
+            return datetime.strptime(v, "%Y%m%d").date() if v else None
+        return v
+
+
+class TushareCalendarDividendFetcher(
+    Fetcher[
+        TushareCalendarDividendQueryParams,
+        List[TushareCalendarDividendData],
+    ]
+):
+    """Tushare Dividend Calendar Fetcher."""
+
+    @staticmethod
+    def transform_query(params: Dict[str, Any]) -> TushareCalendarDividendQueryParams:
+        """Transform the query, by default the next 30 days."""
+        transformed_params = params.copy()
+        today = datetime.now().date()
+        if transformed_params.get("start_date") is None:
+            transformed_params["start_date"] = today
+        if transformed_params.get("end_date") is None:
+            start_date = transformed_params["start_date"]
+            if isinstance(start_date, str):
+                start_date = dateType.fromisoformat(start_date)
+            transformed_params["end_date"] = start_date + timedelta(days=30)
+        return TushareCalendarDividendQueryParams(**transformed_params)
+
+    @staticmethod
+    def extract_data(
+        query: TushareCalendarDividendQueryParams,
+        credentials: Optional[Dict[str, str]],
+        **kwargs: Any,
+    ) -> List[Dict]:
+        """Extract the raw data from Tushare."""
+        # pylint: disable=import-outside-toplevel
+        from openbb_tushare.utils.dividend_store import get_dividend_calendar
+        from openbb_tushare.utils.reference_data import get_reference_registry
+        api_key = credentials.get("tushare_api_key") if credentials else ""
+
+        data = get_dividend_calendar(query.start_date, query.end_date, query.by, query.use_cache, api_key=api_key)
+        data = data[data["cash_div"].fillna(0) != 0]
+        try:
+            names = get_reference_registry().derived(
+                "symbols", "names", lambda df: dict(zip(df["ts_code"], df["name"])), api_key=api_key
+            )
+            data = data.assign(name=data["ts_code"].map(names))
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning(f"Could not load the symbol names: {e}")
+        data = data.rename(columns={"ts_code": "symbol", "ex_date": "ex_dividend_date"})
+        return data.astype(object).where(data.notna(), None).to_dict(orient="records")
+
+    @staticmethod
+    def transform_data(
+        query: TushareCalendarDividendQueryParams,
+        data: List[Dict],
+        **kwargs: Any,
+    ) -> List[TushareCalendarDividendData]:
+        """Transform the data."""
+        return [TushareCalendarDividendData.model_validate(d) for d in data]
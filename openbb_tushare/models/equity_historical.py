@@ -3,7 +3,7 @@
 # pylint: disable=unused-argument
 
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, Iterator, List, Literal, Optional
 from warnings import warn
 
 from dateutil.relativedelta import relativedelta
@@ -29,12 +29,18 @@ class TushareEquityHistoricalQueryParams(EquityHistoricalQueryParams):
     __json_schema_extra__ = {
         "symbol": {"multiple_items_allowed": True},
         "period": {"choices": ["daily", "weekly", "monthly"]},
+        "adjust": {"choices": ["", "qfq", "hfq"]},
     }
 
     period: Literal["daily", "weekly", "monthly"] = Field(
         default="daily", description=QUERY_DESCRIPTIONS.get("period", "")
     )
 
+    adjust: Literal["", "qfq", "hfq"] = Field(
+        default="",
+        description="Price adjustment: '' for unadjusted, 'qfq' for forward adjusted, 'hfq' for backward adjusted prices.",
+    )
+
     use_cache: bool = Field(
         default=True,
         description="Whether to use a cached request. The quote is cached for one hour.",
@@ -87,16 +93,38 @@ class TushareEquityHistoricalFetcher(
         **kwargs: Any,
     ) -> List[Dict]:
         """Return the raw data from the Tushare endpoint."""
-        from openbb_tushare.utils.ts_equity_historical import get_from_cache
+        from openbb_tushare.utils.ts_equity_historical import iter_from_cache
 
         api_key = credentials.get("tushare_api_key") if credentials else ""
-        data = get_from_cache(ts_code=query.symbol, start_date=query.start_date, end_date=query.end_date, 
-                           api_key=api_key, period="daily", use_cache=query.use_cache)
-
-        if data.empty:
+        data: List[Dict] = []
+        # Convert chunk by chunk so the full DataFrame and the records never coexist
+        for chunk in iter_from_cache(ts_code=query.symbol, start_date=query.start_date, end_date=query.end_date,
+                                     api_key=api_key, period=query.period, use_cache=query.use_cache,
+                                     adjust=query.adjust):
+            data.extend(chunk.to_dict(orient="records"))
+
+        if not data:
             raise EmptyDataError()
 
-        return data.to_dict(orient="records")
+        return data
+
+    @classmethod
+    def stream_data(
+        cls,
+        params: Dict[str, Any],
+        credentials: Optional[Dict[str, str]] = None,
+        chunk_rows: int = 5000,
+        chunk_by: Literal["rows", "month"] = "rows",
+    ) -> Iterator[List[TushareEquityHistoricalData]]:
+        """Yield the transformed data in bounded chunks, keeping memory flat for long ranges."""
+        from openbb_tushare.utils.ts_equity_historical import iter_from_cache
+
+        query = cls.transform_query(params)
+        api_key = credentials.get("tushare_api_key") if credentials else ""
+        for chunk in iter_from_cache(ts_code=query.symbol, start_date=query.start_date, end_date=query.end_date,
+                                     api_key=api_key, period=query.period, use_cache=query.use_cache,
+                                     adjust=query.adjust, chunk_rows=chunk_rows, chunk_by=chunk_by):
+            yield cls.transform_data(query, chunk.to_dict(orient="records"))
 
 
     @staticmethod
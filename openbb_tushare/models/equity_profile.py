@@ -23,6 +23,21 @@ class TushareEquityProfileQueryParams(EquityInfoQueryParams):
         default=True,
         description="Whether to use a cached request. The quote is cached for one hour.",
     )
+    max_workers: int = Field(
+        default=8,
+        description="Maximum number of symbols fetched concurrently. Values above the size of the shared"
+        " thread pool (the TUSHARE_MAX_WORKERS environment variable, 8 by default) are lowered to it.",
+        gt=0,
+    )
+
+    @field_validator("max_workers")
+    @classmethod
+    def validate_max_workers(cls, v: int) -> int:
+        """Clamp to the size of the shared thread pool."""
+        # pylint: disable=import-outside-toplevel
+        from openbb_tushare.utils.concurrency import clamp_workers
+
+        return clamp_workers(v)
 
 class TushareEquityProfileData(EquityInfoData):
     """Tushare Equity Profile Data."""
@@ -68,45 +83,24 @@ class TushareEquityProfileFetcher(
     ) -> List[Dict]:
         """Extract the raw data from Tushare."""
         # pylint: disable=import-outside-toplevel
-        import asyncio  # noqa
-        from openbb_core.app.model.abstract.error import OpenBBError
         from openbb_core.provider.utils.errors import EmptyDataError
-        from warnings import warn
+        from openbb_tushare.utils.concurrency import gather_symbols
 
         api_key = credentials.get("tushare_api_key") if credentials else ""
 
         symbols = query.symbol.split(",")
-        results = []
-        messages: list = []
 
-        async def get_one(symbol, api_key: str, use_cache: bool = True) -> None:
-            from openbb_tushare.utils.ts_equity_profile import get_equity_profile
+        def get_one(symbol: str) -> List[Dict]:
             """Get the data for one ticker symbol."""
-            try:
-                result: dict = {}
-                result = get_equity_profile(symbol, api_key=api_key, use_cache=use_cache).to_dict(orient="records")[0]
-                if result:
-                    results.append(result)
-            except Exception as e:
-                messages.append(
-                    f"Error getting data for {symbol} -> {e.__class__.__name__}: {e}"
-                )
-
-        tasks = [get_one(symbol, api_key=api_key, use_cache=query.use_cache) for symbol in symbols]
-
-        await asyncio.gather(*tasks)
-
-        if not results and messages:
-            raise OpenBBError("\n".join(messages))
-
-        if not results and not messages:
-            raise EmptyDataError("No data was returned for any symbol")
+            from openbb_tushare.utils.ts_equity_profile import get_equity_profile
 
-        if results and messages:
-            for message in messages:
-                warn(message)
+            data = get_equity_profile(symbol, api_key=api_key, use_cache=query.use_cache)
+            if data.empty:
+                raise EmptyDataError(f"No profile data for {symbol}")
+            return data.to_dict(orient="records")[:1]
 
-        return results
+        # Blocking SQLite/HTTP work runs on a bounded thread pool, results keep the symbol order
+        return await gather_symbols(get_one, symbols, max_workers=query.max_workers)
 
     @staticmethod
     def transform_data(
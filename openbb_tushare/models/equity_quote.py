@@ -25,7 +25,8 @@ class TushareEquityQuoteQueryParams(EquityQuoteQueryParams):
 
     use_cache: bool = Field(
         default=True,
-        description="Whether to use a cached request. The quote is cached for one hour.",
+        description="Whether to use a cached quote. Quotes are cached for a few seconds during trading"
+        " sessions and until the next session opens when the market is closed.",
     )
 
 
@@ -55,23 +56,11 @@ class TushareEquityQuoteFetcher(
     ) -> List[Dict]:
         """Extract the raw data from Tushare."""
         # pylint: disable=import-outside-toplevel
-        from openbb_tushare.utils.ts_equity_quote import get_one
-        import pandas as pd
+        from openbb_tushare.utils.ts_equity_quote import get_quotes
 
         api_key = credentials.get("tushare_api_key") if credentials else ""
-        symbols = query.symbol.split(",")
-        all_data = []
-
-        for symbol in symbols:
-            try:        
-                data = get_one(symbol, query.use_cache, api_key=api_key)
-                all_data.append(data.to_dict(orient="records")[0])
-                
-            except Exception as e:
-                print(f"Error fetching data for symbol {symbol}: {e}")
-                continue
-
-        return all_data
+        data = get_quotes(query.symbol.split(","), query.use_cache, api_key=api_key)
+        return data.to_dict(orient="records")
 
     @staticmethod
     def transform_data(
@@ -55,10 +55,17 @@ class TushareEquitySearchFetcher(
     ) -> List[Dict]:
         """Return the raw data from the Tushare endpoint."""
 
-        from openbb_tushare.utils.ts_equity_search import get_symbols
+        from openbb_tushare.utils.symbol_index import search_symbols
         api_key = credentials.get("tushare_api_key") if credentials else ""
 
-        return get_symbols(query.use_cache, api_key=api_key).to_dict(orient="records")
+        data = search_symbols(
+            query.query,
+            limit=query.limit,
+            is_symbol=query.is_symbol,
+            use_cache=query.use_cache,
+            api_key=api_key,
+        )
+        return data.to_dict(orient="records")
 
     @staticmethod
     def transform_data(
@@ -24,9 +24,10 @@ class TushareIncomeStatementQueryParams(IncomeStatementQueryParams):
     """
 
     __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
         "period": {
             "choices": ["annual", "quarter"],
-        }
+        },
     }
 
     period: Literal["annual", "quarter"] = Field(
@@ -37,6 +38,26 @@ class TushareIncomeStatementQueryParams(IncomeStatementQueryParams):
         default=True,
         description="Whether to use a cached request. The quote is cached for one hour.",
     )
+    as_of: Optional[dateType] = Field(
+        default=None,
+        description="Return the statements as they were known on this date, ignoring later restatements"
+        " and reports announced after it. Use for backtests without lookahead bias.",
+    )
+    max_workers: int = Field(
+        default=8,
+        description="Maximum number of symbols fetched concurrently. Values above the size of the shared"
+        " thread pool (the TUSHARE_MAX_WORKERS environment variable, 8 by default) are lowered to it.",
+        gt=0,
+    )
+
+    @field_validator("max_workers")
+    @classmethod
+    def validate_max_workers(cls, v: int) -> int:
+        """Clamp to the size of the shared thread pool."""
+        # pylint: disable=import-outside-toplevel
+        from openbb_tushare.utils.concurrency import clamp_workers
+
+        return clamp_workers(v)
 
 
 class TushareIncomeStatementData(IncomeStatementData):
@@ -65,24 +86,36 @@ class TushareIncomeStatementFetcher(
         return TushareIncomeStatementQueryParams(**params)
 
     @staticmethod
-    async def extract_data(
+    async def aextract_data(
         query: TushareIncomeStatementQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
     ) -> List[Dict]:
         """Return the raw data from the Tushare endpoint."""
+        # pylint: disable=import-outside-toplevel
+        from openbb_core.provider.utils.errors import EmptyDataError
+        from openbb_tushare.utils.concurrency import gather_symbols
         from openbb_tushare.utils.ts_income_statement import get_income_statement
         api_key = credentials.get("tushare_api_key") if credentials else ""
 
-        income_statement = get_income_statement(query.symbol, query.period, query.limit, query.use_cache, api_key=api_key)
+        def get_one(symbol: str) -> List[Dict]:
+            """Get the data for one ticker symbol."""
+            data = get_income_statement(
+                symbol, query.period, query.limit, query.use_cache, api_key=api_key, as_of=query.as_of
+            )
+            if data.empty:
+                raise EmptyDataError(f"No income statement data for {symbol}")
+            return data.assign(symbol=symbol).to_dict(orient="records")
+
+        # Uncached symbols are downloaded on a bounded thread pool, rows keep the symbol order
+        symbols = [s.strip() for s in query.symbol.split(",") if s.strip()]
+        return await gather_symbols(get_one, symbols, max_workers=query.max_workers)
 
-        return income_statement.to_dict(orient="records")
     @staticmethod
     def transform_data(
         query: TushareIncomeStatementQueryParams, data: List[Dict], **kwargs: Any
     ) -> List[TushareIncomeStatementData]:
         """Return the transformed data."""
         for result in data:
-            result.pop("symbol", None)
             result.pop("cik", None)
         return [TushareIncomeStatementData.model_validate(d) for d in data]
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""Tushare Index Constituents Model."""
+
+# pylint: disable=unused-argument
+from datetime import (
+    date as dateType,
+    datetime,
+)
+from typing import Any, Dict, List, Optional
+
+from openbb_core.provider.abstract.fetcher import Fetcher
+from openbb_core.provider.standard_models.index_constituents import (
+    IndexConstituentsData,
+    IndexConstituentsQueryParams,
+)
+from openbb_core.provider.utils.errors import EmptyDataError
+from pydantic import Field, field_validator
+
+import logging
+from mysharelib.tools import setup_logger
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+
+class TushareIndexConstituentsQueryParams(IndexConstituentsQueryParams):
+    """Tushare Index Constituents Query.
+
+    Source: https://tushare.pro/document/2?doc_id=96
+    """
+
+    date: Optional[dateType] = Field(
+        default=None,
+        description="Date of the composition, the latest weight snapshot on or before it is returned."
+        " Defaults to today.",
+    )
+    use_cache: bool = Field(
+        default=True,
+        description="Whether to use the cached weight snapshots.",
+    )
+
+
+class TushareIndexConstituentsData(IndexConstituentsData):
+    """Tushare Index Constituents Data."""
+
+    __alias_dict__ = {
+        "symbol": "con_code",
+        "date": "trade_date",
+    }
+
+    weight: Optional[float] = Field(
+        default=None,
+        description="Weight of the constituent in the index, as a normalized percent.",
+        json_schema_extra={"x-unit_measurement": "percent", "x-frontend_multiply": 100},
+    )
+    date: Optional[dateType] = Field(
+        default=None,
+        description="Date of the weight snapshot.",
+    )
+
+    @field_validator("date", mode="before", check_fields=False)
+    @classmethod
+    def date_validate(cls, v):  # pylint: disable=E0213
+        """Return date object from a YYYYMMDD string."""
+        if isinstance(v, str):
+            return datetime.strptime(v, "%Y%m%d").date() if v else None
+        return v
+
+    @field_validator("weight", mode="before", check_fields=False)
+    @classmethod
+    def weight_validate(cls, v):  # pylint: disable=E0213
+        """Return the weight as a normalized percent."""
+        return v / 100 if v is not None else None
+
+
+class TushareIndexConstituentsFetcher(
+    Fetcher[
+        TushareIndexConstituentsQueryParams,
+        List[TushareIndexConstituentsData],
+    ]
+):
+    """Tushare Index Constituents Fetcher."""
+
+    @staticmethod
+    def transform_query(params: Dict[str, Any]) -> TushareIndexConstituentsQueryParams:
+        """Transform the query params."""
+        return TushareIndexConstituentsQueryParams(**params)
+
+    @staticmethod
+    def extract_data(
+        query: TushareIndexConstituentsQueryParams,
+        credentials: Optional[Dict[str, str]],
+        **kwargs: Any,
+    ) -> List[Dict]:
+        """Extract the raw data from Tushare."""
+        # pylint: disable=import-outside-toplevel
+        from openbb_tushare.utils.index_weights import get_index_constituents
+        from openbb_tushare.utils.reference_data import get_reference_registry
+        api_key = credentials.get("tushare_api_key") if credentials else ""
+
+        data = get_index_constituents(query.symbol, query.date, query.use_cache, api_key=api_key)
+        if data.empty:
+            raise EmptyDataError(f"No constituents for {query.symbol}")
+        try:
+            names = get_reference_registry().derived(
+                "symbols", "names", lambda df: dict(zip(df["ts_code"], df["name"])), api_key=api_key
+            )
+            data = data.assign(name=data["con_code"].map(names))
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning(f"Could not load the symbol names: {e}")
+        return data.astype(object).where(data.notna(), None).to_dict(orient="records")
+
+    @staticmethod
+    def transform_data(
+        query: TushareIndexConstituentsQueryParams,
+        data: List[Dict],
+        **kwargs: Any,
+    ) -> List[TushareIndexConstituentsData]:
+        """Transform the data."""
+        return [TushareIndexConstituentsData.model_validate(d) for d in data]
@@ -0,0 +1,113 @@
+"""Tushare Index Historical Price Model."""
+
+# pylint: disable=unused-argument
+
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+from dateutil.relativedelta import relativedelta
+from openbb_core.provider.abstract.fetcher import Fetcher
+from openbb_core.provider.standard_models.index_historical import (
+    IndexHistoricalData,
+    IndexHistoricalQueryParams,
+)
+from openbb_core.provider.utils.descriptions import QUERY_DESCRIPTIONS
+from openbb_core.provider.utils.errors import EmptyDataError
+from pydantic import Field
+
+
+class TushareIndexHistoricalQueryParams(IndexHistoricalQueryParams):
+    """Tushare Index Historical Price Query.
+
+    Source: https://tushare.pro/document/2?doc_id=95
+    """
+
+    __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
+        "period": {"choices": ["daily", "weekly", "monthly"]},
+    }
+
+    period: Literal["daily", "weekly", "monthly"] = Field(
+        default="daily", description=QUERY_DESCRIPTIONS.get("period", "")
+    )
+
+    use_cache: bool = Field(
+        default=True,
+        description="Whether to use the cached bars. The cache is synced incrementally up to the last session.",
+    )
+
+
+class TushareIndexHistoricalData(IndexHistoricalData):
+    """Tushare Index Historical Price Data."""
+
+    amount: Optional[float] = Field(
+        default=None,
+        description="Amount.",
+    )
+    change: Optional[float] = Field(
+        default=None,
+        description="Change in the price from the previous close.",
+    )
+    change_percent: Optional[float] = Field(
+        default=None,
+        description="Change in the price from the previous close, as a normalized percent.",
+        json_schema_extra={"x-unit_measurement": "percent", "x-frontend_multiply": 100},
+    )
+
+
+class TushareIndexHistoricalFetcher(
+    Fetcher[
+        TushareIndexHistoricalQueryParams,
+        List[TushareIndexHistoricalData],
+    ]
+):
+    """Transform the query, extract and transform the data from the Tushare endpoints."""
+
+    @staticmethod
+    def transform_query(params: Dict[str, Any]) -> TushareIndexHistoricalQueryParams:
+        """Transform the query params."""
+        transformed_params = params
+
+        now = datetime.now().date()
+        if params.get("start_date") is None:
+            transformed_params["start_date"] = now - relativedelta(years=1)
+
+        if params.get("end_date") is None:
+            transformed_params["end_date"] = now
+
+        return TushareIndexHistoricalQueryParams(**transformed_params)
+
+    @staticmethod
+    def extract_data(
+        query: TushareIndexHistoricalQueryParams,
+        credentials: Optional[Dict[str, str]],
+        **kwargs: Any,
+    ) -> List[Dict]:
+        """Return the raw data from the Tushare endpoint."""
+        from openbb_tushare.utils.ts_index_historical import get_index_historical
+
+        api_key = credentials.get("tushare_api_key") if credentials else ""
+        symbols = [symbol.strip() for symbol in query.symbol.split(",") if symbol.strip()]
+        data: List[Dict] = []
+        for symbol in symbols:
+            bars = get_index_historical(symbol, query.start_date, query.end_date, period=query.period,
+                                        use_cache=query.use_cache, api_key=api_key)
+            if len(symbols) > 1:
+                bars = bars.assign(symbol=symbol)
+            data.extend(bars.to_dict(orient="records"))
+
+        if not data:
+            raise EmptyDataError()
+
+        return data
+
+    @staticmethod
+    def transform_data(
+        query: TushareIndexHistoricalQueryParams, data: List[Dict], **kwargs: Any
+    ) -> List[TushareIndexHistoricalData]:
+        """Return the transformed data."""
+
+        return [
+            TushareIndexHistoricalData.model_validate(d)
+            for d in data
+        ]
@@ -3,6 +3,7 @@
 from openbb_core.provider.abstract.provider import Provider
 from openbb_tushare.models.available_indices import TushareAvailableIndicesFetcher
 from openbb_tushare.models.balance_sheet import TushareBalanceSheetFetcher
+from openbb_tushare.models.calendar_dividend import TushareCalendarDividendFetcher
 from openbb_tushare.models.cash_flow import TushareCashFlowStatementFetcher
 from openbb_tushare.models.equity_historical import TushareEquityHistoricalFetcher
 from openbb_tushare.models.equity_profile import TushareEquityProfileFetcher
@@ -10,6 +11,8 @@ from openbb_tushare.models.equity_quote import TushareEquityQuoteFetcher
 from openbb_tushare.models.equity_search import TushareEquitySearchFetcher
 from openbb_tushare.models.historical_dividends import TushareHistoricalDividendsFetcher
 from openbb_tushare.models.income_statement import TushareIncomeStatementFetcher
+from openbb_tushare.models.index_constituents import TushareIndexConstituentsFetcher
+from openbb_tushare.models.index_historical import TushareIndexHistoricalFetcher
 
 # mypy: disable-error-code="list-item"
 
@@ -23,6 +26,7 @@ provider = Provider(
     fetcher_dict={
         "AvailableIndices": TushareAvailableIndicesFetcher,
         "BalanceSheet": TushareBalanceSheetFetcher,
+        "CalendarDividend": TushareCalendarDividendFetcher,
         "CashFlowStatement": TushareCashFlowStatementFetcher,
         "EquityHistorical": TushareEquityHistoricalFetcher,
         "EquityInfo": TushareEquityProfileFetcher,
@@ -30,5 +34,7 @@ provider = Provider(
         "EquitySearch": TushareEquitySearchFetcher,
         "HistoricalDividends": TushareHistoricalDividendsFetcher,
         "IncomeStatement": TushareIncomeStatementFetcher,
+        "IndexConstituents": TushareIndexConstituentsFetcher,
+        "IndexHistorical": TushareIndexHistoricalFetcher,
     }
 )
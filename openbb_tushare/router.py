@@ -1,5 +1,7 @@
 """openbb_tushare router command example."""
 
+from typing import Optional
+
 import requests
 from openbb_core.app.model.command_context import CommandContext
 from openbb_core.app.model.obbject import OBBject
@@ -46,3 +48,132 @@ async def model_example(
 ) -> OBBject[BaseModel]:
     """Example Data."""
     return await OBBject.from_query(Query(**locals()))
+
+
+def get_tushare_api_key(cc: CommandContext) -> str:
+    """Return the Tushare API key from the user credentials, or '' to fall back to TUSHARE_API_KEY."""
+    api_key = getattr(cc.user_settings.credentials, "tushare_api_key", None)
+    return api_key.get_secret_value() if api_key else ""
+
+
+@router.command(methods=["POST"])
+async def repair_bar_gaps(
+    cc: CommandContext,
+    symbol: Optional[str] = None,
+    max_gap_sessions: int = 5,
+) -> OBBject[dict]:
+    """Find sessions missing from the cached daily bars and download only the missing ranges.
+
+    Checks the given comma-separated symbols, or every symbol of the symbol master.
+    Returns the number of bars written per repaired symbol.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+    from openbb_tushare.utils.bar_gaps import repair_all_gaps
+
+    symbols = [s.strip() for s in symbol.split(",") if s.strip()] if symbol else None
+    repaired = await asyncio.to_thread(
+        repair_all_gaps, symbols, api_key=get_tushare_api_key(cc), max_gap_sessions=max_gap_sessions
+    )
+    return OBBject(results=repaired)
+
+
+@router.command(methods=["GET"])
+async def quote_updates(
+    cc: CommandContext,
+    symbol: str,
+    timeout: float = 30.0,
+) -> OBBject[list]:
+    """Wait for the next quote changes of the given comma-separated symbols.
+
+    Subscribes to the shared quote poller, which polls each symbol once per tick for all
+    subscribers, and returns only the rows whose price, volume or bid/ask changed.
+    Returns an empty list when nothing changed within timeout seconds.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+    from openbb_tushare.models.equity_quote import TushareEquityQuoteData
+    from openbb_tushare.utils.quote_poller import get_quote_poller
+
+    poller = get_quote_poller(api_key=get_tushare_api_key(cc))
+    async with poller.subscribe(symbol.split(","), snapshot=False) as subscription:
+        try:
+            rows = await asyncio.wait_for(subscription.__anext__(), timeout)
+        except asyncio.TimeoutError:
+            rows = []
+    return OBBject(results=[TushareEquityQuoteData.model_validate(row) for row in rows])
+
+
+@router.command(methods=["POST"])
+async def warm_equity_profiles(
+    cc: CommandContext,
+    exchanges: str = "SSE,SZSE,BSE,HK",
+) -> OBBject[dict]:
+    """Prefetch the company profiles of whole exchanges into the profile cache.
+
+    Pulls every company of the given comma-separated exchanges in a few paged calls,
+    so later equity profile lookups of their symbols are served from the cache.
+    Returns the number of profiles written.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+    from openbb_tushare.utils.ts_equity_profile import warm_equity_profiles as warm
+
+    names = tuple(e.strip().upper() for e in exchanges.split(",") if e.strip())
+    rows = await asyncio.to_thread(warm, names, get_tushare_api_key(cc))
+    return OBBject(results={"profiles": rows})
+
+
+@router.command(methods=["POST"])
+async def ingest_fundamentals(
+    cc: CommandContext,
+    period: str,
+    statement: str = "income_statement,balance_sheet,cash_flow",
+) -> OBBject[dict]:
+    """Ingest the financial statements of all A-share companies for one reporting period.
+
+    Uses the Tushare VIP endpoints (income_vip, balancesheet_vip, cashflow_vip), a few
+    paged calls per statement. period is the report end date, e.g. 20231231.
+    Returns the number of rows written per statement.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+    from openbb_tushare.utils.fundamentals_store import ingest_period
+
+    statements = tuple(s.strip() for s in statement.split(",") if s.strip())
+    written = await asyncio.to_thread(ingest_period, period, statements, get_tushare_api_key(cc))
+    return OBBject(results=written)
+
+
+@router.command(methods=["POST"])
+async def refresh_fundamentals(
+    cc: CommandContext,
+    statement: str = "income_statement,balance_sheet,cash_flow",
+) -> OBBject[dict]:
+    """Re-download the cached financial statements of the symbols that disclosed a new report.
+
+    Syncs the disclosure calendar of the two latest reporting periods first, so it can
+    run as a scheduled job. Returns the refreshed symbols per statement.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+    from openbb_tushare.utils.disclosure import refresh_statements
+
+    statements = tuple(s.strip() for s in statement.split(",") if s.strip())
+    refreshed = await asyncio.to_thread(refresh_statements, statements, get_tushare_api_key(cc))
+    return OBBject(results=refreshed)
+
+
+@router.command(methods=["POST"])
+async def ingest_dividends(
+    cc: CommandContext,
+    start_date: str,
+    end_date: str,
+    by: str = "ex_date",
+) -> OBBject[dict]:
+    """Ingest the dividends of the whole market for the trading sessions of a date range.
+
+    One Tushare call per session, by ex-dividend date (by="ex_date") or record date
+    (by="record_date"). Dates are YYYYMMDD. Sessions synced after they passed are
+    skipped. Returns the number of dividends written.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+    from openbb_tushare.utils.dividend_store import ingest_dividend_dates
+
+    rows = await asyncio.to_thread(ingest_dividend_dates, start_date, end_date, by, get_tushare_api_key(cc))
+    return OBBject(results={"dividends": rows})
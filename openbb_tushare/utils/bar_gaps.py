@@ -0,0 +1,209 @@
+"""
+Gap detection and targeted repair of the daily bar cache.
+
+A symbol's cached dates are compared against the sessions of its exchange calendar
+between its low- and high-water marks. Missing sessions that are close to each other
+are merged into one bounded range, so a repair downloads only the holes with as few
+pro.daily/hk_daily calls as possible.
+
+Sessions Tushare has no bar for (suspensions) are remembered in the bar_holes table
+after a repair, so they are not requested again.
+"""
+import logging
+import sqlite3
+from datetime import date as dateType
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare.utils.bar_store import BarStore, get_bar_store
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+BAR_HOLES_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS bar_holes (
+        ts_code TEXT NOT NULL,
+        date TEXT NOT NULL,
+        PRIMARY KEY (ts_code, date)
+    ) WITHOUT ROWID
+"""
+
+# Missing sessions at most this many sessions apart are fetched in one call
+MAX_GAP_SESSIONS = 5
+# Upper bound of sessions per call, below the 6000 rows a pro.daily page returns
+MAX_RANGE_SESSIONS = 4000
+
+
+def group_gaps(
+    missing: np.ndarray,
+    sessions: np.ndarray,
+    max_gap_sessions: int = MAX_GAP_SESSIONS,
+    max_range_sessions: int = MAX_RANGE_SESSIONS,
+) -> List[Tuple[dateType, dateType]]:
+    """
+    Merge missing sessions into as few bounded date ranges as possible.
+
+    Parameters:
+        missing (ndarray): Missing sessions as sorted datetime64[D].
+        sessions (ndarray): All sessions of the scanned span as sorted datetime64[D].
+        max_gap_sessions (int): Missing sessions separated by at most this many cached
+            sessions end up in the same range.
+        max_range_sessions (int): Maximum number of sessions covered by one range.
+
+    Returns:
+        List[Tuple[date, date]]: Inclusive (start, end) ranges in date order.
+    """
+    if len(missing) == 0:
+        return []
+
+    positions = np.searchsorted(sessions, missing)
+    breaks = np.flatnonzero(np.diff(positions) > max_gap_sessions + 1) + 1
+    ranges = []
+    for group in np.split(positions, breaks):
+        # Split groups spanning more sessions than one call may return
+        first = 0
+        while first < len(group):
+            last = int(np.searchsorted(group, group[first] + max_range_sessions, side="left")) - 1
+            ranges.append((
+                sessions[group[first]].astype(object),
+                sessions[group[last]].astype(object),
+            ))
+            first = last + 1
+    return ranges
+
+
+def get_holes(ts_code: str, db_path: str) -> np.ndarray:
+    """Return the sessions known to have no bar for ts_code as datetime64[D]."""
+    _, ts_code, _ = normalize_symbol(ts_code)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(BAR_HOLES_SCHEMA)
+        rows = conn.execute("SELECT date FROM bar_holes WHERE ts_code = ? ORDER BY date", (ts_code,)).fetchall()
+    return pd.to_datetime([row[0] for row in rows], format="%Y%m%d").to_numpy(dtype="datetime64[D]")
+
+
+def record_holes(ts_code: str, holes: np.ndarray, db_path: str) -> None:
+    """Remember sessions that Tushare returned no bar for, e.g. suspensions."""
+    if len(holes) == 0:
+        return
+    _, ts_code, _ = normalize_symbol(ts_code)
+    days = pd.DatetimeIndex(holes).strftime("%Y%m%d")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(BAR_HOLES_SCHEMA)
+        conn.executemany("INSERT OR IGNORE INTO bar_holes (ts_code, date) VALUES (?, ?)", [(ts_code, day) for day in days])
+
+
+def expected_sessions(ts_code: str, lwm: str, hwm: str, api_key: str = "") -> np.ndarray:
+    """Return the sessions ts_code should have a bar for between its water marks."""
+    from datetime import datetime
+    from openbb_tushare.utils.ts_trade_calendar import get_trade_calendar
+
+    _, _, market = normalize_symbol(ts_code)
+    calendar = get_trade_calendar(market, api_key=api_key)
+    return calendar.trading_days(
+        datetime.strptime(lwm, "%Y%m%d").date(),
+        datetime.strptime(hwm, "%Y%m%d").date(),
+    )
+
+
+def has_gaps(ts_code: str, store: BarStore, api_key: str = "") -> bool:
+    """
+    Cheap check whether the cached history of ts_code has holes.
+
+    Compares the row count from cache_meta with the number of sessions between the
+    water marks, so no bar is read.
+    """
+    lwm, hwm = store.water_marks(ts_code)
+    if hwm is None:
+        return False
+    expected = len(expected_sessions(ts_code, lwm, hwm, api_key=api_key))
+    return store.row_count(ts_code) + len(get_holes(ts_code, store.db_path)) < expected
+
+
+def scan_gaps(
+    ts_code: str,
+    store: BarStore,
+    api_key: str = "",
+    max_gap_sessions: int = MAX_GAP_SESSIONS,
+) -> List[Tuple[dateType, dateType]]:
+    """
+    Return the date ranges missing from the cached history of ts_code.
+
+    The cached dates are diffed against the calendar sessions between the water marks
+    with a vectorized set difference, then grouped with group_gaps.
+    """
+    lwm, hwm = store.water_marks(ts_code)
+    if hwm is None:
+        return []
+    sessions = expected_sessions(ts_code, lwm, hwm, api_key=api_key)
+    cached = store.read_dates(ts_code, lwm, hwm)
+    missing = np.setdiff1d(sessions, cached, assume_unique=True)
+    missing = np.setdiff1d(missing, get_holes(ts_code, store.db_path), assume_unique=True)
+    return group_gaps(missing, sessions, max_gap_sessions=max_gap_sessions)
+
+
+def repair_gaps(
+    ts_code: str,
+    store: Optional[BarStore] = None,
+    api_key: str = "",
+    max_gap_sessions: int = MAX_GAP_SESSIONS,
+) -> int:
+    """
+    Download only the missing ranges of a symbol's cached history.
+
+    Sessions still missing after the download are recorded as holes.
+
+    Returns:
+        int: Number of bars written.
+    """
+    from openbb_tushare.utils.ts_equity_historical import get_one
+
+    if store is None:
+        store = get_bar_store()
+    ranges = scan_gaps(ts_code, store, api_key=api_key, max_gap_sessions=max_gap_sessions)
+    if not ranges:
+        return 0
+
+    rows = 0
+    for start, end in ranges:
+        rows += store.write(ts_code, get_one(ts_code, start_date=start, end_date=end, api_key=api_key))
+
+    lwm, hwm = store.water_marks(ts_code)
+    sessions = expected_sessions(ts_code, lwm, hwm, api_key=api_key)
+    missing = np.setdiff1d(sessions, store.read_dates(ts_code, lwm, hwm), assume_unique=True)
+    record_holes(ts_code, missing, store.db_path)
+    logger.info(f"Repaired {len(ranges)} gaps of {ts_code} with {rows} bars, {len(missing)} sessions have no bar.")
+    return rows
+
+
+def repair_all_gaps(
+    symbols: Optional[Iterable[str]] = None,
+    store: Optional[BarStore] = None,
+    api_key: str = "",
+    max_gap_sessions: int = MAX_GAP_SESSIONS,
+) -> dict:
+    """
+    Maintenance pass over the bar cache: repair every symbol whose history has holes.
+
+    Parameters:
+        symbols (Iterable[str]): Symbols to check, defaults to the whole symbol master.
+        store (BarStore): Bar storage backend.
+        api_key (str): Tushare API key.
+        max_gap_sessions (int): See group_gaps.
+
+    Returns:
+        dict: Number of bars written per repaired symbol.
+    """
+    if store is None:
+        store = get_bar_store()
+    if symbols is None:
+        from openbb_tushare.utils.reference_data import get_reference_registry
+        symbols = get_reference_registry().get("symbols", api_key=api_key)["ts_code"]
+
+    repaired = {}
+    for symbol in symbols:
+        if has_gaps(symbol, store, api_key=api_key):
+            repaired[symbol] = repair_gaps(symbol, store, api_key=api_key, max_gap_sessions=max_gap_sessions)
+    return repaired
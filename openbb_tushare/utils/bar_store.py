@@ -0,0 +1,497 @@
+"""
+Storage backends for historical bars.
+
+SqliteBarStore keeps the bars of all symbols in one table of the SQLite cache shared
+with the other datasets, keyed by (ts_code, date) and indexed on date.
+ParquetBarStore keeps them as Parquet files partitioned by market, symbol and year,
+and reads them through memory-mapped Arrow with the date range pushed down to the
+files. The backend is selected with the TUSHARE_BAR_STORE environment variable
+("sqlite" by default, or "parquet" when pyarrow is installed).
+
+All backends store dates as 'YYYYMMDD' trade dates and return DataFrames sorted by
+date with a datetime 'date' column. Every write refreshes the symbol's row in the
+cache_meta table, which is where the water marks are read from.
+"""
+import logging
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from mysharelib import get_cache_path
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare.utils.cache_meta import CACHE_META_SCHEMA, get_meta, record_meta
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+BAR_STORE_ENV = "TUSHARE_BAR_STORE"
+
+# Default number of bars per chunk when streaming a long range
+CHUNK_ROWS = 5000
+
+_stores: Dict[str, "BarStore"] = {}
+
+# Sessions written by cross-sectional ingests, per backend dataset and market
+INGEST_LOG_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS bar_ingest_log (
+        dataset TEXT,
+        market TEXT,
+        trade_date TEXT,
+        rows INTEGER,
+        PRIMARY KEY (dataset, market, trade_date)
+    )
+"""
+
+
+class BarStore:
+    """Interface of the historical bar storage backends.
+
+    Backends set dataset, their key in the cache_meta table, and db_path, the SQLite
+    database holding that table.
+    """
+
+    dataset: str
+    db_path: str
+
+    def water_marks(self, ts_code: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return the earliest and latest stored trade dates ('YYYYMMDD') of a symbol."""
+        raise NotImplementedError
+
+    def read(self, ts_code: str, start: str, end: str) -> pd.DataFrame:
+        """Return the bars of a symbol between two 'YYYYMMDD' dates (inclusive)."""
+        raise NotImplementedError
+
+    def iter_read(
+        self, ts_code: str, start: str, end: str, chunk_rows: int = CHUNK_ROWS, by: str = "rows"
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield the bars of a symbol between two 'YYYYMMDD' dates in bounded chunks, oldest first.
+
+        Parameters:
+            ts_code (str): Symbol to read.
+            start (str): First trade date (inclusive).
+            end (str): Last trade date (inclusive).
+            chunk_rows (int): Maximum number of bars per chunk when by is "rows".
+            by (str): "rows" for chunks of at most chunk_rows bars, "month" for one chunk per calendar month.
+        """
+        if by == "month":
+            for month in pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq="M"):
+                chunk = self.read(
+                    ts_code,
+                    max(start, month.start_time.strftime("%Y%m%d")),
+                    min(end, month.end_time.strftime("%Y%m%d")),
+                )
+                if not chunk.empty:
+                    yield chunk
+        elif by == "rows":
+            yield from self._iter_rows(ts_code, start, end, chunk_rows)
+        else:
+            raise ValueError(f"Unknown chunking '{by}', expected 'rows' or 'month'.")
+
+    def _iter_rows(self, ts_code: str, start: str, end: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        bars = self.read(ts_code, start, end)
+        for offset in range(0, len(bars), chunk_rows):
+            yield bars.iloc[offset:offset + chunk_rows].reset_index(drop=True)
+
+    def read_dates(self, ts_code: str, start: str, end: str) -> np.ndarray:
+        """Return the stored trade dates of a symbol between two 'YYYYMMDD' dates as sorted datetime64[D]."""
+        return self.read(ts_code, start, end)["date"].to_numpy(dtype="datetime64[D]")
+
+    def row_count(self, ts_code: str) -> int:
+        """Return the number of stored bars of a symbol, from the cache_meta table."""
+        _, symbol_f, _ = normalize_symbol(ts_code)
+        if self.water_marks(ts_code)[1] is None:
+            return 0
+        meta = get_meta(self.dataset, symbol_f, db_path=self.db_path)
+        return meta.row_count if meta is not None else 0
+
+    def write(self, ts_code: str, df: pd.DataFrame) -> int:
+        """Merge bars of one symbol into the store. Rows within the date span of df are replaced."""
+        raise NotImplementedError
+
+    def write_cross_section(self, df: pd.DataFrame) -> int:
+        """Merge bars of many symbols, identified by a ts_code column, into the store."""
+        rows = 0
+        for ts_code, bars in df.groupby("ts_code", sort=False):
+            rows += self.write(ts_code, bars.drop(columns=["ts_code"]))
+        return rows
+
+    def read_cross_section(self, trade_date: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Return the bars of every symbol on one 'YYYYMMDD' trade date, with a ts_code column."""
+        raise NotImplementedError
+
+    def high_water_mark(self, ts_code: str) -> Optional[str]:
+        """Return the latest stored trade date ('YYYYMMDD') of a symbol."""
+        return self.water_marks(ts_code)[1]
+
+    def record_ingested(self, market: str, df: pd.DataFrame) -> None:
+        """Record the sessions of a cross-section written to the store, and their row counts, in the ingest log."""
+        counts = df.groupby("date").size()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(INGEST_LOG_SCHEMA)
+            conn.executemany(
+                "INSERT OR REPLACE INTO bar_ingest_log (dataset, market, trade_date, rows) VALUES (?, ?, ?, ?)",
+                [(self.dataset, market, day, int(rows)) for day, rows in counts.items()],
+            )
+
+    def ingested_sessions(self, market: str) -> set:
+        """Return the sessions ('YYYYMMDD') of a market already ingested into the store."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(INGEST_LOG_SCHEMA)
+            rows = conn.execute(
+                "SELECT trade_date FROM bar_ingest_log WHERE dataset = ? AND market = ?", (self.dataset, market)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+
+BAR_SCHEMA = {
+    "ts_code": "TEXT NOT NULL",   # Tushare code, e.g. 600000.SH
+    "date": "TEXT NOT NULL",      # Trade date (YYYYMMDD)
+    "open": "REAL",
+    "high": "REAL",
+    "low": "REAL",
+    "close": "REAL",
+    "pre_close": "REAL",
+    "change": "REAL",
+    "change_percent": "REAL",
+    "volume": "REAL",
+    "amount": "REAL",
+}
+
+BAR_TABLE = "equity_bars"
+
+# Per-symbol tables written by earlier versions, e.g. SH600000
+LEGACY_TABLE_PATTERN = re.compile(r"^(SH|SZ|BJ|HK)(\d+)$")
+
+
+def get_bar_table_name(ts_code: str) -> str:
+    """Return the name of the legacy per-symbol bar table, e.g. SH600000."""
+    symbol_b, _, market = normalize_symbol(ts_code)
+    return f"{market}{symbol_b}"
+
+
+class SqliteBarStore(BarStore):
+    """Bars of all symbols in one SQLite table keyed by (ts_code, date) with a secondary index on date."""
+
+    dataset = BAR_TABLE
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or get_cache_path(project_name)
+        self.columns = list(BAR_SCHEMA)
+        columns_definition = ", ".join(f"{col} {dtype}" for col, dtype in BAR_SCHEMA.items())
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {BAR_TABLE} ({columns_definition}, PRIMARY KEY (ts_code, date)) WITHOUT ROWID"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{BAR_TABLE}_date ON {BAR_TABLE} (date)")
+            conn.execute(CACHE_META_SCHEMA)
+
+    def water_marks(self, ts_code: str) -> Tuple[Optional[str], Optional[str]]:
+        _, ts_code, _ = normalize_symbol(ts_code)
+        meta = get_meta(self.dataset, ts_code, db_path=self.db_path)
+        if meta is None:
+            # Not recorded yet: migrate a legacy table or index bars written before the metadata existed
+            with sqlite3.connect(self.db_path) as conn:
+                if not self._migrate_table(conn, get_bar_table_name(ts_code)):
+                    self._refresh_meta(conn, [ts_code])
+            meta = get_meta(self.dataset, ts_code, db_path=self.db_path)
+        if meta is None or not meta.max_date:
+            return None, None
+        return meta.min_date, meta.max_date
+
+    def _refresh_meta(self, conn: sqlite3.Connection, ts_codes: List[str]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO cache_meta (dataset, key, min_date, max_date, row_count, last_sync) "
+            f"SELECT ?, ts_code, MIN(date), MAX(date), COUNT(*), ? FROM {BAR_TABLE} WHERE ts_code = ? GROUP BY ts_code",
+            [(self.dataset, time.time(), ts_code) for ts_code in ts_codes],
+        )
+
+    def _select(self, conn: sqlite3.Connection, where: str, params: tuple, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        columns = columns or self.columns
+        query = f"SELECT {', '.join(columns)} FROM {BAR_TABLE} WHERE {where}"
+        df = pd.read_sql(query, conn, params=params)
+        df["date"] = pd.to_datetime(df["date"], format="%Y%m%d")
+        return df
+
+    def read(self, ts_code: str, start: str, end: str) -> pd.DataFrame:
+        _, ts_code, _ = normalize_symbol(ts_code)
+        with sqlite3.connect(self.db_path) as conn:
+            df = self._select(conn, "ts_code = ? AND date BETWEEN ? AND ? ORDER BY date", (ts_code, start, end))
+        return df.drop(columns=["ts_code"])
+
+    def _iter_rows(self, ts_code: str, start: str, end: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        _, ts_code, _ = normalize_symbol(ts_code)
+        query = (
+            f"SELECT {', '.join(self.columns)} FROM {BAR_TABLE} "
+            "WHERE ts_code = ? AND date BETWEEN ? AND ? ORDER BY date"
+        )
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            for chunk in pd.read_sql(query, conn, params=(ts_code, start, end), chunksize=chunk_rows):
+                chunk["date"] = pd.to_datetime(chunk["date"], format="%Y%m%d")
+                yield chunk.drop(columns=["ts_code"])
+
+    def read_dates(self, ts_code: str, start: str, end: str) -> np.ndarray:
+        _, ts_code, _ = normalize_symbol(ts_code)
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                f"SELECT date FROM {BAR_TABLE} WHERE ts_code = ? AND date BETWEEN ? AND ? ORDER BY date",
+                (ts_code, start, end),
+            ).fetchall()
+        return pd.to_datetime([row[0] for row in rows], format="%Y%m%d").to_numpy(dtype="datetime64[D]")
+
+    def read_cross_section(self, trade_date: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        columns = ["ts_code", "date"] + [col for col in (columns or self.columns) if col not in ("ts_code", "date")]
+        with sqlite3.connect(self.db_path) as conn:
+            return self._select(conn, "date = ? ORDER BY ts_code", (trade_date,), columns)
+
+    def _insert(self, conn: sqlite3.Connection, df: pd.DataFrame) -> int:
+        df = df[[col for col in self.columns if col in df.columns]]
+        spans = df.groupby("ts_code")["date"].agg(["min", "max"])
+        conn.executemany(
+            f"DELETE FROM {BAR_TABLE} WHERE ts_code = ? AND date BETWEEN ? AND ?",
+            spans.itertuples(name=None),
+        )
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        conn.executemany(
+            f"INSERT INTO {BAR_TABLE} ({', '.join(df.columns)}) "
+            f"VALUES ({', '.join(['?'] * len(df.columns))})",
+            rows,
+        )
+        self._refresh_meta(conn, spans.index.tolist())
+        return len(df)
+
+    def write(self, ts_code: str, df: pd.DataFrame) -> int:
+        if df is None or df.empty:
+            return 0
+        _, ts_code, _ = normalize_symbol(ts_code)
+        with sqlite3.connect(self.db_path) as conn:
+            return self._insert(conn, df.assign(ts_code=ts_code))
+
+    def write_cross_section(self, df: pd.DataFrame) -> int:
+        if df is None or df.empty:
+            return 0
+        with sqlite3.connect(self.db_path) as conn:
+            return self._insert(conn, df)
+
+    def _migrate_table(self, conn: sqlite3.Connection, table_name: str) -> int:
+        match = LEGACY_TABLE_PATTERN.match(table_name)
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+        ).fetchone()
+        if match is None or exists is None:
+            return 0
+
+        legacy = pd.read_sql(f"SELECT * FROM {table_name}", conn)
+        legacy["ts_code"] = f"{match.group(2)}.{match.group(1)}"
+        rows = self._insert(conn, legacy) if not legacy.empty else 0
+        conn.execute(f"DROP TABLE {table_name}")
+        logger.info(f"Migrated {rows} bars from legacy table {table_name} into {BAR_TABLE}.")
+        return rows
+
+    def migrate(self) -> int:
+        """
+        Move every legacy per-symbol bar table into the consolidated table.
+
+        Symbols are also migrated lazily the first time they are read.
+
+        Returns:
+            int: Number of bars migrated.
+        """
+        rows = 0
+        with sqlite3.connect(self.db_path) as conn:
+            tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+            for table_name in tables:
+                rows += self._migrate_table(conn, table_name)
+        return rows
+
+
+class ParquetBarStore(BarStore):
+    """Bars in Parquet files laid out as {root}/market=SH/symbol=600000/year=2024/bars.parquet."""
+
+    dataset = "parquet_bars"
+
+    def __init__(self, root: Optional[str] = None, db_path: Optional[str] = None):
+        try:
+            import pyarrow  # noqa: F401  # pylint: disable=import-outside-toplevel,unused-import
+        except ImportError as e:
+            raise ImportError(
+                "The parquet bar store requires pyarrow. Install it with `pip install openbb-tushare[parquet]`."
+            ) from e
+        from pyarrow import fs  # pylint: disable=import-outside-toplevel
+
+        self.db_path = db_path or get_cache_path(project_name)
+        self.root = root or os.path.join(os.path.dirname(self.db_path), "bars")
+        self.filesystem = fs.LocalFileSystem(use_mmap=True)
+
+    def _symbol_dir(self, ts_code: str) -> str:
+        symbol_b, _, market = normalize_symbol(ts_code)
+        return os.path.join(self.root, f"market={market}", f"symbol={symbol_b}")
+
+    def _year_files(self, ts_code: str) -> list:
+        symbol_dir = self._symbol_dir(ts_code)
+        if not os.path.isdir(symbol_dir):
+            return []
+        years = sorted(name for name in os.listdir(symbol_dir) if name.startswith("year="))
+        return [os.path.join(symbol_dir, year, "bars.parquet") for year in years]
+
+    @staticmethod
+    def _date_statistics(path: str) -> Tuple[str, str]:
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        metadata = pq.ParquetFile(path).metadata
+        column = metadata.schema.names.index("date")
+        stats = [metadata.row_group(i).column(column).statistics for i in range(metadata.num_row_groups)]
+        return (
+            min(s.min for s in stats).strftime("%Y%m%d"),
+            max(s.max for s in stats).strftime("%Y%m%d"),
+        )
+
+    def _refresh_meta(self, ts_code: str) -> None:
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        files = self._year_files(ts_code)
+        if not files:
+            return
+        _, ts_code, _ = normalize_symbol(ts_code)
+        rows = sum(pq.ParquetFile(path).metadata.num_rows for path in files)
+        record_meta(
+            self.dataset,
+            ts_code,
+            self._date_statistics(files[0])[0],
+            self._date_statistics(files[-1])[1],
+            rows,
+            db_path=self.db_path,
+        )
+
+    def water_marks(self, ts_code: str) -> Tuple[Optional[str], Optional[str]]:
+        _, symbol_f, _ = normalize_symbol(ts_code)
+        meta = get_meta(self.dataset, symbol_f, db_path=self.db_path)
+        if meta is None:
+            self._refresh_meta(ts_code)
+            meta = get_meta(self.dataset, symbol_f, db_path=self.db_path)
+        if meta is None:
+            return None, None
+        return meta.min_date, meta.max_date
+
+    def read(self, ts_code: str, start: str, end: str) -> pd.DataFrame:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow.dataset as ds
+        from datetime import datetime
+
+        symbol_dir = self._symbol_dir(ts_code)
+        if not os.path.isdir(symbol_dir):
+            return pd.DataFrame()
+
+        start_dt = datetime.strptime(start, "%Y%m%d").date()
+        end_dt = datetime.strptime(end, "%Y%m%d").date()
+        dataset = ds.dataset(symbol_dir, format="parquet", partitioning="hive", filesystem=self.filesystem)
+        table = dataset.to_table(
+            filter=(ds.field("year") >= start_dt.year)
+            & (ds.field("year") <= end_dt.year)
+            & (ds.field("date") >= start_dt)
+            & (ds.field("date") <= end_dt),
+        )
+        table = table.drop_columns(["year"]).sort_by("date")
+        return table.to_pandas(date_as_object=False, split_blocks=True, self_destruct=True)
+
+    def _iter_rows(self, ts_code: str, start: str, end: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from datetime import datetime
+
+        start_dt = datetime.strptime(start, "%Y%m%d").date()
+        end_dt = datetime.strptime(end, "%Y%m%d").date()
+        # At most one year file plus one chunk is held in memory at a time
+        pending = None
+        for path in self._year_files(ts_code):
+            year = int(os.path.basename(os.path.dirname(path)).split("=")[1])
+            if year < start_dt.year or year > end_dt.year:
+                continue
+            table = pq.read_table(path, memory_map=True, filters=[("date", ">=", start_dt), ("date", "<=", end_dt)])
+            pending = table if pending is None else pa.concat_tables([pending, table])
+            while pending.num_rows >= chunk_rows:
+                yield pending.slice(0, chunk_rows).to_pandas(date_as_object=False)
+                pending = pending.slice(chunk_rows)
+        if pending is not None and pending.num_rows:
+            yield pending.to_pandas(date_as_object=False)
+
+    def read_cross_section(self, trade_date: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        from datetime import datetime
+
+        if not os.path.isdir(self.root):
+            return pd.DataFrame()
+
+        day = datetime.strptime(trade_date, "%Y%m%d").date()
+        # Symbols keep their leading zeros only with an explicit string partition type
+        partitioning = ds.partitioning(
+            pa.schema([("market", pa.string()), ("symbol", pa.string()), ("year", pa.int32())]), flavor="hive"
+        )
+        dataset = ds.dataset(self.root, format="parquet", partitioning=partitioning, filesystem=self.filesystem)
+        table = dataset.to_table(
+            columns=None if columns is None else ["market", "symbol", "date"] + [col for col in columns if col not in ("ts_code", "date")],
+            filter=(ds.field("year") == day.year) & (ds.field("date") == day),
+        )
+        ts_code = pc.binary_join_element_wise(table["symbol"], table["market"], ".")
+        table = table.drop_columns([col for col in ("market", "symbol", "year") if col in table.column_names])
+        table = table.add_column(0, "ts_code", ts_code).sort_by("ts_code")
+        return table.to_pandas(date_as_object=False, split_blocks=True, self_destruct=True)
+
+    def write(self, ts_code: str, df: pd.DataFrame) -> int:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if df is None or df.empty:
+            return 0
+
+        df = df.assign(date=pd.to_datetime(df["date"], format="%Y%m%d").dt.date)
+        years = pd.to_datetime(df["date"]).dt.year
+        for year, bars in df.groupby(years.to_numpy()):
+            year_dir = os.path.join(self._symbol_dir(ts_code), f"year={year}")
+            path = os.path.join(year_dir, "bars.parquet")
+            os.makedirs(year_dir, exist_ok=True)
+            if os.path.exists(path):
+                existing = pq.read_table(path).to_pandas(date_as_object=True)
+                outside = (existing["date"] < df["date"].min()) | (existing["date"] > df["date"].max())
+                bars = pd.concat([existing[outside], bars], ignore_index=True)
+            bars = bars.sort_values("date")
+            table = pa.Table.from_pandas(bars, preserve_index=False)
+            table = table.set_column(
+                table.schema.get_field_index("date"), "date", table["date"].cast(pa.date32())
+            )
+            pq.write_table(table, f"{path}.tmp")
+            os.replace(f"{path}.tmp", path)
+        self._refresh_meta(ts_code)
+        return len(df)
+
+
+def get_bar_store(backend: Optional[str] = None) -> BarStore:
+    """
+    Return the process-wide bar store.
+
+    Parameters:
+        backend (str): "sqlite" or "parquet". Defaults to the TUSHARE_BAR_STORE
+            environment variable, then "sqlite".
+    """
+    backend = (backend or os.environ.get(BAR_STORE_ENV) or "sqlite").lower()
+    store = _stores.get(backend)
+    if store is None:
+        if backend == "parquet":
+            store = ParquetBarStore()
+        elif backend == "sqlite":
+            store = SqliteBarStore()
+        else:
+            raise ValueError(f"Unknown bar store '{backend}', expected 'sqlite' or 'parquet'.")
+        _stores[backend] = store
+    return store
@@ -0,0 +1,115 @@
+"""
+Watermark metadata of the cached datasets.
+
+One row per dataset and key (e.g. equity_bars / 600000.SH, or symbols / '') holds
+the cached date range, the row count and the time of the last sync. It is updated
+on every write, so freshness checks are a single primary-key lookup instead of a
+scan of the cached data.
+"""
+import logging
+import sqlite3
+import time
+from typing import Callable, NamedTuple, Optional
+
+import pandas as pd
+from mysharelib import get_cache_path
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+CACHE_META_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache_meta (
+        dataset TEXT NOT NULL,
+        key TEXT NOT NULL,
+        min_date TEXT,
+        max_date TEXT,
+        row_count INTEGER,
+        last_sync REAL,
+        PRIMARY KEY (dataset, key)
+    ) WITHOUT ROWID
+"""
+
+
+class CacheMeta(NamedTuple):
+    """Watermarks of one cached dataset key."""
+
+    min_date: Optional[str]
+    max_date: Optional[str]
+    row_count: int
+    last_sync: float
+
+
+def get_meta(dataset: str, key: str = "", db_path: Optional[str] = None) -> Optional[CacheMeta]:
+    """Return the watermarks of a cached dataset key, or None if it was never recorded."""
+    with sqlite3.connect(db_path or get_cache_path(project_name)) as conn:
+        conn.execute(CACHE_META_SCHEMA)
+        row = conn.execute(
+            "SELECT min_date, max_date, row_count, last_sync FROM cache_meta WHERE dataset = ? AND key = ?",
+            (dataset, key),
+        ).fetchone()
+    return CacheMeta(*row) if row is not None else None
+
+
+def record_meta(
+    dataset: str,
+    key: str = "",
+    min_date: Optional[str] = None,
+    max_date: Optional[str] = None,
+    row_count: int = 0,
+    db_path: Optional[str] = None,
+) -> None:
+    """Store the watermarks of a cached dataset key, stamped with the current time."""
+    with sqlite3.connect(db_path or get_cache_path(project_name)) as conn:
+        conn.execute(CACHE_META_SCHEMA)
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_meta (dataset, key, min_date, max_date, row_count, last_sync) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (dataset, key, min_date, max_date, int(row_count), time.time()),
+        )
+
+
+def record_dataframe(
+    dataset: str,
+    df: Optional[pd.DataFrame],
+    key: str = "",
+    date_column: Optional[str] = None,
+    db_path: Optional[str] = None,
+) -> None:
+    """
+    Store the watermarks of a DataFrame that was just written to the cache.
+
+    Parameters:
+        dataset (str): Cached dataset, e.g. the table name.
+        df (DataFrame): Data written for the key.
+        key (str): Key within the dataset, e.g. a ts_code. Empty for whole-table datasets.
+        date_column (str): Column holding the dates ('YYYYMMDD' strings or datetimes), if any.
+        db_path (str): SQLite database holding the metadata table.
+    """
+    min_date = max_date = None
+    rows = 0 if df is None else len(df)
+    if rows and date_column is not None and date_column in df.columns:
+        dates = df[date_column].dropna()
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            dates = dates.dt.strftime("%Y%m%d")
+        dates = dates.astype(str)
+        if not dates.empty:
+            min_date, max_date = dates.min(), dates.max()
+    record_meta(dataset, key, min_date, max_date, rows, db_path=db_path)
+
+
+def tracked(dataset: str, get_data: Callable, date_column: Optional[str] = None) -> Callable:
+    """
+    Wrap the download function handed to BlobCache.load_cached_data so every
+    refreshed blob also records its watermarks under dataset / ts_code.
+    """
+
+    def get_tracked_data(symbol: str, *args, **kwargs):
+        df = get_data(symbol, *args, **kwargs)
+        if isinstance(df, pd.DataFrame):
+            _, symbol_f, _ = normalize_symbol(symbol)
+            record_dataframe(dataset, df, key=symbol_f, date_column=date_column)
+        return df
+
+    return get_tracked_data
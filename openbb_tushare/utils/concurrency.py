@@ -0,0 +1,210 @@
+"""
+Bounded concurrency for blocking Tushare and cache calls.
+
+Blocking work (HTTP calls to Tushare, SQLite reads) is offloaded to a shared thread
+pool. A semaphore bounds how many jobs of one request run at once, and a rate
+limiter shared by the whole process keeps the Tushare calls within the per-minute
+budget of the account.
+"""
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from mysharelib.tools import setup_logger
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS_ENV = "TUSHARE_MAX_WORKERS"
+CALLS_PER_MINUTE_ENV = "TUSHARE_CALLS_PER_MINUTE"
+MAX_WORKERS = 8
+TUSHARE_CALLS_PER_MINUTE = 200
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_limiters: Dict[str, "RateLimiter"] = {}
+
+
+class RateLimiter:
+    """
+    Token bucket of calls_per_minute calls, shared across threads.
+
+    The bucket starts full and holds at most one minute of budget, so calls burst
+    freely up to the quota and are only slowed down once it is spent, then refill
+    at calls_per_minute / 60 per second.
+    """
+
+    def __init__(self, calls_per_minute: float):
+        self.capacity = float(calls_per_minute)
+        self.rate = calls_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens go negative for calls booked ahead of the refill
+            self._tokens -= 1.0
+            tokens = self._tokens
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    def wait(self) -> None:
+        """Block until the next call is allowed."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire(self) -> None:
+        """Wait without blocking the event loop until the next call is allowed."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def get_rate_limiter(name: str = "tushare", calls_per_minute: Optional[float] = None) -> RateLimiter:
+    """
+    Return the process-wide rate limiter of a call budget.
+
+    Parameters:
+        name (str): Budget name, e.g. one per Tushare endpoint family.
+        calls_per_minute (float): Budget of a new limiter. Defaults to the
+            TUSHARE_CALLS_PER_MINUTE environment variable, then 200.
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        if calls_per_minute is None:
+            calls_per_minute = float(os.environ.get(CALLS_PER_MINUTE_ENV, TUSHARE_CALLS_PER_MINUTE))
+        limiter = RateLimiter(calls_per_minute)
+        _limiters[name] = limiter
+    return limiter
+
+
+def get_pool_size() -> int:
+    """Return the size of the shared thread pool, TUSHARE_MAX_WORKERS or 8 by default."""
+    if _executor is not None:
+        return _executor._max_workers  # pylint: disable=protected-access
+    return max(1, int(os.environ.get(MAX_WORKERS_ENV, MAX_WORKERS)))
+
+
+def clamp_workers(max_workers: int) -> int:
+    """Return max_workers bounded to [1, pool size]: more jobs in flight than pool threads only queue up."""
+    return max(1, min(max_workers, get_pool_size()))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool, sized by TUSHARE_MAX_WORKERS (8 by default)."""
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=get_pool_size(), thread_name_prefix=project_name)
+    return _executor
+
+
+async def gather_bounded(func: Callable, items: Iterable, max_workers: int = MAX_WORKERS) -> List:
+    """
+    Run a blocking func(item) for every item on the shared thread pool.
+
+    Parameters:
+        func (Callable): Blocking function of one item.
+        items (Iterable): Items to process.
+        max_workers (int): Maximum number of items in flight at once, at most the
+            size of the shared pool.
+
+    Returns:
+        List: Results in the order of items. An exception raised for an item is
+        returned in its place.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(clamp_workers(max_workers))
+    executor = get_executor()
+
+    async def run(item):
+        async with semaphore:
+            return await loop.run_in_executor(executor, functools.partial(func, item))
+
+    return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+
+def map_bounded(func: Callable, items: Iterable, max_workers: int = MAX_WORKERS) -> List:
+    """
+    Synchronous counterpart of gather_bounded for callers outside an event loop.
+
+    Items run on the shared thread pool, at most max_workers at once. Called from a
+    thread of that pool, items run inline so the caller never waits on its own pool.
+
+    Returns:
+        List: Results in the order of items, with exceptions returned in place.
+    """
+    items = list(items)
+    if not items:
+        return []
+    results: List = [None] * len(items)
+    if threading.current_thread().name.startswith(project_name):
+        for i, item in enumerate(items):
+            try:
+                results[i] = func(item)
+            except Exception as e:  # pylint: disable=broad-except
+                results[i] = e
+        return results
+
+    executor = get_executor()
+    semaphore = threading.BoundedSemaphore(clamp_workers(max_workers))
+    futures = []
+    for item in items:
+        semaphore.acquire()  # pylint: disable=consider-using-with
+        future = executor.submit(func, item)
+        future.add_done_callback(lambda _: semaphore.release())
+        futures.append(future)
+    for i, future in enumerate(futures):
+        try:
+            results[i] = future.result()
+        except Exception as e:  # pylint: disable=broad-except
+            results[i] = e
+    return results
+
+
+async def gather_symbols(func: Callable, symbols: Iterable[str], max_workers: int = MAX_WORKERS) -> List[Dict]:
+    """
+    Fetch the records of many symbols concurrently with a blocking func(symbol) -> List[Dict].
+
+    Errors of single symbols become warnings as long as one symbol returned data.
+
+    Returns:
+        List[Dict]: The records of all symbols, in the order of symbols.
+
+    Raises:
+        OpenBBError: If every symbol failed.
+        EmptyDataError: If no symbol returned any record.
+    """
+    # pylint: disable=import-outside-toplevel
+    from warnings import warn
+    from openbb_core.app.model.abstract.error import OpenBBError
+    from openbb_core.provider.utils.errors import EmptyDataError
+
+    symbols = list(symbols)
+    results: List[Dict] = []
+    messages: List[str] = []
+    outcomes = await gather_bounded(func, symbols, max_workers=max_workers)
+    for symbol, outcome in zip(symbols, outcomes):
+        if isinstance(outcome, Exception):
+            messages.append(f"Error getting data for {symbol} -> {outcome.__class__.__name__}: {outcome}")
+        elif outcome:
+            results.extend(outcome)
+
+    if not results and messages:
+        raise OpenBBError("\n".join(messages))
+    if not results:
+        raise EmptyDataError("No data was returned for any symbol")
+    for message in messages:
+        warn(message)
+    return results
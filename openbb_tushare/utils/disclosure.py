@@ -0,0 +1,244 @@
+"""
+Disclosure-calendar-driven refresh of the cached financial statements.
+
+The disclosure calendar (pro.disclosure_date) lists, per symbol and reporting
+period, the scheduled (pre_date) and actual (actual_date) disclosure dates. It is
+kept in a local table and joined with the cache_meta watermarks of the statements:
+a symbol is stale when a report later than its cached periods was disclosed since
+its last sync.
+
+refresh_statements is the scheduled job: it syncs the calendar of the recent
+periods and re-downloads only the stale symbols. load_statement runs the same check
+on every cache hit, against the local calendar synced at most every DISCLOSURE_TTL.
+
+Only A-shares are covered, the calendar has no HK entries.
+"""
+import logging
+import sqlite3
+import time
+from datetime import date as dateType, datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+import tushare as ts
+from mysharelib import get_cache_path
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare.utils.cache_meta import CACHE_META_SCHEMA, get_meta, record_meta
+from openbb_tushare.utils.concurrency import get_rate_limiter
+from openbb_tushare.utils.helpers import get_api_key
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+DISCLOSURE_TABLE = "disclosure_date"
+DISCLOSURE_SCHEMA = {
+    "ts_code": "TEXT NOT NULL",    # Tushare code
+    "end_date": "TEXT NOT NULL",   # Reporting period (YYYYMMDD)
+    "ann_date": "TEXT",            # Latest announcement date
+    "pre_date": "TEXT",            # Scheduled disclosure date
+    "actual_date": "TEXT",         # Actual disclosure date, empty until published
+    "modify_date": "TEXT",         # Latest revision of the disclosure date
+}
+
+# Rows per disclosure_date call, and how long a synced period stays fresh on read
+DISCLOSURE_PAGE_SIZE = 3000
+DISCLOSURE_TTL = 12 * 3600
+
+# Minimum seconds between two refreshes of a symbol
+REFRESH_COOLDOWN = 3600
+
+# Quarter ends, as MMDD
+QUARTER_ENDS = ("0331", "0630", "0930", "1231")
+
+
+def _connect(db_path: Optional[str]) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path or get_cache_path(project_name))
+    columns_definition = ", ".join(f"{col} {dtype}" for col, dtype in DISCLOSURE_SCHEMA.items())
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {DISCLOSURE_TABLE} ({columns_definition}, "
+        "PRIMARY KEY (ts_code, end_date)) WITHOUT ROWID"
+    )
+    conn.execute(CACHE_META_SCHEMA)
+    return conn
+
+
+def recent_periods(today: Optional[dateType] = None, count: int = 2) -> List[str]:
+    """Return the last count quarter ends before today, latest first, e.g. ['20240331', '20231231']."""
+    today = today or datetime.now().date()
+    periods = []
+    year = today.year
+    while len(periods) < count:
+        for mmdd in reversed(QUARTER_ENDS):
+            period = f"{year}{mmdd}"
+            if period < today.strftime("%Y%m%d") and len(periods) < count:
+                periods.append(period)
+        year -= 1
+    return periods
+
+
+def download_disclosures(pro, end_date: str) -> pd.DataFrame:
+    """Downloads the disclosure calendar of one reporting period, page by page."""
+    pages = []
+    offset = 0
+    while True:
+        get_rate_limiter().wait()
+        page = pro.disclosure_date(end_date=end_date, limit=DISCLOSURE_PAGE_SIZE, offset=offset)
+        if page is None:
+            break
+        pages.append(page)
+        if len(page) < DISCLOSURE_PAGE_SIZE:
+            break
+        offset += DISCLOSURE_PAGE_SIZE
+    data = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame(columns=list(DISCLOSURE_SCHEMA))
+    logger.info(f"Downloaded {len(data)} disclosure dates for period {end_date}.")
+    return data
+
+
+def write_disclosures(data: pd.DataFrame, db_path: Optional[str] = None) -> int:
+    """Upsert disclosure calendar rows in one transaction."""
+    if data is None or data.empty:
+        return 0
+    data = data.reindex(columns=list(DISCLOSURE_SCHEMA))
+    # Schedule revisions may come as a comma-separated history, keep the latest one
+    data["modify_date"] = data["modify_date"].astype("string").str.split(",").str[-1].str.strip()
+    data = data.drop_duplicates(subset=["ts_code", "end_date"], keep="last")
+    rows = data.astype(object).where(data.notna(), None).itertuples(index=False, name=None)
+    conn = _connect(db_path)
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {DISCLOSURE_TABLE} ({', '.join(data.columns)}) "
+                f"VALUES ({', '.join(['?'] * len(data.columns))})",
+                rows,
+            )
+    finally:
+        conn.close()
+    return len(data)
+
+
+def sync_disclosures(periods: Optional[Iterable[str]] = None, api_key: str = "", db_path: Optional[str] = None) -> int:
+    """
+    Download the disclosure calendar of the given reporting periods into the cache.
+
+    Parameters:
+        periods (Iterable[str]): Reporting periods, e.g. ["20231231"]. Defaults to the two latest quarter ends.
+        api_key (str): Tushare API key.
+        db_path (str): SQLite database of the cache.
+
+    Returns:
+        int: Number of calendar rows written.
+    """
+    pro = ts.pro_api(get_api_key(api_key))
+    total = 0
+    for period in periods or recent_periods():
+        data = download_disclosures(pro, period)
+        rows = write_disclosures(data, db_path=db_path)
+        record_meta(DISCLOSURE_TABLE, period, period, period, rows, db_path=db_path)
+        total += rows
+    return total
+
+
+def ensure_disclosures(api_key: str = "", max_age: float = DISCLOSURE_TTL, db_path: Optional[str] = None) -> None:
+    """Sync the calendar of the recent periods that were not synced within max_age seconds."""
+    now = time.time()
+    periods = []
+    for period in recent_periods():
+        meta = get_meta(DISCLOSURE_TABLE, period, db_path=db_path)
+        if meta is None or now - meta.last_sync > max_age:
+            periods.append(period)
+    if periods:
+        try:
+            sync_disclosures(periods, api_key=api_key, db_path=db_path)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning(f"Could not sync the disclosure calendar of {', '.join(periods)}: {e}")
+
+
+def stale_symbols(
+    statement: str,
+    ts_codes: Optional[Iterable[str]] = None,
+    today: Optional[dateType] = None,
+    db_path: Optional[str] = None,
+) -> List[str]:
+    """
+    Return the cached symbols of a statement that disclosed a report since their last sync.
+
+    A symbol is stale when the calendar has a report later than its latest cached
+    period, disclosed on or before today and not before the day of the last sync. A
+    symbol synced within the last REFRESH_COOLDOWN seconds is not stale, so a report
+    Tushare has not published yet is retried at most that often.
+
+    Parameters:
+        statement (str): Statement dataset, e.g. "income_statement".
+        ts_codes (Iterable[str]): Symbols to check. Defaults to every cached symbol.
+        today (date): Reference date. Defaults to today.
+        db_path (str): SQLite database of the cache.
+    """
+    today = (today or datetime.now().date()).strftime("%Y%m%d")
+    query = (
+        f"SELECT DISTINCT d.ts_code FROM {DISCLOSURE_TABLE} d "
+        "JOIN cache_meta m ON m.dataset = ? AND m.key = d.ts_code "
+        "WHERE d.actual_date IS NOT NULL AND d.actual_date <> '' AND d.actual_date <= ? "
+        "AND d.end_date > m.max_date "
+        "AND d.actual_date >= strftime('%Y%m%d', m.last_sync, 'unixepoch', 'localtime') "
+        "AND m.last_sync < ?"
+    )
+    params: list = [statement, today, time.time() - REFRESH_COOLDOWN]
+    if ts_codes is not None:
+        codes = [normalize_symbol(code)[1] for code in ts_codes]
+        if not codes:
+            return []
+        query += f" AND d.ts_code IN ({', '.join(['?'] * len(codes))})"
+        params += codes
+    conn = _connect(db_path)
+    try:
+        return [row[0] for row in conn.execute(query + " ORDER BY d.ts_code", params)]
+    finally:
+        conn.close()
+
+
+def is_stale(statement: str, ts_code: str, db_path: Optional[str] = None) -> bool:
+    """Return whether the cached statement of ts_code misses a report disclosed since its last sync."""
+    return bool(stale_symbols(statement, [ts_code], db_path=db_path))
+
+
+def refresh_statements(
+    statements: Iterable[str] = ("income_statement", "balance_sheet", "cash_flow"),
+    api_key: str = "",
+    sync: bool = True,
+) -> Dict[str, List[str]]:
+    """
+    Scheduled refresh: re-download the statements of the symbols that disclosed a new report.
+
+    Parameters:
+        statements (Iterable[str]): Statements to refresh.
+        api_key (str): Tushare API key.
+        sync (bool): Whether to sync the disclosure calendar of the recent periods first.
+
+    Returns:
+        Dict[str, List[str]]: Refreshed symbols per statement.
+    """
+    # pylint: disable=import-outside-toplevel
+    from openbb_tushare.utils import ts_balance_sheet, ts_cash_flow, ts_income_statement
+    from openbb_tushare.utils.fundamentals_store import load_statement
+
+    get_data = {
+        "income_statement": ts_income_statement.get_tushare_data,
+        "balance_sheet": ts_balance_sheet.get_tushare_data,
+        "cash_flow": ts_cash_flow.get_tushare_data,
+    }
+    if sync:
+        sync_disclosures(api_key=api_key)
+
+    refreshed = {}
+    for statement in statements:
+        refreshed[statement] = []
+        for ts_code in stale_symbols(statement):
+            get_rate_limiter().wait()
+            try:
+                load_statement(statement, ts_code, False, get_data[statement], api_key=api_key, check_disclosures=False)
+                refreshed[statement].append(ts_code)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"Error refreshing the {statement} of {ts_code}: {e}")
+        logger.info(f"Refreshed the {statement} of {len(refreshed[statement])} symbols.")
+    return refreshed
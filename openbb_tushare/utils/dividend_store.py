@@ -0,0 +1,301 @@
+"""
+Date-indexed store of the A-share dividends.
+
+Implemented dividends (the rows of pro.dividend with an ex-dividend date) are kept
+in one SQLite table of the shared cache keyed by (ts_code, ex_date), with secondary
+indexes on ex_date and record_date, so both the history of a symbol and every
+dividend of a date range are answered by an indexed range query.
+
+The table is filled two ways:
+
+- per symbol, by the historical dividends fetcher (pro.dividend(ts_code=...)),
+  recorded in cache_meta under dividends / ts_code;
+- per date for the whole market, by ingest_dividend_dates (pro.dividend(ex_date=...)
+  or pro.dividend(record_date=...)), one call per trading session, recorded under
+  dividends_ex_date / dividends_record_date and the date.
+
+Proposals without an ex-dividend date are not kept.
+"""
+import logging
+import sqlite3
+import time
+from datetime import date as dateType, datetime, timedelta
+from typing import Dict, Literal, Optional, Union
+
+import pandas as pd
+import tushare as ts
+from mysharelib import get_cache_path
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare.utils.cache_meta import CACHE_META_SCHEMA, get_meta, record_meta
+from openbb_tushare.utils.concurrency import get_rate_limiter
+from openbb_tushare.utils.helpers import get_api_key
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+DIVIDEND_TABLE = "dividends"
+DIVIDEND_SCHEMA = {
+    "ts_code": "TEXT NOT NULL",   # Tushare code
+    "ex_date": "TEXT NOT NULL",   # Ex-dividend date (YYYYMMDD)
+    "end_date": "TEXT",           # Dividend year
+    "ann_date": "TEXT",           # Announcement date of the plan
+    "div_proc": "TEXT",           # Progress of the plan
+    "stk_div": "REAL",            # Stock dividend per share
+    "stk_bo_rate": "REAL",        # Bonus shares per share
+    "stk_co_rate": "REAL",        # Shares converted from reserves per share
+    "cash_div": "REAL",           # Cash dividend per share, after tax
+    "cash_div_tax": "REAL",       # Cash dividend per share, before tax
+    "record_date": "TEXT",        # Record date
+    "pay_date": "TEXT",           # Payment date
+    "div_listdate": "TEXT",       # Listing date of the bonus shares
+    "imp_ann_date": "TEXT",       # Announcement date of the implementation
+    "base_date": "TEXT",          # Base date of the share capital
+    "base_share": "REAL",         # Base share capital (10k shares)
+}
+
+# Dates the market-wide ingest can go by, and the cache_meta dataset of each
+DATE_DATASETS = {
+    "ex_date": "dividends_ex_date",
+    "record_date": "dividends_record_date",
+}
+
+# How long the dividends of a symbol, or of a date not passed yet, stay fresh
+DIVIDEND_TTL = 12 * 3600
+
+_stores: Dict[str, "DividendStore"] = {}
+
+
+def to_date(day: Union[str, dateType]) -> str:
+    """Return a date as 'YYYYMMDD'."""
+    if isinstance(day, dateType):
+        return day.strftime("%Y%m%d")
+    return str(day).replace("-", "")
+
+
+class DividendStore:
+    """
+    Implemented dividends of all A-share symbols, keyed by (ts_code, ex_date).
+
+    Parameters:
+        db_path (str): SQLite database. Defaults to the shared cache database.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or get_cache_path(project_name)
+        columns_definition = ", ".join(f"{col} {dtype}" for col, dtype in DIVIDEND_SCHEMA.items())
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {DIVIDEND_TABLE} ({columns_definition}, "
+                "PRIMARY KEY (ts_code, ex_date)) WITHOUT ROWID"
+            )
+            for col in DATE_DATASETS:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{DIVIDEND_TABLE}_{col} ON {DIVIDEND_TABLE} ({col})")
+            conn.execute(CACHE_META_SCHEMA)
+
+    def write(self, data: pd.DataFrame) -> int:
+        """
+        Upsert dividend rows of any number of symbols in one transaction.
+
+        Returns:
+            int: Number of rows written, rows without an ex-dividend date are skipped.
+        """
+        if data is None or data.empty:
+            return 0
+        data = data.reindex(columns=list(DIVIDEND_SCHEMA))
+        data = data[data["ts_code"].notna() & data["ex_date"].notna() & (data["ex_date"].astype(str) != "")]
+        data = data.drop_duplicates(subset=["ts_code", "ex_date"], keep="last")
+        if data.empty:
+            return 0
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {DIVIDEND_TABLE} ({', '.join(data.columns)}) "
+                f"VALUES ({', '.join(['?'] * len(data.columns))})",
+                data.astype(object).where(data.notna(), None).itertuples(index=False, name=None),
+            )
+        return len(data)
+
+    def read(
+        self,
+        ts_code: Optional[str] = None,
+        start_date: Optional[Union[str, dateType]] = None,
+        end_date: Optional[Union[str, dateType]] = None,
+        by: Literal["ex_date", "record_date"] = "ex_date",
+    ) -> pd.DataFrame:
+        """
+        Return the cached dividends in a date range, ordered by date.
+
+        Parameters:
+            ts_code (str): Symbol to read. Defaults to every symbol.
+            start_date (str | date): First date, inclusive. Defaults to the earliest.
+            end_date (str | date): Last date, inclusive. Defaults to the latest.
+            by (str): Date column the range applies to, "ex_date" or "record_date".
+        """
+        if by not in DATE_DATASETS:
+            raise ValueError(f"Unknown dividend date {by}, expected one of {', '.join(DATE_DATASETS)}.")
+        clauses, params = [], []
+        if ts_code is not None:
+            clauses.append("ts_code = ?")
+            params.append(normalize_symbol(ts_code)[1])
+        if start_date is not None:
+            clauses.append(f"{by} >= ?")
+            params.append(to_date(start_date))
+        if end_date is not None:
+            clauses.append(f"{by} <= ?")
+            params.append(to_date(end_date))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with sqlite3.connect(self.db_path) as conn:
+            return pd.read_sql_query(
+                f"SELECT * FROM {DIVIDEND_TABLE}{where} ORDER BY {by}, ts_code", conn, params=params
+            )
+
+    def synced_dates(self, by: str, start_date: str, end_date: str) -> Dict[str, float]:
+        """Return the last sync time of every date of the range ingested market-wide."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT key, last_sync FROM cache_meta WHERE dataset = ? AND key BETWEEN ? AND ?",
+                (DATE_DATASETS[by], start_date, end_date),
+            )
+            return dict(rows.fetchall())
+
+
+def get_dividend_store(db_path: Optional[str] = None) -> DividendStore:
+    """Return the process-wide dividend store."""
+    db_path = db_path or get_cache_path(project_name)
+    store = _stores.get(db_path)
+    if store is None:
+        store = DividendStore(db_path)
+        _stores[db_path] = store
+    return store
+
+
+def is_fresh(day: str, last_sync: Optional[float], now: Optional[float] = None) -> bool:
+    """
+    Return whether the market-wide dividends of a date need no new sync.
+
+    A date synced after it passed is final, a later one is synced again once
+    DIVIDEND_TTL has elapsed, as implementation notices keep coming in.
+    """
+    if last_sync is None:
+        return False
+    now = time.time() if now is None else now
+    return datetime.fromtimestamp(last_sync).strftime("%Y%m%d") > day or now - last_sync < DIVIDEND_TTL
+
+
+def load_dividends(
+    symbol: str,
+    start_date: Optional[Union[str, dateType]] = None,
+    end_date: Optional[Union[str, dateType]] = None,
+    use_cache: bool = True,
+    api_key: str = "",
+    store: Optional[DividendStore] = None,
+) -> pd.DataFrame:
+    """
+    Return the dividends of a symbol with an ex-dividend date in the range, downloading them when stale.
+
+    Parameters:
+        symbol (str): Symbol to load.
+        start_date (str | date): First ex-dividend date, inclusive.
+        end_date (str | date): Last ex-dividend date, inclusive.
+        use_cache (bool): Whether to use the cached dividends.
+        api_key (str): Tushare API key.
+        store (DividendStore): Source store. Defaults to the shared cache.
+    """
+    store = store or get_dividend_store()
+    _, symbol_f, _ = normalize_symbol(symbol)
+    meta = get_meta(DIVIDEND_TABLE, symbol_f, db_path=store.db_path)
+    if not use_cache or meta is None or time.time() - meta.last_sync > DIVIDEND_TTL:
+        pro = ts.pro_api(get_api_key(api_key))
+        get_rate_limiter().wait()
+        data = pro.dividend(ts_code=symbol_f)
+        rows = store.write(data)
+        dates = data["ex_date"].dropna().astype(str) if data is not None and "ex_date" in data.columns else pd.Series(dtype=str)
+        dates = dates[dates != ""]
+        record_meta(
+            DIVIDEND_TABLE, symbol_f,
+            dates.min() if rows else None, dates.max() if rows else None, rows,
+            db_path=store.db_path,
+        )
+    else:
+        logger.info(f"Loading dividends of {symbol_f} from cache...")
+    return store.read(symbol_f, start_date, end_date)
+
+
+def ingest_dividend_dates(
+    start_date: Union[str, dateType],
+    end_date: Union[str, dateType],
+    by: Literal["ex_date", "record_date"] = "ex_date",
+    api_key: str = "",
+    use_cache: bool = True,
+    store: Optional[DividendStore] = None,
+) -> int:
+    """
+    Ingest the dividends of the whole market for the trading sessions of a date range.
+
+    One pro.dividend call per session that is not fresh, see is_fresh.
+
+    Parameters:
+        start_date (str | date): First date, inclusive.
+        end_date (str | date): Last date, inclusive.
+        by (str): Date the dividends are fetched by, "ex_date" or "record_date".
+        api_key (str): Tushare API key.
+        use_cache (bool): Whether the sessions synced already are skipped.
+        store (DividendStore): Target store. Defaults to the shared cache.
+
+    Returns:
+        int: Number of dividend rows written.
+    """
+    from openbb_tushare.utils.ts_trade_calendar import get_trade_calendar
+
+    if by not in DATE_DATASETS:
+        raise ValueError(f"Unknown dividend date {by}, expected one of {', '.join(DATE_DATASETS)}.")
+    store = store or get_dividend_store()
+    start, end = to_date(start_date), to_date(end_date)
+    sessions = get_trade_calendar("SH", api_key=api_key).trading_days(
+        datetime.strptime(start, "%Y%m%d").date(), datetime.strptime(end, "%Y%m%d").date()
+    )
+    synced = store.synced_dates(by, start, end) if use_cache else {}
+    days = [str(day).replace("-", "") for day in sessions]
+    days = [day for day in days if not is_fresh(day, synced.get(day))]
+    if not days:
+        return 0
+
+    pro = ts.pro_api(get_api_key(api_key))
+    total = 0
+    for day in days:
+        get_rate_limiter().wait()
+        data = pro.dividend(**{by: day})
+        rows = store.write(data)
+        record_meta(DATE_DATASETS[by], day, day, day, rows, db_path=store.db_path)
+        total += rows
+    logger.info(f"Ingested {total} dividends by {by} for {len(days)} sessions from {start} to {end}.")
+    return total
+
+
+def get_dividend_calendar(
+    start_date: Optional[dateType] = None,
+    end_date: Optional[dateType] = None,
+    by: Literal["ex_date", "record_date"] = "ex_date",
+    use_cache: bool = True,
+    api_key: str = "",
+    store: Optional[DividendStore] = None,
+) -> pd.DataFrame:
+    """
+    Return every dividend of the market with an ex-dividend (or record) date in the range.
+
+    The sessions of the range are ingested market-wide first, the result is then a
+    single indexed query.
+
+    Parameters:
+        start_date (date): First date, inclusive. Defaults to today.
+        end_date (date): Last date, inclusive. Defaults to 30 days after start_date.
+        by (str): Date the range applies to, "ex_date" or "record_date".
+        use_cache (bool): Whether the sessions synced already are skipped.
+        api_key (str): Tushare API key.
+        store (DividendStore): Source store. Defaults to the shared cache.
+    """
+    store = store or get_dividend_store()
+    start_date = start_date or datetime.now().date()
+    end_date = end_date or start_date + timedelta(days=30)
+    ingest_dividend_dates(start_date, end_date, by, api_key=api_key, use_cache=use_cache, store=store)
+    return store.read(None, start_date, end_date, by=by)
@@ -0,0 +1,426 @@
+"""
+Wide-table store of the A-share financial statements.
+
+Each statement (income statement, balance sheet, cash flow) is one SQLite table of
+the shared cache keyed by (ts_code, end_date) with a secondary index on end_date,
+one column per Tushare field, holding the latest version of every report. Columns
+are added as new fields show up.
+
+Every announced version of a report (original, corrections, restatements) is also
+kept in a *_versions table keyed by (ts_code, end_date, ann_date, f_ann_date,
+update_flag). AsOfIndex answers "what was known on date D" from it for backtests.
+
+The tables are filled two ways:
+
+- per symbol, by the statement fetchers on a cache miss (pro.income(ts_code=...));
+- per reporting period for the whole market, by ingest_period through the VIP
+  endpoints (pro.income_vip(period=...)), a few paged calls per statement.
+
+HK statements come in long format from different endpoints and stay in the
+per-symbol BlobCache.
+"""
+import logging
+import sqlite3
+import time
+from datetime import date as dateType
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+import tushare as ts
+from mysharelib import get_cache_path
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare.utils.cache_meta import CACHE_META_SCHEMA, record_meta
+from openbb_tushare.utils.concurrency import get_rate_limiter
+from openbb_tushare.utils.helpers import get_api_key
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+
+class StatementSpec(NamedTuple):
+    """Tushare endpoints and cache table of one financial statement."""
+
+    api: str        # per-symbol endpoint, e.g. income
+    vip_api: str    # per-period endpoint over all companies, e.g. income_vip
+    table: str
+
+
+# Keyed by the dataset names the statements are recorded under in cache_meta
+STATEMENTS = {
+    "income_statement": StatementSpec("income", "income_vip", "fina_income"),
+    "balance_sheet": StatementSpec("balancesheet", "balancesheet_vip", "fina_balancesheet"),
+    "cash_flow": StatementSpec("cashflow", "cashflow_vip", "fina_cashflow"),
+}
+
+# Fields kept as text, every other field holds amounts
+TEXT_FIELDS = ("ts_code", "ann_date", "f_ann_date", "end_date", "report_type", "comp_type", "end_type", "update_flag")
+
+# Key of the versions tables; missing dates and flags are stored as ''
+VERSION_KEY = ("ts_code", "end_date", "ann_date", "f_ann_date", "update_flag")
+
+# Rows per call of the VIP endpoints
+PERIOD_PAGE_SIZE = 5000
+
+_stores: Dict[str, "FundamentalsStore"] = {}
+
+
+def to_period(period: Union[str, dateType]) -> str:
+    """Return a reporting period as 'YYYYMMDD', e.g. 20231231."""
+    if isinstance(period, dateType):
+        return period.strftime("%Y%m%d")
+    return str(period).replace("-", "")
+
+
+def known_dates(data: pd.DataFrame) -> pd.Series:
+    """Return the date each version became public: f_ann_date, else ann_date, else end_date."""
+    known = pd.Series("", index=data.index, dtype=object)
+    for col in ("end_date", "ann_date", "f_ann_date"):
+        if col in data.columns:
+            dates = data[col].astype("string").str[:8]
+            known = known.mask(dates.str.fullmatch(r"\d{8}").fillna(False).astype(bool), dates)
+    return known.astype(str)
+
+
+def latest_versions(data: pd.DataFrame) -> pd.DataFrame:
+    """Keep the latest announced version of each (ts_code, end_date) report."""
+    order = [col for col in ("ts_code", "end_date", "ann_date", "f_ann_date", "update_flag") if col in data.columns]
+    data = data.sort_values(order, kind="stable", na_position="first")
+    return data.drop_duplicates(subset=["ts_code", "end_date"], keep="last")
+
+
+class FundamentalsStore:
+    """
+    Financial statements of all A-share symbols, one wide SQLite table per statement.
+
+    Parameters:
+        db_path (str): SQLite database. Defaults to the shared cache database.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or get_cache_path(project_name)
+        with sqlite3.connect(self.db_path) as conn:
+            for spec in STATEMENTS.values():
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {spec.table} (ts_code TEXT NOT NULL, end_date TEXT NOT NULL, "
+                    "PRIMARY KEY (ts_code, end_date)) WITHOUT ROWID"
+                )
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{spec.table}_end_date ON {spec.table} (end_date)")
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {spec.table}_versions ("
+                    + ", ".join(f"{col} TEXT NOT NULL" for col in VERSION_KEY)
+                    + f", PRIMARY KEY ({', '.join(VERSION_KEY)})) WITHOUT ROWID"
+                )
+            conn.execute(CACHE_META_SCHEMA)
+
+    def columns(self, statement: str) -> List[str]:
+        """Return the columns of a statement table."""
+        with sqlite3.connect(self.db_path) as conn:
+            return [row[1] for row in conn.execute(f"PRAGMA table_info({STATEMENTS[statement].table})")]
+
+    def _ensure_columns(self, conn: sqlite3.Connection, table: str, data: pd.DataFrame) -> None:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for col in data.columns:
+            if col not in existing:
+                dtype = "TEXT" if col in TEXT_FIELDS else "REAL"
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN "{col}" {dtype}')
+
+    def _refresh_meta(self, conn: sqlite3.Connection, statement: str, ts_codes: Iterable[str]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO cache_meta (dataset, key, min_date, max_date, row_count, last_sync) "
+            f"SELECT ?, ts_code, MIN(end_date), MAX(end_date), COUNT(*), ? FROM {STATEMENTS[statement].table} "
+            "WHERE ts_code = ? GROUP BY ts_code",
+            [(statement, time.time(), ts_code) for ts_code in ts_codes],
+        )
+
+    def write(self, statement: str, data: pd.DataFrame) -> int:
+        """
+        Upsert statement rows of any number of symbols in one transaction.
+
+        The statement table keeps the latest announced version of each (ts_code,
+        end_date), the versions table every version.
+
+        Returns:
+            int: Number of rows written.
+        """
+        if data is None or data.empty:
+            return 0
+        table = STATEMENTS[statement].table
+        data = data.dropna(subset=["ts_code", "end_date"])
+        versions = data.assign(**{col: data[col].fillna("") if col in data.columns else "" for col in VERSION_KEY})
+        versions = versions.drop_duplicates(subset=list(VERSION_KEY), keep="first")
+        data = latest_versions(data)
+        with sqlite3.connect(self.db_path) as conn:
+            self._upsert(conn, table, data)
+            self._upsert(conn, f"{table}_versions", versions)
+            self._refresh_meta(conn, statement, data["ts_code"].unique().tolist())
+        return len(data)
+
+    def _upsert(self, conn: sqlite3.Connection, table: str, data: pd.DataFrame) -> None:
+        self._ensure_columns(conn, table, data)
+        columns = ", ".join(f'"{col}"' for col in data.columns)
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({', '.join(['?'] * len(data.columns))})",
+            data.astype(object).where(data.notna(), None).itertuples(index=False, name=None),
+        )
+
+    def read(self, statement: str, ts_code: str) -> pd.DataFrame:
+        """Return the cached statements of a symbol, latest period first."""
+        _, ts_code, _ = normalize_symbol(ts_code)
+        with sqlite3.connect(self.db_path) as conn:
+            return pd.read_sql(
+                f"SELECT * FROM {STATEMENTS[statement].table} WHERE ts_code = ? ORDER BY end_date DESC",
+                conn, params=(ts_code,),
+            )
+
+    def read_period(self, statement: str, period: Union[str, dateType], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Return the statements of every cached symbol for one reporting period."""
+        selected = "*" if not columns else ", ".join(f'"{c}"' for c in dict.fromkeys(["ts_code", "end_date"] + columns))
+        with sqlite3.connect(self.db_path) as conn:
+            return pd.read_sql(
+                f"SELECT {selected} FROM {STATEMENTS[statement].table} WHERE end_date = ? ORDER BY ts_code",
+                conn, params=(to_period(period),),
+            )
+
+    def read_versions(self, statement: str, ts_codes: Iterable[str]) -> pd.DataFrame:
+        """Return every cached version of the statements of the given symbols."""
+        codes = [normalize_symbol(code)[1] for code in ts_codes]
+        with sqlite3.connect(self.db_path) as conn:
+            return pd.read_sql(
+                f"SELECT * FROM {STATEMENTS[statement].table}_versions "
+                f"WHERE ts_code IN ({', '.join(['?'] * len(codes))})",
+                conn, params=codes,
+            )
+
+    def as_of(self, statement: str, ts_codes: Iterable[str], as_of: Union[str, dateType]) -> pd.DataFrame:
+        """Return the statements of the given symbols as they were known on as_of."""
+        return AsOfIndex(self.read_versions(statement, ts_codes)).as_of(as_of)
+
+
+class AsOfIndex:
+    """
+    Sorted as-of index over statement versions.
+
+    Versions are sorted by (ts_code, end_date, known date), one segment per report.
+    A query for date D runs a single searchsorted over all segments at once and
+    takes, in each segment, the last version made public on or before D.
+
+    Parameters:
+        versions (DataFrame): Statement versions, e.g. from FundamentalsStore.read_versions.
+    """
+
+    def __init__(self, versions: pd.DataFrame):
+        known = pd.to_numeric(known_dates(versions), errors="coerce").fillna(0).astype("int64")
+        flags = versions["update_flag"] if "update_flag" in versions.columns else ""
+        self.data = (
+            versions.assign(_known=known.to_numpy(), _flag=flags)
+            .sort_values(["ts_code", "end_date", "_known", "_flag"], kind="stable")
+            .reset_index(drop=True)
+        )
+        # Segment (report) of each row and the first row of each segment
+        report = self.data["ts_code"] + "|" + self.data["end_date"]
+        self._segment = pd.factorize(report, sort=False)[0].astype("int64") if len(self.data) else np.empty(0, "int64")
+        self._starts = np.flatnonzero(np.r_[True, self._segment[1:] != self._segment[:-1]]) if len(self.data) else np.empty(0, "int64")
+        # Known dates are YYYYMMDD, so segment * 10**8 + date sorts like (segment, date)
+        self._keys = self._segment * 10**8 + self.data["_known"].to_numpy()
+
+    def as_of(self, as_of: Union[str, dateType], ts_codes: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Return the versions known on as_of, one row per (ts_code, end_date), latest period first.
+
+        Parameters:
+            as_of (str | date): Point in time, e.g. "20240430".
+            ts_codes (Iterable[str]): Restrict to these symbols. Defaults to all indexed symbols.
+        """
+        if self.data.empty:
+            return self.data.drop(columns=["_known", "_flag"])
+        day = int(to_period(as_of))
+        segments = np.arange(len(self._starts), dtype="int64")
+        positions = np.searchsorted(self._keys, segments * 10**8 + day, side="right") - 1
+        rows = positions[positions >= self._starts]
+        result = self.data.iloc[rows]
+        if ts_codes is not None:
+            result = result[result["ts_code"].isin([normalize_symbol(code)[1] for code in ts_codes])]
+        result = result.sort_values(["ts_code", "end_date"], ascending=[True, False])
+        return result.drop(columns=["_known", "_flag"]).reset_index(drop=True)
+
+
+def get_statements_as_of(
+    statement: str,
+    ts_codes: Iterable[str],
+    as_of: Union[str, dateType],
+    store: Optional[FundamentalsStore] = None,
+) -> pd.DataFrame:
+    """
+    Return the statements of many symbols as they were known on a date, for backtests.
+
+    Only the cached versions are used, see FundamentalsStore.read_versions.
+    """
+    return (store or get_fundamentals_store()).as_of(statement, ts_codes, as_of)
+
+
+def get_fundamentals_store(db_path: Optional[str] = None) -> FundamentalsStore:
+    """Return the process-wide fundamentals store."""
+    db_path = db_path or get_cache_path(project_name)
+    store = _stores.get(db_path)
+    if store is None:
+        store = FundamentalsStore(db_path)
+        _stores[db_path] = store
+    return store
+
+
+def _has_new_report(statement: str, ts_code: str, store: FundamentalsStore, api_key: str) -> bool:
+    from openbb_tushare.utils.disclosure import ensure_disclosures, is_stale
+
+    ensure_disclosures(api_key=api_key, db_path=store.db_path)
+    if is_stale(statement, ts_code, db_path=store.db_path):
+        logger.info(f"{ts_code} disclosed a new report, refreshing its {statement}...")
+        return True
+    return False
+
+
+def load_statement(
+    statement: str,
+    symbol: str,
+    use_cache: bool,
+    get_data: Callable,
+    api_key: str = "",
+    check_disclosures: bool = True,
+    as_of: Optional[dateType] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Return the statements of a symbol, latest period first, downloading them on a cache miss.
+
+    A-share symbols are served from the fundamentals store, HK symbols from the
+    per-symbol BlobCache, pivoted from line items to one row per period. A cached
+    A-share symbol is downloaded again when the disclosure calendar shows a newer
+    report, see disclosure.stale_symbols.
+
+    Parameters:
+        statement (str): "income_statement", "balance_sheet" or "cash_flow".
+        symbol (str): Symbol to load.
+        use_cache (bool): Whether to use the cached statements.
+        get_data (Callable): Per-symbol download function, called as get_data(symbol, "quarter", api_key=...).
+        api_key (str): Tushare API key.
+        check_disclosures (bool): Whether a cache hit is checked against the disclosure calendar.
+        as_of (date): Return the statements as known on this date instead of the
+            latest versions. HK statements carry no versions and are only cut to
+            the periods ended by then.
+    """
+    from mysharelib.blob_cache import BlobCache
+    from openbb_tushare.utils.cache_meta import tracked
+    from openbb_tushare.utils.statement_mapping import is_long_format, pivot_hk
+
+    _, symbol_f, market = normalize_symbol(symbol)
+    if market == "HK":
+        cache = BlobCache(table_name=statement, project=project_name)
+        data = cache.load_cached_data(symbol, "quarter", use_cache, tracked(statement, get_data, "end_date"), api_key=api_key)
+        if data is not None and is_long_format(data):
+            data = pivot_hk(statement, data)
+        if data is not None and as_of is not None:
+            data = data[data["end_date"].astype(str) <= to_period(as_of)]
+        return data
+
+    store = get_fundamentals_store()
+    if as_of is not None:
+        # Symbols cached before versions were kept have no versions yet
+        if not use_cache or store.read_versions(statement, [symbol_f]).empty:
+            load_statement(statement, symbol_f, False, get_data, api_key=api_key)
+        data = store.as_of(statement, [symbol_f], as_of)
+        return None if data.empty else data
+    if use_cache:
+        data = store.read(statement, symbol_f)
+        if not data.empty and not (check_disclosures and _has_new_report(statement, symbol_f, store, api_key)):
+            logger.info(f"Loading {statement} of {symbol_f} from cache...")
+            return data
+    data = get_data(symbol_f, "quarter", api_key=api_key)
+    if data is None or data.empty:
+        return None
+    store.write(statement, data)
+    return store.read(statement, symbol_f)
+
+
+def get_fiscal_year_end(
+    statement: str,
+    symbol: str,
+    data: Optional[pd.DataFrame],
+    use_cache: bool = True,
+    api_key: str = "",
+) -> int:
+    """
+    Return the month (1-12) the fiscal year of a symbol ends in.
+
+    A-shares always close their year in December. HK issuers may not, e.g. in
+    March, and their line items carry no report type: the month is inferred from
+    the income statements, the ones just loaded or the cached ones for the other
+    statements, see statement_mapping.infer_fiscal_year_end.
+
+    Parameters:
+        statement (str): "income_statement", "balance_sheet" or "cash_flow".
+        symbol (str): Symbol the statements belong to.
+        data (DataFrame): Statements loaded by load_statement for the symbol.
+        use_cache (bool): Whether to use the cached income statements.
+        api_key (str): Tushare API key.
+    """
+    from openbb_tushare.utils.statement_mapping import infer_fiscal_year_end
+
+    _, _, market = normalize_symbol(symbol)
+    if market != "HK":
+        return 12
+    if statement != "income_statement":
+        from openbb_tushare.utils.ts_income_statement import get_tushare_data
+
+        data = load_statement("income_statement", symbol, use_cache, get_tushare_data, api_key=api_key)
+    return infer_fiscal_year_end(data)
+
+
+def download_period(pro, spec: StatementSpec, period: str) -> pd.DataFrame:
+    """Downloads one statement of every company for a reporting period, page by page."""
+    pages = []
+    offset = 0
+    while True:
+        get_rate_limiter().wait()
+        page = getattr(pro, spec.vip_api)(period=period, limit=PERIOD_PAGE_SIZE, offset=offset)
+        if page is None:
+            break
+        pages.append(page)
+        if len(page) < PERIOD_PAGE_SIZE:
+            break
+        offset += PERIOD_PAGE_SIZE
+    data = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+    logger.info(f"Downloaded {len(data)} {spec.api} rows for period {period} in {len(pages)} calls.")
+    return data
+
+
+def ingest_period(
+    period: Union[str, dateType],
+    statements: Iterable[str] = tuple(STATEMENTS),
+    api_key: str = "",
+    store: Optional[FundamentalsStore] = None,
+) -> Dict[str, int]:
+    """
+    Ingest the statements of all A-share companies for one reporting period.
+
+    Uses the VIP endpoints (income_vip, balancesheet_vip, cashflow_vip), which need
+    the corresponding Tushare permission. The fetchers then read these symbols from
+    the cache without any further call.
+
+    Parameters:
+        period (str | date): Reporting period end, e.g. "20231231" or "20240331".
+        statements (Iterable[str]): Statements to ingest, among STATEMENTS.
+        api_key (str): Tushare API key.
+        store (FundamentalsStore): Target store. Defaults to the shared cache.
+
+    Returns:
+        Dict[str, int]: Number of rows written per statement.
+    """
+    period = to_period(period)
+    store = store or get_fundamentals_store()
+    pro = ts.pro_api(get_api_key(api_key))
+    written = {}
+    for statement in statements:
+        data = download_period(pro, STATEMENTS[statement], period)
+        written[statement] = store.write(statement, data)
+        record_meta(f"{statement}_period", period, period, period, written[statement], db_path=store.db_path)
+    return written
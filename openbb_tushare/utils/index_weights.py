@@ -0,0 +1,317 @@
+"""
+Constituent weights of the indices, with an as-of index by trade date.
+
+The monthly weight snapshots of pro.index_weight are kept in one SQLite table of
+the shared cache keyed by (index_code, trade_date, con_code). The synced window of
+each index is recorded in cache_meta under index_weight / index_code (min_date to
+max_date), so only the days outside it are ever downloaded again.
+
+IndexWeights loads the snapshots of a range once and answers "which constituents
+and weights applied on date D" with a searchsorted over the snapshot dates, so
+index-weighted computations over the cached bars need no network calls.
+"""
+import logging
+import sqlite3
+from datetime import date as dateType, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import tushare as ts
+from mysharelib import get_cache_path
+from mysharelib.tools import setup_logger
+from openbb_tushare.utils.cache_meta import CACHE_META_SCHEMA, get_meta, record_meta
+from openbb_tushare.utils.concurrency import get_rate_limiter
+from openbb_tushare.utils.helpers import get_api_key
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+WEIGHT_TABLE = "index_weight"
+WEIGHT_SCHEMA = {
+    "index_code": "TEXT NOT NULL",   # Index ts_code, e.g. 000300.SH
+    "trade_date": "TEXT NOT NULL",   # Snapshot date (YYYYMMDD)
+    "con_code": "TEXT NOT NULL",     # Constituent ts_code
+    "weight": "REAL",                # Weight in percent
+}
+
+# Maximum rows returned by one index_weight call, and the days fetched per call
+WEIGHT_LIMIT = 6000
+WEIGHT_WINDOW_DAYS = 90
+
+# Snapshots are published about monthly, an as-of date looks back this many days
+WEIGHT_LOOKBACK_DAYS = 93
+
+# Days a snapshot may be published after its trade date
+WEIGHT_PUBLISH_LAG_DAYS = 31
+
+_stores: Dict[str, "IndexWeightStore"] = {}
+
+
+def to_date(day: Union[str, dateType]) -> str:
+    """Return a date as 'YYYYMMDD'."""
+    if isinstance(day, dateType):
+        return day.strftime("%Y%m%d")
+    return str(day).replace("-", "")
+
+
+class IndexWeightStore:
+    """
+    Constituent weight snapshots of any number of indices.
+
+    Parameters:
+        db_path (str): SQLite database. Defaults to the shared cache database.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or get_cache_path(project_name)
+        columns_definition = ", ".join(f"{col} {dtype}" for col, dtype in WEIGHT_SCHEMA.items())
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {WEIGHT_TABLE} ({columns_definition}, "
+                "PRIMARY KEY (index_code, trade_date, con_code)) WITHOUT ROWID"
+            )
+            conn.execute(CACHE_META_SCHEMA)
+
+    def write(self, data: pd.DataFrame) -> int:
+        """Upsert weight rows in one transaction, returns the number of rows written."""
+        if data is None or data.empty:
+            return 0
+        data = data.reindex(columns=list(WEIGHT_SCHEMA)).dropna(subset=["index_code", "trade_date", "con_code"])
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {WEIGHT_TABLE} ({', '.join(data.columns)}) "
+                f"VALUES ({', '.join(['?'] * len(data.columns))})",
+                data.astype(object).where(data.notna(), None).itertuples(index=False, name=None),
+            )
+        return len(data)
+
+    def read(self, index_code: str, start_date: Union[str, dateType], end_date: Union[str, dateType]) -> pd.DataFrame:
+        """Return the snapshots of an index between two dates (inclusive), by date then weight."""
+        with sqlite3.connect(self.db_path) as conn:
+            return pd.read_sql_query(
+                f"SELECT trade_date, con_code, weight FROM {WEIGHT_TABLE} "
+                "WHERE index_code = ? AND trade_date BETWEEN ? AND ? ORDER BY trade_date, weight DESC, con_code",
+                conn,
+                params=(index_code, to_date(start_date), to_date(end_date)),
+            )
+
+    def as_of(self, index_code: str, as_of: Union[str, dateType]) -> pd.DataFrame:
+        """Return the latest snapshot of an index on or before as_of."""
+        with sqlite3.connect(self.db_path) as conn:
+            return pd.read_sql_query(
+                f"SELECT trade_date, con_code, weight FROM {WEIGHT_TABLE} WHERE index_code = ? AND trade_date = "
+                f"(SELECT MAX(trade_date) FROM {WEIGHT_TABLE} WHERE index_code = ? AND trade_date <= ?) "
+                "ORDER BY weight DESC, con_code",
+                conn,
+                params=(index_code, index_code, to_date(as_of)),
+            )
+
+    def synced_window(self, index_code: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return the first and last day synced for an index, or (None, None)."""
+        meta = get_meta(WEIGHT_TABLE, index_code, db_path=self.db_path)
+        return (meta.min_date, meta.max_date) if meta is not None else (None, None)
+
+    def record_window(self, index_code: str, start: str, end: str) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(f"SELECT COUNT(*) FROM {WEIGHT_TABLE} WHERE index_code = ?", (index_code,)).fetchone()[0]
+        record_meta(WEIGHT_TABLE, index_code, start, end, rows, db_path=self.db_path)
+
+
+class IndexWeights:
+    """
+    As-of index over the weight snapshots of one index.
+
+    Parameters:
+        snapshots (DataFrame): trade_date, con_code and weight rows, e.g. from IndexWeightStore.read.
+    """
+
+    def __init__(self, snapshots: pd.DataFrame):
+        self.data = snapshots.sort_values("trade_date", kind="stable").reset_index(drop=True)
+        dates = self.data["trade_date"].to_numpy(dtype=str)
+        # Snapshot dates and the first row of each snapshot, plus the end of the last one
+        self.dates, starts = np.unique(dates, return_index=True)
+        self._bounds = np.r_[starts, len(dates)]
+
+    def as_of(self, as_of: Union[str, dateType]) -> pd.DataFrame:
+        """Return the constituents and weights of the latest snapshot on or before as_of."""
+        position = int(np.searchsorted(self.dates, to_date(as_of), side="right")) - 1
+        if position < 0:
+            return self.data.iloc[:0]
+        return self.data.iloc[self._bounds[position]:self._bounds[position + 1]].reset_index(drop=True)
+
+    def weights(self, as_of: Union[str, dateType]) -> pd.Series:
+        """Return the weights applying on as_of as fractions, indexed by constituent."""
+        snapshot = self.as_of(as_of)
+        return pd.Series(snapshot["weight"].to_numpy() / 100.0, index=snapshot["con_code"].to_numpy())
+
+
+def get_weight_store(db_path: Optional[str] = None) -> IndexWeightStore:
+    """Return the process-wide index weight store."""
+    db_path = db_path or get_cache_path(project_name)
+    store = _stores.get(db_path)
+    if store is None:
+        store = IndexWeightStore(db_path)
+        _stores[db_path] = store
+    return store
+
+
+def download_weights(pro, index_code: str, start_date: dateType, end_date: dateType) -> pd.DataFrame:
+    """
+    Downloads the weight snapshots of an index between two dates.
+
+    The range is fetched in windows of WEIGHT_WINDOW_DAYS, a window returning
+    WEIGHT_LIMIT rows is split in two so no snapshot is cut.
+    """
+    windows = []
+    day = start_date
+    while day <= end_date:
+        windows.append((day, min(end_date, day + timedelta(days=WEIGHT_WINDOW_DAYS - 1))))
+        day += timedelta(days=WEIGHT_WINDOW_DAYS)
+
+    pages: List[pd.DataFrame] = []
+    while windows:
+        start, end = windows.pop(0)
+        get_rate_limiter().wait()
+        page = pro.index_weight(index_code=index_code, start_date=to_date(start), end_date=to_date(end))
+        if page is None or page.empty:
+            continue
+        if len(page) >= WEIGHT_LIMIT and start < end:
+            middle = start + (end - start) // 2
+            windows[:0] = [(start, middle), (middle + timedelta(days=1), end)]
+            continue
+        pages.append(page)
+    data = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame(columns=list(WEIGHT_SCHEMA))
+    logger.info(f"Downloaded {len(data)} weights of {index_code} from {start_date} to {end_date}.")
+    return data
+
+
+def sync_index_weights(
+    index_code: str,
+    start_date: Union[str, dateType],
+    end_date: Union[str, dateType],
+    api_key: str = "",
+    use_cache: bool = True,
+    store: Optional[IndexWeightStore] = None,
+) -> int:
+    """
+    Download the weight snapshots of an index for the days of a range not synced yet.
+
+    The synced window only ever grows, so it stays contiguous: a range before it
+    is fetched up to its start, a range after it from its end, less the last
+    WEIGHT_PUBLISH_LAG_DAYS whose snapshots may not have been published yet. Days
+    after today are not synced.
+
+    Parameters:
+        index_code (str): Index ts_code, e.g. 000300.SH.
+        start_date (str | date): First day, inclusive.
+        end_date (str | date): Last day, inclusive.
+        api_key (str): Tushare API key.
+        use_cache (bool): Whether the days synced already are skipped. The synced window
+            is extended either way.
+        store (IndexWeightStore): Target store. Defaults to the shared cache.
+
+    Returns:
+        int: Number of weight rows written.
+    """
+    store = store or get_weight_store()
+    start = to_date(start_date)
+    end = min(to_date(end_date), datetime.now().strftime("%Y%m%d"))
+    if start > end:
+        return 0
+    synced_start, synced_end = store.synced_window(index_code)
+
+    def shift(day: str, days: int) -> str:
+        return (datetime.strptime(day, "%Y%m%d").date() + timedelta(days=days)).strftime("%Y%m%d")
+
+    if synced_start is None:
+        missing = [(start, end)]
+    elif not use_cache:
+        # The whole range is fetched again, with the gap to the window if any
+        missing = [(min(start, shift(synced_end, 1)), max(end, shift(synced_start, -1)))]
+        start, end = min(start, synced_start), max(end, synced_end)
+    else:
+        # Ranges off the window include the gap to it, so the window stays contiguous
+        missing = []
+        if start < synced_start:
+            missing.append((start, shift(synced_start, -1)))
+        if end > synced_end:
+            # Snapshots are published after their trade date, the tail is fetched again
+            missing.append((max(synced_start, shift(synced_end, -WEIGHT_PUBLISH_LAG_DAYS)), end))
+        start, end = min(start, synced_start), max(end, synced_end)
+    if not missing:
+        return 0
+
+    pro = ts.pro_api(get_api_key(api_key))
+    rows = 0
+    for first, last in missing:
+        rows += store.write(download_weights(
+            pro, index_code, datetime.strptime(first, "%Y%m%d").date(), datetime.strptime(last, "%Y%m%d").date()
+        ))
+    store.record_window(index_code, start, end)
+    return rows
+
+
+def get_index_weights(
+    symbol: str,
+    start_date: Union[str, dateType],
+    end_date: Union[str, dateType],
+    use_cache: bool = True,
+    api_key: str = "",
+    store: Optional[IndexWeightStore] = None,
+) -> IndexWeights:
+    """
+    Return the as-of index of the weights of an index over a date range.
+
+    The snapshot in force on start_date is included, so as_of works for every day
+    of the range.
+
+    Parameters:
+        symbol (str): Index ts_code, e.g. 000300.SH, or a bare code of the index catalog.
+        start_date (str | date): First day, inclusive.
+        end_date (str | date): Last day, inclusive.
+        use_cache (bool): Whether the days synced already are skipped. The synced window
+            is extended either way.
+        api_key (str): Tushare API key.
+        store (IndexWeightStore): Source store. Defaults to the shared cache.
+    """
+    from openbb_tushare.utils.ts_index_historical import resolve_index_code
+
+    store = store or get_weight_store()
+    index_code = resolve_index_code(symbol, api_key=api_key)
+    start = datetime.strptime(to_date(start_date), "%Y%m%d").date() - timedelta(days=WEIGHT_LOOKBACK_DAYS)
+    sync_index_weights(index_code, start, end_date, api_key=api_key, use_cache=use_cache, store=store)
+    return IndexWeights(store.read(index_code, start, end_date))
+
+
+def get_index_constituents(
+    symbol: str,
+    as_of: Optional[dateType] = None,
+    use_cache: bool = True,
+    api_key: str = "",
+    store: Optional[IndexWeightStore] = None,
+) -> pd.DataFrame:
+    """
+    Return the constituents and weights of an index on a date.
+
+    Parameters:
+        symbol (str): Index ts_code, e.g. 000300.SH, or a bare code of the index catalog.
+        as_of (date): Date of the composition. Defaults to today.
+        use_cache (bool): Whether the days synced already are skipped. The synced window
+            is extended either way.
+        api_key (str): Tushare API key.
+        store (IndexWeightStore): Source store. Defaults to the shared cache.
+
+    Returns:
+        DataFrame: trade_date, con_code and weight of the latest snapshot on or before as_of.
+    """
+    from openbb_tushare.utils.ts_index_historical import resolve_index_code
+
+    store = store or get_weight_store()
+    index_code = resolve_index_code(symbol, api_key=api_key)
+    as_of = as_of or datetime.now().date()
+    sync_index_weights(
+        index_code, as_of - timedelta(days=WEIGHT_LOOKBACK_DAYS), as_of, api_key=api_key, use_cache=use_cache, store=store
+    )
+    return store.as_of(index_code, as_of)
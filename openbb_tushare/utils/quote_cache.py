@@ -0,0 +1,140 @@
+"""
+In-process cache of realtime quotes with trading-session-aware expiry.
+
+During a trading session a quote lives for a short TTL. Outside the sessions the
+price cannot move, so a quote is held until the next session opens: the lunch
+break ends at 13:00, and after the close the next open comes from the exchange
+trading calendar. Entries are evicted least recently used first once the cache
+holds max_entries quotes.
+"""
+import logging
+import os
+import threading
+import time as timeModule
+from collections import OrderedDict
+from datetime import (
+    datetime,
+    time,
+    timedelta,
+)
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+QUOTE_TTL_ENV = "TUSHARE_QUOTE_TTL"
+QUOTE_CACHE_SIZE_ENV = "TUSHARE_QUOTE_CACHE_SIZE"
+QUOTE_TTL = 5.0
+QUOTE_CACHE_SIZE = 2000
+
+MARKET_TZ = ZoneInfo("Asia/Shanghai")
+
+# Continuous trading sessions, in exchange local time (UTC+8 for both markets)
+MARKET_SESSIONS = {
+    "CN": ((time(9, 30), time(11, 30)), (time(13, 0), time(15, 0))),
+    "HK": ((time(9, 30), time(12, 0)), (time(13, 0), time(16, 0))),
+}
+
+
+def get_quote_market(ts_code: str) -> str:
+    """Return "HK" for Hong Kong symbols and "CN" for A-shares."""
+    _, _, market = normalize_symbol(ts_code)
+    return "HK" if market == "HK" else "CN"
+
+
+def quote_expiry(market: str, now: datetime, ttl: float, api_key: str = "") -> datetime:
+    """
+    Return when a quote fetched at now stops being fresh.
+
+    Falls back to the plain TTL when the trading calendar cannot be loaded or
+    does not cover today.
+
+    Parameters:
+        market (str): "CN" or "HK".
+        now (datetime): Fetch time, timezone-aware.
+        ttl (float): Lifetime in seconds of a quote fetched during a session.
+        api_key (str): Tushare API key, used when the calendar is not cached yet.
+    """
+    from openbb_tushare.utils.ts_trade_calendar import get_trade_calendar
+
+    now = now.astimezone(MARKET_TZ)
+    sessions = MARKET_SESSIONS[market]
+    today = now.date()
+    try:
+        calendar = get_trade_calendar("HK" if market == "HK" else "SH", api_key=api_key)
+        is_open = calendar.is_open(today)
+    except Exception as e:  # pylint: disable=broad-except
+        logger.warning(f"Trading calendar unavailable, caching quotes for {ttl}s: {e}")
+        return now + timedelta(seconds=ttl)
+
+    if is_open:
+        for session_open, session_close in sessions:
+            if now.time() < session_open:
+                return datetime.combine(today, session_open, tzinfo=MARKET_TZ)
+            if now.time() < session_close:
+                return now + timedelta(seconds=ttl)
+
+    next_day = calendar.next_session(today)
+    if next_day is None:
+        return now + timedelta(seconds=ttl)
+    return datetime.combine(next_day, sessions[0][0], tzinfo=MARKET_TZ)
+
+
+class QuoteCache:
+    """LRU cache of quote rows keyed by ts_code, with session-aware expiry."""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else float(os.environ.get(QUOTE_TTL_ENV, QUOTE_TTL))
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.environ.get(QUOTE_CACHE_SIZE_ENV, QUOTE_CACHE_SIZE)
+        )
+        # ts_code -> (expiry timestamp, quote row)
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, ts_code: str, now: Optional[float] = None) -> Optional[Dict]:
+        """Return the cached quote of ts_code, or None if missing or expired."""
+        now = timeModule.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(ts_code)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[ts_code]
+                return None
+            self._entries.move_to_end(ts_code)
+            return entry[1]
+
+    def put(self, ts_code: str, quote: Dict, now: Optional[float] = None, api_key: str = "") -> None:
+        """Cache a quote row fetched at now (a POSIX timestamp, defaults to the current time)."""
+        now = timeModule.time() if now is None else now
+        fetched = datetime.fromtimestamp(now, tz=MARKET_TZ)
+        expiry = quote_expiry(get_quote_market(ts_code), fetched, self.ttl, api_key=api_key).timestamp()
+        with self._lock:
+            self._entries[ts_code] = (expiry, quote)
+            self._entries.move_to_end(ts_code)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached quote."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_quote_cache: Optional[QuoteCache] = None
+
+
+def get_quote_cache() -> QuoteCache:
+    """Return the process-wide quote cache, sized from TUSHARE_QUOTE_TTL and TUSHARE_QUOTE_CACHE_SIZE."""
+    global _quote_cache  # pylint: disable=global-statement
+    if _quote_cache is None:
+        _quote_cache = QuoteCache()
+    return _quote_cache
@@ -0,0 +1,209 @@
+"""
+Long-running asyncio quote poller with subscriptions and diff-only updates.
+
+Clients subscribe to symbol sets. One poll loop fetches the union of all subscribed
+symbols with a single batched get_quotes call per tick, so upstream calls scale with
+unique symbols rather than with subscribers. Each subscription receives only the
+rows whose price, volume or bid/ask changed since the previous tick.
+
+    poller = get_quote_poller()
+    async with poller.subscribe(["600000.SH", "00700.HK"]) as subscription:
+        async for rows in subscription:
+            ...
+"""
+import asyncio
+import logging
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 3.0
+
+# A row is pushed to subscribers when any of these fields changed
+CHANGE_FIELDS = ("last_price", "close", "volume", "bid", "ask")
+
+_pollers: Dict[str, "QuotePoller"] = {}
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+class QuoteSubscription:
+    """Async iterator over batches of changed quote rows for one symbol set."""
+
+    def __init__(self, poller: "QuotePoller", symbols: List[str]):
+        self.symbols = symbols
+        self._poller = poller
+        self._queue: "asyncio.Queue[Optional[List[Dict]]]" = asyncio.Queue()
+        self.closed = False
+
+    def push(self, rows: Optional[List[Dict]]) -> None:
+        self._queue.put_nowait(rows)
+
+    def __aiter__(self) -> "QuoteSubscription":
+        return self
+
+    async def __anext__(self) -> List[Dict]:
+        if self.closed and self._queue.empty():
+            raise StopAsyncIteration
+        rows = await self._queue.get()
+        if rows is None:
+            raise StopAsyncIteration
+        return rows
+
+    def close(self) -> None:
+        """Unsubscribe and end the iteration."""
+        if not self.closed:
+            self.closed = True
+            self._poller.unsubscribe(self)
+            self.push(None)
+
+    async def __aenter__(self) -> "QuoteSubscription":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+
+class QuotePoller:
+    """
+    Shared poll loop over the union of the subscribed symbols.
+
+    Parameters:
+        interval (float): Seconds between two polls.
+        api_key (str): Tushare API key.
+        fetch (Callable): Batched quote function with the signature of get_quotes.
+        fields (Iterable[str]): Fields compared between ticks.
+    """
+
+    def __init__(
+        self,
+        interval: float = POLL_INTERVAL,
+        api_key: str = "",
+        fetch: Optional[Callable] = None,
+        fields: Iterable[str] = CHANGE_FIELDS,
+    ):
+        if fetch is None:
+            from openbb_tushare.utils.ts_equity_quote import get_quotes
+            fetch = get_quotes
+        self.interval = interval
+        self.api_key = api_key
+        self.fetch = fetch
+        self.fields = tuple(fields)
+        self._subscriptions: Set[QuoteSubscription] = set()
+        # ts_code -> number of subscriptions including it
+        self._refcount: Dict[str, int] = {}
+        # ts_code -> row of the previous tick
+        self._last: Dict[str, Dict] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols polled on the next tick."""
+        return list(self._refcount)
+
+    def subscribe(self, symbols: Iterable[str], snapshot: bool = True) -> QuoteSubscription:
+        """
+        Subscribe to a symbol set. Must be called from a running event loop.
+
+        Parameters:
+            symbols (Iterable[str]): Symbols to follow.
+            snapshot (bool): Push the last known rows of the symbols right away, so the
+                first batch does not wait for a change.
+        """
+        codes = list(dict.fromkeys(normalize_symbol(s.strip())[1] for s in symbols if s.strip()))
+        subscription = QuoteSubscription(self, codes)
+        self._subscriptions.add(subscription)
+        for code in codes:
+            self._refcount[code] = self._refcount.get(code, 0) + 1
+
+        known = [self._last[code] for code in codes if code in self._last]
+        if snapshot and known:
+            subscription.push(known)
+        loop = asyncio.get_running_loop()
+        # A task left on another (closed) event loop would never poll again
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: QuoteSubscription) -> None:
+        """Remove a subscription. The poll loop stops with the last one."""
+        if subscription not in self._subscriptions:
+            return
+        self._subscriptions.discard(subscription)
+        for code in subscription.symbols:
+            self._refcount[code] -= 1
+            if self._refcount[code] == 0:
+                del self._refcount[code]
+                self._last.pop(code, None)
+
+    def diff(self, rows: Iterable[Dict]) -> Dict[str, Dict]:
+        """Return the rows that changed since the previous tick, keyed by ts_code, and remember them."""
+        changed = {}
+        for row in rows:
+            code = row["ts_code"]
+            if code not in self._refcount:
+                # Unsubscribed while the poll was in flight
+                continue
+            previous = self._last.get(code)
+            if previous is None or not all(_same(row.get(f), previous.get(f)) for f in self.fields):
+                changed[code] = row
+            self._last[code] = row
+        return changed
+
+    def publish(self, changed: Dict[str, Dict]) -> None:
+        """Push each subscription the changed rows of its symbols."""
+        for subscription in list(self._subscriptions):
+            rows = [changed[code] for code in subscription.symbols if code in changed]
+            if rows:
+                subscription.push(rows)
+
+    async def poll_once(self) -> Dict[str, Dict]:
+        """Fetch every subscribed symbol in one batched call and publish the changes."""
+        symbols = self.symbols
+        if not symbols:
+            return {}
+        try:
+            data = await asyncio.to_thread(self.fetch, symbols, False, api_key=self.api_key)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning(f"Quote poll of {len(symbols)} symbols failed: {e}")
+            return {}
+        changed = self.diff(data.to_dict(orient="records"))
+        self.publish(changed)
+        return changed
+
+    async def _run(self) -> None:
+        logger.info(f"Quote poller started, polling every {self.interval}s.")
+        while self._subscriptions:
+            await self.poll_once()
+            await asyncio.sleep(self.interval)
+        logger.info("Quote poller stopped, no subscriptions left.")
+
+    async def stop(self) -> None:
+        """Close every subscription and wait for the poll loop to end."""
+        for subscription in list(self._subscriptions):
+            subscription.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def get_quote_poller(api_key: str = "", interval: float = POLL_INTERVAL) -> QuotePoller:
+    """Return the process-wide quote poller of an API key."""
+    poller = _pollers.get(api_key)
+    if poller is None:
+        poller = QuotePoller(interval=interval, api_key=api_key)
+        _pollers[api_key] = poller
+    return poller
@@ -0,0 +1,169 @@
+"""
+Process-wide registry of the reference tables (symbols, indices).
+
+Reference data changes at most daily, so each table is read from SQLite once per
+process and kept in memory, its low-cardinality columns (market, exchange, industry,
+...) compacted to categoricals. Views derived from a table (dict lookups by ts_code,
+listing dates, the symbol search index) are memoized alongside it.
+
+A table is reloaded only when it changed: every access stats the cache file and,
+only when its mtime moved, compares the sync stamp of the dataset in cache_meta.
+
+    registry = get_reference_registry()
+    row = registry.lookup("symbols", "600000.SH")
+"""
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+import pandas as pd
+from mysharelib import get_cache_path
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare.utils.cache_meta import get_meta
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+SYMBOL_CATEGORIES = ("area", "industry", "market", "exchange", "curr_type", "list_status", "is_hs", "act_ent_type")
+INDEX_CATEGORIES = ("market", "publisher", "index_type", "category", "weight_rule", "currency")
+
+_registry: Optional["ReferenceRegistry"] = None
+_registry_lock = threading.Lock()
+
+
+class ReferenceTable(NamedTuple):
+    """A reference table: its loader, called as loader(use_cache, api_key=...), and the columns stored as categoricals."""
+
+    loader: Callable[..., pd.DataFrame]
+    categories: Tuple[str, ...] = ()
+
+
+class _Entry:
+    def __init__(self, data: pd.DataFrame, version: Optional[Tuple], mtime: Optional[float]):
+        self.data = data
+        self.version = version
+        self.mtime = mtime
+        self.derived: Dict[str, Any] = {}
+
+
+def compact(data: pd.DataFrame, categories: Tuple[str, ...]) -> pd.DataFrame:
+    """Store the given low-cardinality columns of a frame as categoricals."""
+    columns = [c for c in categories if c in data.columns]
+    return data.astype({c: "category" for c in columns}) if columns else data
+
+
+def _load_symbols(use_cache: bool = True, api_key: str = "") -> pd.DataFrame:
+    from openbb_tushare.utils.ts_equity_search import get_symbols
+    return get_symbols(use_cache, api_key=api_key)
+
+
+def _load_indices(use_cache: bool = True, api_key: str = "") -> pd.DataFrame:
+    from openbb_tushare.utils.ts_available_indices import get_available_indices
+    return get_available_indices(use_cache, api_key=api_key)
+
+
+REFERENCE_TABLES = {
+    "symbols": ReferenceTable(_load_symbols, SYMBOL_CATEGORIES),
+    "indices": ReferenceTable(_load_indices, INDEX_CATEGORIES),
+}
+
+
+class ReferenceRegistry:
+    """
+    In-memory reference tables, reloaded when their backing table changes.
+
+    Parameters:
+        tables (Dict[str, ReferenceTable]): Reference tables by dataset name, the name
+            their writes are recorded under in cache_meta.
+        db_path (str): SQLite database holding the tables and cache_meta.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, ReferenceTable]] = None, db_path: Optional[str] = None):
+        self.tables = REFERENCE_TABLES if tables is None else tables
+        self.db_path = db_path
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+
+    def _mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.db_path or get_cache_path(project_name)).st_mtime
+        except OSError:
+            return None
+
+    def _version(self, name: str) -> Optional[Tuple]:
+        meta = get_meta(name, db_path=self.db_path)
+        return None if meta is None else (meta.last_sync, meta.row_count)
+
+    def _entry(self, name: str, use_cache: bool, api_key: str) -> _Entry:
+        entry = self._entries.get(name)
+        if use_cache and entry is not None:
+            mtime = self._mtime()
+            if mtime == entry.mtime:
+                return entry
+            # Any table write moves the mtime, only a new sync of this dataset reloads it
+            entry.mtime = mtime
+            if self._version(name) == entry.version:
+                return entry
+
+        table = self.tables[name]
+        data = compact(table.loader(use_cache, api_key=api_key), table.categories)
+        entry = _Entry(data, self._version(name), self._mtime())
+        self._entries[name] = entry
+        logger.info(f"Loaded reference table {name} ({len(data)} rows) into memory.")
+        return entry
+
+    def get(self, name: str, use_cache: bool = True, api_key: str = "") -> pd.DataFrame:
+        """
+        Return a reference table.
+
+        Parameters:
+            name (str): Table name, e.g. "symbols" or "indices".
+            use_cache (bool): Whether to use the cached table. False downloads it again.
+            api_key (str): Tushare API key.
+        """
+        with self._lock:
+            return self._entry(name, use_cache, api_key).data
+
+    def derived(self, name: str, key: str, build: Callable[[pd.DataFrame], Any],
+                use_cache: bool = True, api_key: str = "") -> Any:
+        """
+        Return build(table), memoized until the table is reloaded.
+
+        Parameters:
+            name (str): Reference table the view is built from.
+            key (str): Name of the view.
+            build (Callable): Function of the table frame.
+        """
+        with self._lock:
+            entry = self._entry(name, use_cache, api_key)
+            if key not in entry.derived:
+                entry.derived[key] = build(entry.data)
+            return entry.derived[key]
+
+    def lookup(self, name: str, ts_code: str, api_key: str = "") -> Optional[Dict]:
+        """Return the row of ts_code in a reference table as a dict, or None."""
+        by_code = self.derived(
+            name, "by_code",
+            lambda df: dict(zip(df["ts_code"], df.to_dict(orient="records"))),
+            api_key=api_key,
+        )
+        row = by_code.get(ts_code)
+        if row is None and name == "symbols":
+            row = by_code.get(normalize_symbol(ts_code)[1])
+        return row
+
+    def clear(self) -> None:
+        """Drop every table, the next access reloads it."""
+        with self._lock:
+            self._entries.clear()
+
+
+def get_reference_registry() -> ReferenceRegistry:
+    """Return the process-wide reference registry."""
+    global _registry  # pylint: disable=global-statement
+    with _registry_lock:
+        if _registry is None:
+            _registry = ReferenceRegistry()
+    return _registry
@@ -0,0 +1,134 @@
+"""
+Weekly and monthly bars computed from the cached daily bars.
+
+Buckets follow calendar weeks (Monday to Sunday) and calendar months. Each bar is
+labelled with the last session of its bucket, so holiday weeks end on the last day
+the exchange actually traded, the same way Tushare's weekly/monthly endpoints do.
+"""
+import logging
+from typing import Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+from mysharelib.tools import setup_logger
+from openbb_tushare.utils.bar_store import CHUNK_ROWS, BarStore
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+PERIOD_FREQ = {
+    "weekly": "W-SUN",
+    "monthly": "M",
+}
+
+# (ts_code, period, adjust) -> (store water marks and row count the bars were built from, resampled bars)
+_memo: Dict[Tuple[str, str], Tuple[tuple, pd.DataFrame]] = {}
+
+
+def resample_bars(daily: pd.DataFrame, period: str, pre_close: Optional[float] = None) -> pd.DataFrame:
+    """
+    Aggregate daily bars into weekly or monthly bars.
+
+    Parameters:
+        daily (DataFrame): Daily bars sorted by date.
+        period (str): "weekly" or "monthly".
+        pre_close (float): Close before the first bar, used when daily has no pre_close column.
+
+    Returns:
+        DataFrame: One row per bucket with OHLC, summed volume/amount and the change
+        against the previous bucket's close.
+    """
+    if daily.empty:
+        return daily
+
+    dates = pd.to_datetime(daily["date"])
+    buckets = dates.dt.to_period(PERIOD_FREQ[period]).to_numpy()
+    grouped = daily.assign(date=dates).groupby(buckets, sort=True)
+    bars = grouped.agg(
+        date=("date", "last"),
+        open=("open", "first"),
+        high=("high", "max"),
+        low=("low", "min"),
+        close=("close", "last"),
+        volume=("volume", "sum"),
+        amount=("amount", "sum"),
+    )
+
+    if "pre_close" in daily.columns:
+        bars["pre_close"] = grouped["pre_close"].first()
+    else:
+        bars["pre_close"] = bars["close"].shift(1)
+        bars.iloc[0, bars.columns.get_loc("pre_close")] = pre_close
+    bars["change"] = bars["close"] - bars["pre_close"]
+    bars["change_percent"] = bars["change"] / bars["pre_close"] * 100
+    return bars.reset_index(drop=True)
+
+
+def load_daily(ts_code: str, store: BarStore, start: str, end: str, adjust: str = "") -> pd.DataFrame:
+    """Read daily bars between two 'YYYYMMDD' dates, adjusted when adjust is "qfq" or "hfq"."""
+    daily = store.read(ts_code, start, end)
+    if adjust:
+        from openbb_tushare.utils.ts_adj_factor import adjust_bars, get_adj_factors
+        daily = adjust_bars(daily, get_adj_factors(ts_code), adjust)
+    return daily
+
+
+def iter_daily(
+    ts_code: str,
+    store: BarStore,
+    start: str,
+    end: str,
+    adjust: str = "",
+    chunk_rows: int = CHUNK_ROWS,
+    by: str = "rows",
+) -> Iterator[pd.DataFrame]:
+    """Yield daily bars between two 'YYYYMMDD' dates in bounded chunks, adjusted like load_daily."""
+    if adjust:
+        from openbb_tushare.utils.ts_adj_factor import adjust_bars, get_adj_factors
+        factors = get_adj_factors(ts_code)
+
+    for chunk in store.iter_read(ts_code, start, end, chunk_rows=chunk_rows, by=by):
+        yield adjust_bars(chunk, factors, adjust) if adjust else chunk
+
+
+def get_resampled(ts_code: str, period: str, store: BarStore, marks: tuple, adjust: str = "") -> pd.DataFrame:
+    """
+    Return the full resampled history of a symbol from its daily bars.
+
+    The result is memoized per symbol, period and adjustment. When only the high-water
+    mark moved and every new row lies after the old one, just the trailing bucket is
+    recomputed from the daily bars.
+
+    Parameters:
+        ts_code (str): Symbol of the bar table.
+        period (str): "weekly" or "monthly".
+        store (BarStore): Bar store holding the daily bars.
+        marks (tuple): (low-water mark, high-water mark, row count, *version) of the
+            daily bars. Rows written inside the cached range (e.g. repaired gaps)
+            change the row count and force a full rebuild, like any other change.
+        adjust (str): "", "qfq" or "hfq".
+    """
+    lwm, hwm, rows = marks[:3]
+    key = (ts_code, period, adjust)
+    memo = _memo.get(key)
+    if memo is not None and memo[0] == marks:
+        return memo[1]
+
+    bars = None
+    stable = memo is not None and memo[0][:1] + memo[0][3:] == marks[:1] + marks[3:]
+    if stable and len(memo[1]) > 1:
+        previous = memo[1].iloc[:-1]
+        tail_start = pd.Period(memo[1]["date"].iloc[-1], PERIOD_FREQ[period]).start_time
+        daily = load_daily(ts_code, store, tail_start.strftime("%Y%m%d"), hwm, adjust)
+        # The rows added since the memo must all lie after its high-water mark
+        if memo[0][2] + int((daily["date"] > pd.Timestamp(memo[0][1])).sum()) == rows:
+            tail = resample_bars(daily, period, pre_close=previous["close"].iloc[-1])
+            bars = pd.concat([previous, tail], ignore_index=True)
+            logger.info(f"Recomputed trailing {period} bucket of {ts_code} from {tail_start.date()}.")
+    if bars is None:
+        daily = load_daily(ts_code, store, lwm, hwm, adjust)
+        bars = resample_bars(daily, period)
+        logger.info(f"Resampled {len(daily)} daily bars of {ts_code} into {len(bars)} {period} bars.")
+
+    _memo[key] = (marks, bars)
+    return bars
@@ -0,0 +1,292 @@
+"""
+Declarative mapping of the Tushare financial statements to the OpenBB fields.
+
+Each statement has one table from the A-share Tushare fields (income, balancesheet,
+cashflow) and one from the HK line items (hk_income, hk_balancesheet, hk_cashflow,
+which come in long format: one row per ind_name/ind_value) to the OpenBB field
+names. map_statement turns either into the output frame in one pass: HK rows are
+pivoted to one row per period, then a single rename/select keeps the mapped fields,
+end_date is parsed once and the fiscal period comes from a lookup array.
+"""
+from typing import Dict, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class StatementMapping(NamedTuple):
+    """Field names of one statement: A-share Tushare field and HK line item to OpenBB field."""
+
+    fields: Dict[str, str]
+    hk_items: Dict[str, str]
+
+
+INCOME_FIELDS = {
+    "total_revenue": "total_revenue",                       # 营业总收入
+    "revenue": "revenue",                                   # 营业收入
+    "int_income": "interest_income",                        # 利息收入
+    "comm_income": "fee_and_commission_income",             # 手续费及佣金收入
+    "total_cogs": "total_operating_cost",                   # 营业总成本
+    "oper_cost": "cost_of_revenue",                         # 营业成本
+    "int_exp": "interest_expense",                          # 利息支出
+    "comm_exp": "fee_and_commission_expense",               # 手续费及佣金支出
+    "biz_tax_surchg": "taxes_and_surcharges",               # 营业税金及附加
+    "sell_exp": "selling_and_marketing_expense",            # 销售费用
+    "admin_exp": "general_and_admin_expense",               # 管理费用
+    "rd_exp": "research_and_development_expense",           # 研发费用
+    "fin_exp": "financial_expense",                         # 财务费用
+    "assets_impair_loss": "asset_impairment_loss",          # 资产减值损失
+    "credit_impa_loss": "credit_impairment_loss",           # 信用减值损失
+    "fv_value_chg_gain": "fair_value_change_gain",          # 公允价值变动收益
+    "invest_income": "investment_income",                   # 投资净收益
+    "ass_invest_income": "equity_method_investment_income", # 对联营企业和合营企业的投资收益
+    "forex_gain": "foreign_exchange_gain",                  # 汇兑收益
+    "operate_profit": "operating_income",                   # 营业利润
+    "non_oper_income": "non_operating_income",              # 营业外收入
+    "non_oper_exp": "non_operating_expense",                # 营业外支出
+    "total_profit": "income_before_tax",                    # 利润总额
+    "income_tax": "income_tax_expense",                     # 所得税费用
+    "n_income": "net_income",                               # 净利润(含少数股东损益)
+    "continued_net_profit": "net_income_continuing_operations",          # 持续经营净利润
+    "n_income_attr_p": "net_income_attributable_to_common_shareholders", # 归属于母公司所有者的净利润
+    "minority_gain": "net_income_attributable_to_noncontrolling_interest", # 少数股东损益
+    "oth_compr_income": "other_comprehensive_income",       # 其他综合收益
+    "t_compr_income": "total_comprehensive_income",         # 综合收益总额
+    "compr_inc_attr_p": "comprehensive_income_attributable_to_parent",   # 归属于母公司的综合收益总额
+    "basic_eps": "basic_earnings_per_share",                # 基本每股收益
+    "diluted_eps": "diluted_earnings_per_share",            # 稀释每股收益
+    "ebit": "ebit",                                         # 息税前利润
+    "ebitda": "ebitda",                                     # 息税折旧摊销前利润
+}
+
+HK_INCOME_ITEMS = {
+    "营业额": "total_revenue",
+    "营运收入": "revenue",
+    "销售成本": "cost_of_revenue",
+    "毛利": "gross_profit",
+    "其他收益": "other_income",
+    "销售及分销费用": "selling_and_marketing_expense",
+    "行政开支": "general_and_admin_expense",
+    "经营溢利": "operating_income",
+    "融资成本": "interest_expense",
+    "应占联营公司溢利": "equity_method_investment_income",
+    "除税前溢利": "income_before_tax",
+    "税项": "income_tax_expense",
+    "除税后溢利": "net_income",
+    "少数股东损益": "net_income_attributable_to_noncontrolling_interest",
+    "股东应占溢利": "net_income_attributable_to_common_shareholders",
+    "每股基本盈利": "basic_earnings_per_share",
+    "每股摊薄盈利": "diluted_earnings_per_share",
+    "每股股息": "dividend_per_share",
+}
+
+BALANCE_FIELDS = {
+    "total_share": "total_shares",                          # 期末总股本
+    "money_cap": "cash_and_cash_equivalents",               # 货币资金
+    "trad_asset": "trading_financial_assets",               # 交易性金融资产
+    "notes_receiv": "notes_receivable",                     # 应收票据
+    "accounts_receiv": "accounts_receivable",               # 应收账款
+    "oth_receiv": "other_receivables",                      # 其他应收款
+    "prepayment": "prepaid_expenses",                       # 预付款项
+    "inventories": "inventory",                             # 存货
+    "oth_cur_assets": "other_current_assets",               # 其他流动资产
+    "total_cur_assets": "total_current_assets",             # 流动资产合计
+    "lt_eqt_invest": "long_term_equity_investment",         # 长期股权投资
+    "invest_real_estate": "investment_property",            # 投资性房地产
+    "fix_assets": "property_plant_equipment_net",           # 固定资产
+    "cip": "construction_in_progress",                      # 在建工程
+    "intan_assets": "intangible_assets",                    # 无形资产
+    "goodwill": "goodwill",                                 # 商誉
+    "lt_amor_exp": "long_term_prepaid_expenses",            # 长期待摊费用
+    "defer_tax_assets": "deferred_tax_assets",              # 递延所得税资产
+    "oth_nca": "other_non_current_assets",                  # 其他非流动资产
+    "total_nca": "total_non_current_assets",                # 非流动资产合计
+    "total_assets": "total_assets",                         # 资产总计
+    "st_borr": "short_term_debt",                           # 短期借款
+    "notes_payable": "notes_payable",                       # 应付票据
+    "acct_payable": "accounts_payable",                     # 应付账款
+    "adv_receipts": "advance_receipts",                     # 预收款项
+    "contract_liab": "contract_liabilities",                # 合同负债
+    "payroll_payable": "employee_wages_payable",            # 应付职工薪酬
+    "taxes_payable": "taxes_payable",                       # 应交税费
+    "oth_payable": "other_payables",                        # 其他应付款
+    "non_cur_liab_due_1y": "current_portion_long_term_debt", # 一年内到期的非流动负债
+    "oth_cur_liab": "other_current_liabilities",            # 其他流动负债
+    "total_cur_liab": "total_current_liabilities",          # 流动负债合计
+    "lt_borr": "long_term_debt",                            # 长期借款
+    "bond_payable": "bonds_payable",                        # 应付债券
+    "lt_payable": "long_term_payables",                     # 长期应付款
+    "defer_tax_liab": "deferred_tax_liabilities",           # 递延所得税负债
+    "oth_ncl": "other_non_current_liabilities",             # 其他非流动负债
+    "total_ncl": "total_non_current_liabilities",           # 非流动负债合计
+    "total_liab": "total_liabilities",                      # 负债合计
+    "cap_rese": "capital_reserve",                          # 资本公积金
+    "surplus_rese": "surplus_reserve",                      # 盈余公积金
+    "undistr_porfit": "retained_earnings",                  # 未分配利润
+    "treasury_share": "treasury_stock",                     # 库存股
+    "minority_int": "minority_interest",                    # 少数股东权益
+    "total_hldr_eqy_exc_min_int": "total_common_equity",    # 股东权益合计(不含少数股东权益)
+    "total_hldr_eqy_inc_min_int": "total_equity",           # 股东权益合计(含少数股东权益)
+    "total_liab_hldr_eqy": "total_liabilities_and_equity",  # 负债及股东权益总计
+}
+
+HK_BALANCE_ITEMS = {
+    "现金及等价物": "cash_and_cash_equivalents",
+    "应收帐款": "accounts_receivable",
+    "存货": "inventory",
+    "流动资产合计": "total_current_assets",
+    "物业厂房及设备": "property_plant_equipment_net",
+    "无形资产": "intangible_assets",
+    "非流动资产合计": "total_non_current_assets",
+    "总资产": "total_assets",
+    "短期贷款": "short_term_debt",
+    "应付帐款": "accounts_payable",
+    "流动负债合计": "total_current_liabilities",
+    "长期贷款": "long_term_debt",
+    "非流动负债合计": "total_non_current_liabilities",
+    "总负债": "total_liabilities",
+    "股本": "common_stock",
+    "保留溢利(累计亏损)": "retained_earnings",
+    "少数股东权益": "minority_interest",
+    "股东权益": "total_common_equity",
+    "总权益": "total_equity",
+    "总权益及总负债": "total_liabilities_and_equity",
+}
+
+CASH_FLOW_FIELDS = {
+    "net_profit": "net_income",                             # 净利润
+    "depr_fa_coga_dpba": "depreciation",                    # 固定资产折旧
+    "amort_intang_assets": "amortization_of_intangibles",   # 无形资产摊销
+    "c_fr_sale_sg": "cash_received_from_sales",             # 销售商品、提供劳务收到的现金
+    "c_paid_goods_s": "cash_paid_for_goods_and_services",   # 购买商品、接受劳务支付的现金
+    "c_paid_to_for_empl": "cash_paid_to_employees",         # 支付给职工以及为职工支付的现金
+    "c_paid_for_taxes": "taxes_paid",                       # 支付的各项税费
+    "n_cashflow_act": "net_cash_from_operating_activities", # 经营活动产生的现金流量净额
+    "c_disp_withdrwl_invest": "proceeds_from_sale_of_investments", # 收回投资收到的现金
+    "c_recp_return_invest": "investment_income_received",   # 取得投资收益收到的现金
+    "c_pay_acq_const_fiolta": "capital_expenditure",        # 购建固定资产、无形资产和其他长期资产支付的现金
+    "c_paid_invest": "purchase_of_investments",             # 投资支付的现金
+    "n_cashflow_inv_act": "net_cash_from_investing_activities", # 投资活动产生的现金流量净额
+    "c_recp_borrow": "proceeds_from_borrowings",            # 取得借款收到的现金
+    "c_prepay_amt_borr": "repayment_of_debt",               # 偿还债务支付的现金
+    "c_pay_dist_dpcp_int_exp": "dividends_and_interest_paid", # 分配股利、利润或偿付利息支付的现金
+    "n_cash_flows_fnc_act": "net_cash_from_financing_activities", # 筹资活动产生的现金流量净额
+    "eff_fx_flu_cash": "effect_of_exchange_rate_changes",   # 汇率变动对现金的影响
+    "n_incr_cash_cash_equ": "net_change_in_cash_and_equivalents", # 现金及现金等价物净增加额
+    "c_cash_equ_beg_period": "cash_at_beginning_of_period", # 期初现金及现金等价物余额
+    "c_cash_equ_end_period": "cash_at_end_of_period",       # 期末现金及现金等价物余额
+    "free_cashflow": "free_cash_flow",                      # 企业自由现金流量
+}
+
+HK_CASH_FLOW_ITEMS = {
+    "经营业务现金净额": "net_cash_from_operating_activities",
+    "购建固定资产": "capital_expenditure",
+    "投资业务现金净额": "net_cash_from_investing_activities",
+    "新增借款": "proceeds_from_borrowings",
+    "偿还借款": "repayment_of_debt",
+    "已付股息(融资)": "dividends_paid",
+    "融资业务现金净额": "net_cash_from_financing_activities",
+    "现金净额": "net_change_in_cash_and_equivalents",
+    "期初现金": "cash_at_beginning_of_period",
+    "期末现金": "cash_at_end_of_period",
+}
+
+STATEMENT_MAPPINGS = {
+    "income_statement": StatementMapping(INCOME_FIELDS, HK_INCOME_ITEMS),
+    "balance_sheet": StatementMapping(BALANCE_FIELDS, HK_BALANCE_ITEMS),
+    "cash_flow": StatementMapping(CASH_FLOW_FIELDS, HK_CASH_FLOW_ITEMS),
+}
+
+# Fiscal period by Tushare end_type (1-4), and for HK reports by the months from
+# the fiscal year end to end_date, e.g. 3 for a June report of a March year end
+FISCAL_PERIODS = np.array(["Unknown", "Q1", "Q2", "Q3", "FY"], dtype=object)
+FISCAL_PERIODS_BY_OFFSET = np.array(
+    ["FY", "Unknown", "Unknown", "Q1", "Unknown", "Unknown", "Q2",
+     "Unknown", "Unknown", "Q3", "Unknown", "Unknown"],
+    dtype=object,
+)
+
+
+def is_long_format(data: pd.DataFrame) -> bool:
+    """Return whether a statement frame has the HK one-row-per-line-item layout."""
+    return "ind_name" in data.columns and "ind_value" in data.columns
+
+
+def pivot_hk(statement: str, data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pivot HK line items (ts_code, end_date, ind_name, ind_value) to one row per period.
+
+    Items are renamed to the OpenBB fields on the way, unmapped items are dropped.
+    Rows are sorted latest period first.
+    """
+    items = STATEMENT_MAPPINGS[statement].hk_items
+    data = data.assign(
+        field=data["ind_name"].map(items),
+        value=pd.to_numeric(data["ind_value"], errors="coerce"),
+        end_date=data["end_date"].astype(str).str.replace("-", "", regex=False).str[:8],
+    ).dropna(subset=["field"])
+    wide = data.pivot_table(index=["ts_code", "end_date"], columns="field", values="value", aggfunc="last")
+    wide.columns.name = None
+    return wide.reset_index().sort_values("end_date", ascending=False, ignore_index=True)
+
+
+def infer_fiscal_year_end(data: pd.DataFrame) -> int:
+    """
+    Return the month an HK issuer's fiscal year ends in, from its pivoted income statements.
+
+    Income statement figures run from the start of the fiscal year, so the annual
+    reports are the largest: the year end is the end_date month with the highest
+    median revenue (or net income). Defaults to December when the rows tell nothing.
+    """
+    if data is None or data.empty or "end_date" not in data.columns:
+        return 12
+    month = pd.to_numeric(data["end_date"].astype(str).str[4:6], errors="coerce")
+    months = month.dropna().unique()
+    if len(months) == 1:
+        return int(months[0])
+    for field in ("total_revenue", "revenue", "net_income"):
+        if field in data.columns:
+            sizes = pd.to_numeric(data[field], errors="coerce").abs().groupby(month).median().dropna()
+            if not sizes.empty:
+                return int(sizes.idxmax())
+    return 12
+
+
+def map_statement(statement: str, data: pd.DataFrame, fiscal_year_end: int = 12) -> pd.DataFrame:
+    """
+    Map A-share or HK statement rows to the OpenBB fields.
+
+    HK line items carry no report type, so their fiscal period is derived from the
+    month of end_date relative to the fiscal year end: a report ending in that month
+    is the annual one. For issuers whose year does not end in December, e.g. in
+    March, fiscal_year is the year the fiscal year ends in. The statement fetchers
+    look the month up with fundamentals_store.get_fiscal_year_end.
+
+    Parameters:
+        statement (str): "income_statement", "balance_sheet" or "cash_flow".
+        data (DataFrame): Rows as returned by the Tushare endpoint or the cache.
+        fiscal_year_end (int): Month (1-12) the fiscal year of an HK issuer ends in.
+
+    Returns:
+        DataFrame: The mapped fields followed by fiscal_year, period_ending and fiscal_period.
+    """
+    if is_long_format(data):
+        data = pivot_hk(statement, data)
+    fields = STATEMENT_MAPPINGS[statement].fields
+    targets = list(dict.fromkeys(list(fields.values()) + list(STATEMENT_MAPPINGS[statement].hk_items.values())))
+    renamed = data.rename(columns=fields)
+    result = renamed[[col for col in targets if col in renamed.columns]].copy()
+
+    period_ending = pd.to_datetime(data["end_date"].astype(str), format="%Y%m%d", errors="coerce")
+    result["fiscal_year"] = period_ending.dt.year
+    result["period_ending"] = period_ending
+    if "end_type" in data.columns:
+        end_type = pd.to_numeric(data["end_type"], errors="coerce")
+        end_type = end_type.where(end_type.isin([1, 2, 3, 4]), 0).astype(int)
+        result["fiscal_period"] = FISCAL_PERIODS[end_type.to_numpy()]
+    else:
+        month = period_ending.dt.month
+        offset = ((month - fiscal_year_end) % 12).fillna(1).astype(int)
+        result["fiscal_period"] = FISCAL_PERIODS_BY_OFFSET[offset.to_numpy()]
+        result["fiscal_year"] = period_ending.dt.year + (month > fiscal_year_end)
+    return result
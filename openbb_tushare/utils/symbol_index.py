@@ -0,0 +1,165 @@
+"""
+In-memory search index over the symbol master.
+
+The symbols table is loaded once per process into a SymbolIndex holding, for each
+searchable field (ts_code, symbol, name, cnspell pinyin initials, enname), a sorted
+array for prefix lookups and an n-gram posting index for substring lookups. A search
+touches only the matching rows and returns the best `limit` of them.
+
+The index is memoized in the reference registry next to the symbols table, so it is
+rebuilt only when the symbols table is reloaded after a new sync.
+"""
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from mysharelib.tools import setup_logger
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+# Searchable fields, in ranking order: a hit on an earlier field ranks first
+CODE_FIELDS = ("ts_code", "symbol")
+TEXT_FIELDS = ("name", "cnspell", "enname")
+NGRAM_SIZES = (2, 3)
+
+# Rank of a hit, lower is better
+EXACT_CODE, EXACT_TEXT, PREFIX_CODE, PREFIX_TEXT, SUBSTRING = range(5)
+
+
+def _normalize(values: pd.Series) -> np.ndarray:
+    return values.fillna("").astype(str).str.strip().str.lower().to_numpy(dtype=str)
+
+
+class SymbolIndex:
+    """
+    Prefix and n-gram indexes over the rows of the symbol master.
+
+    Parameters:
+        data (DataFrame): Rows of the symbols table.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data.reset_index(drop=True)
+        self.fields = [f for f in CODE_FIELDS + TEXT_FIELDS if f in self.data.columns]
+        self._values: Dict[str, np.ndarray] = {}
+        # field -> (sorted values, row of each sorted value)
+        self._prefix: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # n-gram -> rows containing it in any field
+        self._grams: Dict[str, np.ndarray] = {}
+
+        grams: Dict[str, set] = {}
+        for field in self.fields:
+            values = _normalize(self.data[field])
+            order = np.argsort(values, kind="stable")
+            self._values[field] = values
+            self._prefix[field] = (values[order], order)
+            for row, value in enumerate(values):
+                for n in NGRAM_SIZES:
+                    for i in range(len(value) - n + 1):
+                        grams.setdefault(value[i:i + n], set()).add(row)
+        self._grams = {gram: np.fromiter(rows, dtype=np.int64) for gram, rows in grams.items()}
+        # Among equal text hits shorter names rank first, e.g. the stock before its B share
+        self._name_len = self.data["name"].fillna("").str.len().to_numpy() if "name" in self.data else np.zeros(len(self.data))
+        logger.info(f"Built the symbol search index over {len(self.data)} symbols.")
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _prefix_rows(self, field: str, query: str) -> np.ndarray:
+        values, order = self._prefix[field]
+        lo = np.searchsorted(values, query, side="left")
+        hi = np.searchsorted(values, query + "\uffff", side="left")
+        return order[lo:hi]
+
+    def _substring_rows(self, query: str) -> np.ndarray:
+        n = max((n for n in NGRAM_SIZES if n <= len(query)), default=None)
+        if n is None:
+            return np.empty(0, dtype=np.int64)
+        candidates = None
+        for i in range(len(query) - n + 1):
+            rows = self._grams.get(query[i:i + n])
+            if rows is None:
+                return np.empty(0, dtype=np.int64)
+            candidates = rows if candidates is None else np.intersect1d(candidates, rows, assume_unique=True)
+            if not len(candidates):
+                break
+        return candidates
+
+    def search(self, query: str, limit: Optional[int] = None, is_symbol: bool = False) -> pd.DataFrame:
+        """
+        Return the rows matching query, best matches first.
+
+        Exact code matches rank before exact name matches, then code prefixes, name,
+        pinyin and English name prefixes, then substrings of any field.
+
+        Parameters:
+            query (str): Search text, case-insensitive. Empty returns the first rows.
+            limit (int): Maximum number of rows returned. None for all matches.
+            is_symbol (bool): Match the ts_code and symbol fields only.
+        """
+        query = query.strip().lower()
+        if not query:
+            return self.data.iloc[:limit] if limit is not None else self.data
+        fields = [f for f in self.fields if not is_symbol or f in CODE_FIELDS]
+
+        best: Dict[int, int] = {}
+
+        def hit(rows, rank):
+            for row in rows.tolist():
+                if best.get(row, SUBSTRING + 1) > rank:
+                    best[row] = rank
+
+        for field in fields:
+            code = field in CODE_FIELDS
+            prefix = self._prefix_rows(field, query)
+            exact = prefix[self._values[field][prefix] == query]
+            hit(exact, EXACT_CODE if code else EXACT_TEXT)
+            hit(prefix, PREFIX_CODE if code else PREFIX_TEXT)
+
+        # Substring hits rank last, skip them when the better hits already fill the limit
+        candidates = self._substring_rows(query) if limit is None or len(best) < limit else []
+        if len(candidates):
+            matches = np.zeros(len(candidates), dtype=bool)
+            for field in fields:
+                matches |= np.char.find(self._values[field][candidates], query) >= 0
+            hit(candidates[matches], SUBSTRING)
+
+        code_ranks = (EXACT_CODE, PREFIX_CODE)
+        rows = sorted(best, key=lambda row: (best[row], 0 if best[row] in code_ranks else self._name_len[row], row))
+        if limit is not None:
+            rows = rows[:limit]
+        return self.data.iloc[rows]
+
+
+def get_symbol_index(use_cache: bool = True, api_key: str = "") -> SymbolIndex:
+    """
+    Return the process-wide search index of the symbol master.
+
+    The index is a view of the symbols reference table, built on first use and
+    rebuilt only when the table is reloaded. With use_cache=False the symbol master
+    is downloaded again.
+    """
+    from openbb_tushare.utils.reference_data import get_reference_registry
+
+    return get_reference_registry().derived("symbols", "search_index", SymbolIndex, use_cache=use_cache, api_key=api_key)
+
+
+def search_symbols(query: str = "", limit: Optional[int] = None, is_symbol: bool = False,
+                   use_cache: bool = True, api_key: str = "") -> pd.DataFrame:
+    """
+    Search the symbol master by ts_code, symbol, name, pinyin initials or English name.
+
+    Parameters:
+        query (str): Search text. Empty returns the first `limit` symbols.
+        limit (int): Maximum number of rows returned.
+        is_symbol (bool): Match the ts_code and symbol fields only.
+        use_cache (bool): Whether to use the cached symbol master.
+        api_key (str): Tushare API key.
+
+    Returns:
+        DataFrame: Matching rows of the symbols table, best matches first.
+    """
+    return get_symbol_index(use_cache, api_key=api_key).search(query, limit=limit, is_symbol=is_symbol)
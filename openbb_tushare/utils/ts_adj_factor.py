@@ -0,0 +1,162 @@
+"""
+Cached adjustment factors and local forward/backward price adjustment.
+
+Tushare's adj_factor is a cumulative backward factor, so
+    hfq price = raw price * adj_factor
+    qfq price = raw price * adj_factor / latest adj_factor
+Only the factor series is downloaded, the adjusted prices are derived on demand
+from the unadjusted bar cache.
+"""
+import logging
+import sqlite3
+from datetime import date as dateType
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import tushare as ts
+from mysharelib.table_cache import TableCache
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare.utils.helpers import get_api_key
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+ADJ_FACTOR_SCHEMA = {
+    "date": "TEXT PRIMARY KEY",     # Trade date (YYYYMMDD)
+    "adj_factor": "REAL",           # Cumulative adjustment factor
+}
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "pre_close", "change", "vwap"]
+
+# ts_code -> ((high-water mark, row count, last factor) of the factor table, factor series indexed by date)
+_factors: Dict[str, Tuple[tuple, pd.Series]] = {}
+
+
+def get_adj_factor_cache(ts_code: str) -> TableCache:
+    """Return the adj_factor table of a symbol, e.g. SH600000_adj."""
+    symbol_b, _, market = normalize_symbol(ts_code)
+    return TableCache(ADJ_FACTOR_SCHEMA, project=project_name, table_name=f"{market}{symbol_b}_adj", primary_key="date")
+
+
+def download_adj_factor(ts_code: str, start_date: str = "", end_date: str = "", api_key: str = "") -> pd.DataFrame:
+    """Download the adjustment factors of one symbol between two 'YYYYMMDD' dates."""
+    tushare_api_key = get_api_key(api_key)
+    pro = ts.pro_api(tushare_api_key)
+    _, _, market = normalize_symbol(ts_code)
+    if market == "HK":
+        data = pro.hk_adjfactor(ts_code=ts_code, start_date=start_date, end_date=end_date)
+        data = data.rename(columns={"cum_adjfactor": "adj_factor"})
+    else:
+        data = pro.adj_factor(ts_code=ts_code, start_date=start_date, end_date=end_date)
+    logger.info(f"Downloaded adj_factor {ts_code} {start_date} - {end_date}: {len(data)}.")
+    data = data.rename(columns={"trade_date": "date"})
+    return data[["date", "adj_factor"]].sort_values("date")
+
+
+def sync_adj_factor(ts_code: str, end_date: dateType, api_key: str = "") -> bool:
+    """
+    Bring the adj_factor table of a symbol up to end_date.
+
+    The download starts at the table's high-water mark so the last known factor can be
+    compared. If Tushare restated it, the whole factor series is reloaded; the raw bar
+    tables are never touched.
+
+    Returns:
+        bool: True if a new corporate action (a factor change) was found.
+    """
+    cache = get_adj_factor_cache(ts_code)
+    end = end_date.strftime("%Y%m%d")
+    with sqlite3.connect(cache.db_path) as conn:
+        row = conn.execute(f"SELECT date, adj_factor FROM {cache.table_name} ORDER BY date DESC LIMIT 1").fetchone()
+
+    if row is None:
+        cache.write_dataframe(download_adj_factor(ts_code, end_date=end, api_key=api_key))
+        _factors.pop(ts_code, None)
+        return True
+
+    hwm, last_factor = row
+    if hwm >= end:
+        return False
+
+    data = download_adj_factor(ts_code, start_date=hwm, end_date=end, api_key=api_key)
+    overlap = data[data["date"] == hwm]
+    if not overlap.empty and not np.isclose(overlap["adj_factor"].iloc[0], last_factor):
+        logger.warning(f"adj_factor of {ts_code} on {hwm} was restated, reloading the factor series.")
+        cache.write_dataframe(download_adj_factor(ts_code, end_date=end, api_key=api_key))
+        _factors.pop(ts_code, None)
+        return True
+
+    data = data[data["date"] > hwm]
+    if data.empty:
+        return False
+    with sqlite3.connect(cache.db_path) as conn:
+        data.to_sql(cache.table_name, conn, if_exists="append", index=False)
+
+    changed = not np.allclose(data["adj_factor"].to_numpy(), last_factor)
+    if changed:
+        logger.info(f"New corporate action for {ts_code}, adjusted prices will be recomputed.")
+    return changed
+
+
+def get_adj_factors(ts_code: str) -> pd.Series:
+    """
+    Return the cached factor series of a symbol indexed by datetime, memoized per table version.
+
+    The version is the high-water mark, the row count and the last factor, so a series
+    reloaded by another process after a restatement is read again.
+    """
+    cache = get_adj_factor_cache(ts_code)
+    with sqlite3.connect(cache.db_path) as conn:
+        version = conn.execute(
+            f"SELECT date, (SELECT COUNT(*) FROM {cache.table_name}), adj_factor "
+            f"FROM {cache.table_name} ORDER BY date DESC LIMIT 1"
+        ).fetchone()
+
+    memo = _factors.get(ts_code)
+    if memo is not None and memo[0] == version:
+        return memo[1]
+
+    data = cache.read_dataframe().sort_values("date")
+    factors = pd.Series(
+        data["adj_factor"].to_numpy(dtype=float),
+        index=pd.to_datetime(data["date"], format="%Y%m%d"),
+    )
+    _factors[ts_code] = (version, factors)
+    return factors
+
+
+def adjust_bars(bars: pd.DataFrame, factors: pd.Series, adjust: str) -> pd.DataFrame:
+    """
+    Apply qfq/hfq adjustment to unadjusted bars.
+
+    Parameters:
+        bars (DataFrame): Unadjusted bars with a datetime 'date' column.
+        factors (Series): Cumulative adj_factor series indexed by datetime.
+        adjust (str): "qfq" for forward adjustment, "hfq" for backward adjustment.
+    """
+    if not adjust or bars.empty or factors.empty:
+        return bars
+
+    scale = factors.reindex(pd.to_datetime(bars["date"]), method="ffill").to_numpy()
+    scale = np.where(np.isnan(scale), factors.iloc[0], scale)
+    if adjust == "qfq":
+        scale = scale / factors.iloc[-1]
+
+    bars = bars.copy()
+    columns = [col for col in PRICE_COLUMNS if col in bars.columns]
+    bars[columns] = bars[columns].to_numpy(dtype=float) * scale[:, None]
+    return bars
+
+
+def get_factor_version(ts_code: str) -> tuple:
+    """
+    Return a key that changes whenever a corporate action changes the adjusted history of ts_code.
+
+    A restatement may rewrite past factors only, so the key covers the whole series.
+    """
+    factors = get_adj_factors(ts_code)
+    if factors.empty:
+        return (None,)
+    return (factors.iloc[-1], len(factors), float(factors.sum()))
@@ -1,9 +1,13 @@
 import logging
+import sqlite3
+from typing import Iterable, Optional, Union
 
 import pandas as pd
 import tushare as ts
+from mysharelib import get_cache_path
 from mysharelib.table_cache import TableCache
 from mysharelib.tools import setup_logger
+from openbb_tushare.utils.cache_meta import get_meta, record_dataframe
 from openbb_tushare.utils.helpers import get_api_key
 from openbb_tushare import project_name
 
@@ -27,6 +31,9 @@ TABLE_SCHEMA = {
     "currency": "TEXT"                 # Currency type (货币)
 }
 
+# Columns the catalog can be filtered on, each with a secondary index
+INDEX_FILTERS = ("market", "publisher", "category")
+
 def get_available_indices(use_cache: bool = True, api_key : str = "") -> pd.DataFrame:
     tushare_api_key = get_api_key(api_key)
     cache = TableCache(TABLE_SCHEMA, project=project_name, table_name="indices", primary_key="ts_code")
@@ -41,4 +48,62 @@ def get_available_indices(use_cache: bool = True, api_key : str = "") -> pd.Data
     data = pro.index_basic()
     data["currency"] = "CNY"
     cache.write_dataframe(data)
-    return data
\ No newline at end of file
+    record_dataframe("indices", data, date_column="list_date")
+    return data
+
+
+def query_available_indices(
+        market: Optional[Union[str, Iterable[str]]] = None,
+        publisher: Optional[Union[str, Iterable[str]]] = None,
+        category: Optional[Union[str, Iterable[str]]] = None,
+        name: Optional[str] = None,
+        use_cache: bool = True,
+        api_key : str = "",
+        db_path: Optional[str] = None
+    ) -> pd.DataFrame:
+    """
+    Return the indices of the catalog matching the filters, as one indexed query on the cache table.
+
+    Only the matching rows are read. The catalog is downloaded first when it was
+    never synced, or when use_cache is False.
+
+    Parameters:
+        market (str | Iterable[str]): Markets, e.g. "SSE" or "CSI,SW". Comma-separated values match any.
+        publisher (str | Iterable[str]): Publishers, e.g. "中证公司".
+        category (str | Iterable[str]): Categories, e.g. "规模指数".
+        name (str): Text the short or full name contains.
+        use_cache (bool): Whether to use the cached catalog.
+        api_key (str): Tushare API key.
+        db_path (str): SQLite database of the cache.
+
+    Returns:
+        DataFrame: Matching indices, ordered by ts_code.
+    """
+    db_path = db_path or get_cache_path(project_name)
+    if not use_cache or get_meta("indices", db_path=db_path) is None:
+        data = get_available_indices(use_cache, api_key=api_key)
+        if get_meta("indices", db_path=db_path) is None:
+            # Catalog cached before the metadata existed
+            record_dataframe("indices", data, date_column="list_date", db_path=db_path)
+
+    clauses, params = [], []
+    for column, values in zip(INDEX_FILTERS, (market, publisher, category)):
+        if values is None:
+            continue
+        if isinstance(values, str):
+            values = values.split(",")
+        values = [v.strip().upper() if column == "market" else v.strip() for v in values if v.strip()]
+        if values:
+            clauses.append(f"{column} IN ({', '.join(['?'] * len(values))})")
+            params += values
+    if name:
+        clauses.append("(name LIKE ? OR fullname LIKE ?)")
+        params += [f"%{name}%"] * 2
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    with sqlite3.connect(db_path) as conn:
+        for column in INDEX_FILTERS:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_indices_{column} ON indices ({column})")
+        data = pd.read_sql_query(f"SELECT * FROM indices{where} ORDER BY ts_code", conn, params=params)
+    logger.info(f"Found {len(data)} indices matching the filters.")
+    return data
@@ -1,6 +1,7 @@
 import logging
 import pandas as pd
 import tushare as ts
+from datetime import date as dateType
 from typing import Optional, Literal
 from mysharelib.tools import setup_logger
 from openbb_tushare.utils.helpers import get_api_key
@@ -16,23 +17,25 @@ def get_cash_flow(
         period: Literal["annual", "quarter"] = "annual",
         limit: Optional[int] = 5,
         use_cache: bool = True,
-        api_key : Optional[str] = ""
+        api_key : Optional[str] = "",
+        as_of: Optional[dateType] = None,
     ) -> pd.DataFrame:
-    from mysharelib.blob_cache import BlobCache
-    cache = BlobCache(table_name="cash_flow", project=project_name)
-    data = cache.load_cached_data(symbol, "quarter", use_cache, get_tushare_data, api_key=api_key)
+    from openbb_tushare.utils.fundamentals_store import get_fiscal_year_end, load_statement
+
+    data = load_statement("cash_flow", symbol, use_cache, get_tushare_data, api_key=api_key, as_of=as_of)
     if data is None:
         return pd.DataFrame()
     else:
+        fiscal_year_end = get_fiscal_year_end("cash_flow", symbol, data, use_cache=use_cache, api_key=api_key)
         if period == "annual":
-            # Filter rows where end_date ends with "1231"
-            data = data[data['end_date'].astype(str).str.endswith('1231')]
+            # Keep the reports ending in the fiscal year end month, e.g. "1231"
+            data = data[data['end_date'].astype(str).str[4:6] == f"{fiscal_year_end:02d}"]
 
         # Apply limit if specified
         if limit is not None:
             data = data.head(limit)
         
-        return processing_data(data)
+        return processing_data(data, fiscal_year_end=fiscal_year_end)
 def get_tushare_data(
         symbol: str,
         period: str = "annual",
@@ -45,20 +48,9 @@ def get_tushare_data(
         cash_flow_df = pro.hk_cashflow(ts_code=symbol)
     else:
         cash_flow_df = pro.cashflow(ts_code=symbol)
-        cash_flow_df = cash_flow_df.drop_duplicates(subset='end_date', keep='first')
     
     return cash_flow_df
 
-def processing_data(cash_flow_df: pd.DataFrame) -> pd.DataFrame:
-    from openbb_tushare.utils.helpers import get_fiscal_period
-    # logger.info("Processing cash flow data")
-    selected_columns = cash_flow_df[['n_cashflow_act', 'n_cashflow_inv_act', 'n_cash_flows_fnc_act']]
-    selected_columns = selected_columns.rename(columns={'n_cashflow_act':'net_cash_from_operating_activities', 
-                                                        'n_cashflow_inv_act':'net_cash_from_investing_activities',
-                                                        'n_cash_flows_fnc_act':'net_cash_from_financing_activities'})
-
-    # Extract year from end_date and create fiscal_year column
-    selected_columns.loc[:, 'fiscal_year'] = pd.to_datetime(cash_flow_df['end_date']).dt.year
-    selected_columns.loc[:, 'period_ending'] = pd.to_datetime(cash_flow_df['end_date'])
-    selected_columns.loc[:, 'fiscal_period'] = cash_flow_df['end_type'].apply(get_fiscal_period)
-    return selected_columns
\ No newline at end of file
+def processing_data(cash_flow_df: pd.DataFrame, fiscal_year_end: int = 12) -> pd.DataFrame:
+    from openbb_tushare.utils.statement_mapping import map_statement
+    return map_statement("cash_flow", cash_flow_df, fiscal_year_end=fiscal_year_end)
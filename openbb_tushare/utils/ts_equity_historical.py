@@ -4,30 +4,26 @@ import tushare as ts
 from datetime import (
     date as dateType,
     datetime,
+    timedelta,
 )
-from typing import Optional, Union
+from typing import Iterable, Iterator, Optional, Union
 from mysharelib.tools import setup_logger
 from openbb_tushare.utils.helpers import get_api_key
 from mysharelib.tools import normalize_symbol
-from mysharelib.table_cache import TableCache
+from openbb_tushare.utils.bar_store import CHUNK_ROWS, BarStore, get_bar_store
+from openbb_tushare.utils.resample import iter_daily, load_daily, resample_bars
 from openbb_tushare import project_name
 
 setup_logger(project_name)
 
 logger = logging.getLogger(__name__)
 
-EQUITY_HISTORY_SCHEMA = {
-    "date": "TEXT PRIMARY KEY",
-    "open": "REAL",
-    "high": "REAL",
-    "low": "REAL",
-    "close": "REAL",
-    "volume": "REAL",
-    "vwap": "REAL",
-    "change": "REAL",
-    "change_percent": "REAL",
-    "amount": "REAL"
-}
+BAR_COLUMNS = {'trade_date':'date', 'vol':'volume', "pct_chg":"change_percent"}
+
+# Cross-sectional daily endpoints, one call returns every symbol of a session
+INGEST_ENDPOINTS = {"CN": "daily", "HK": "hk_daily"}
+INGEST_CALLS_PER_MINUTE = 200
+INGEST_BATCH_SESSIONS = 20
 
 def get_from_cache(
         ts_code: str,
@@ -36,7 +32,8 @@ def get_from_cache(
         api_key : str = "",
         period: str = "daily",
         use_cache: bool = True,
-        adjust: str = ""
+        adjust: str = "",
+        store: Optional[BarStore] = None
     ) -> pd.DataFrame:
     """
     Retrieves historical equity data from a cache or downloads it from a remote source.
@@ -46,7 +43,9 @@ def get_from_cache(
         start_date (str): Start date for fetching data in 'YYYYMMDD' format.
         end_date (str): End date for fetching data in 'YYYYMMDD' format.
         period (str): Data frequency, e.g., "daily", "weekly", "monthly".
-        adjust (str): Adjustment type, e.g., "qfq" for forward split, "hfq" for backward split.
+        adjust (str): Adjustment type, "qfq" for forward adjusted or "hfq" for backward adjusted
+            prices, computed from the cached adj_factor series. Empty for unadjusted prices.
+        store (BarStore): Bar storage backend, defaults to the one selected by TUSHARE_BAR_STORE.
 
     Returns:
         DataFrame: DataFrame containing historical equity data.
@@ -54,72 +53,398 @@ def get_from_cache(
     from mysharelib.tools import get_valid_date
 
     # Retrieve data from cache first
-    symbol_b, symbol_f, market = normalize_symbol(ts_code)
-    cache = TableCache(EQUITY_HISTORY_SCHEMA, project=project_name, table_name=f"{market}{symbol_b}", primary_key="date")
+    if store is None:
+        store = get_bar_store()
     
     start_dt = get_valid_date(start_date)
-    end_dt = get_valid_date(end_date)
+    end_dt = min(get_valid_date(end_date), datetime.now().date())
 
     start = start_dt.strftime("%Y%m%d")
     end = end_dt.strftime("%Y%m%d")
     if use_cache:
-        check_cache(symbol=ts_code, cache=cache, api_key=api_key, period=period)
-        data_from_cache = cache.fetch_date_range(start, end)
+        check_cache(symbol=ts_code, store=store, api_key=api_key, period=period)
+        if adjust:
+            ensure_adj_factors(ts_code, store, api_key=api_key)
+        if period != "daily":
+            return get_period_range(ts_code, store, period, start, end, adjust=adjust)
+        data_from_cache = load_daily(ts_code, store, start, end, adjust=adjust)
         if not data_from_cache.empty:
             logger.info(f"Getting equity {ts_code} historical data from cache...")
             return data_from_cache
+        if not has_sessions(ts_code, start_dt, end_dt, api_key=api_key):
+            return data_from_cache
 
-    # If not in cache, download data
-    # Download data using AKShare
-    data_util_today_df = get_one(ts_code, period=period,api_key=api_key, start_date=start_dt, end_date=end_dt)
-    cache.write_dataframe(data_util_today_df)
-    
-    return cache.fetch_date_range(start, end)
+    # Not in cache, download only the requested range and merge it into the table
+    data_df = get_one(ts_code, period=period, api_key=api_key, start_date=start_dt, end_date=end_dt)
+    store.write(ts_code, data_df)
+    if adjust:
+        ensure_adj_factors(ts_code, store, api_key=api_key)
+
+    data_df = load_daily(ts_code, store, start, end, adjust=adjust)
+    if period != "daily":
+        return resample_bars(data_df, period)
+    return data_df
+
+def iter_from_cache(
+        ts_code: str,
+        start_date: Union[dateType, str],
+        end_date: Union[dateType, str],
+        api_key : str = "",
+        period: str = "daily",
+        use_cache: bool = True,
+        adjust: str = "",
+        chunk_rows: int = CHUNK_ROWS,
+        chunk_by: str = "rows",
+        store: Optional[BarStore] = None
+    ) -> Iterator[pd.DataFrame]:
+    """
+    Yields historical equity data of one or more symbols in bounded chunks.
+
+    Daily bars are streamed from the bar store after the cache is synced, so only one
+    chunk is held in memory at a time however long the range is. Weekly and monthly
+    bars, and uncached ranges, go through get_from_cache and are split afterwards.
+
+    Parameters:
+        ts_code (str): Stock symbol, or several comma-separated symbols.
+        start_date (str): Start date for fetching data in 'YYYYMMDD' format.
+        end_date (str): End date for fetching data in 'YYYYMMDD' format.
+        period (str): Data frequency, e.g., "daily", "weekly", "monthly".
+        adjust (str): "", "qfq" or "hfq".
+        chunk_rows (int): Maximum number of rows per chunk when chunk_by is "rows".
+        chunk_by (str): "rows" or "month".
+        store (BarStore): Bar storage backend.
+
+    Returns:
+        Iterator[DataFrame]: Chunks in symbol then date order. With several symbols,
+        every chunk has a symbol column.
+    """
+    from mysharelib.tools import get_valid_date
+
+    if store is None:
+        store = get_bar_store()
+
+    symbols = [symbol.strip() for symbol in ts_code.split(",") if symbol.strip()]
+    start_dt = get_valid_date(start_date)
+    end_dt = min(get_valid_date(end_date), datetime.now().date())
+    start = start_dt.strftime("%Y%m%d")
+    end = end_dt.strftime("%Y%m%d")
+    for symbol in symbols:
+        chunks = None
+        if use_cache and period == "daily":
+            check_cache(symbol=symbol, store=store, api_key=api_key, period=period)
+            if adjust:
+                ensure_adj_factors(symbol, store, api_key=api_key)
+            if store.high_water_mark(symbol) is not None:
+                logger.info(f"Streaming equity {symbol} historical data from cache...")
+                chunks = iter_daily(symbol, store, start, end, adjust=adjust, chunk_rows=chunk_rows, by=chunk_by)
+        if chunks is None:
+            data = get_from_cache(symbol, start_dt, end_dt, api_key=api_key, period=period,
+                                  use_cache=use_cache, adjust=adjust, store=store)
+            chunks = (data.iloc[offset:offset + chunk_rows] for offset in range(0, len(data), chunk_rows))
+
+        for chunk in chunks:
+            if len(symbols) > 1:
+                chunk = chunk.assign(symbol=symbol)
+            yield chunk
+
+def get_period_range(
+        ts_code: str,
+        store: BarStore,
+        period: str,
+        start: str,
+        end: str,
+        adjust: str = ""
+    ) -> pd.DataFrame:
+    """
+    Returns weekly or monthly bars between start and end ('YYYYMMDD') computed from the daily table.
+    """
+    from openbb_tushare.utils.resample import get_resampled
+    from openbb_tushare.utils.ts_adj_factor import get_factor_version
+
+    marks = store.water_marks(ts_code)
+    if marks[1] is None:
+        return pd.DataFrame()
+    marks += (store.row_count(ts_code),)
+    if adjust:
+        marks += get_factor_version(ts_code)
+    bars = get_resampled(ts_code, period, store, marks, adjust=adjust)
+    in_range = (bars["date"] >= pd.Timestamp(start)) & (bars["date"] <= pd.Timestamp(end))
+    logger.info(f"Getting equity {ts_code} {period} data from cache...")
+    return bars[in_range].reset_index(drop=True)
+
+def ensure_adj_factors(ts_code: str, store: BarStore, api_key : str = "") -> None:
+    """
+    Brings the adj_factor table of ts_code up to the high-water mark of its bar table.
+    """
+    from openbb_tushare.utils import ts_adj_factor
+
+    hwm = store.high_water_mark(ts_code)
+    if hwm is not None:
+        ts_adj_factor.sync_adj_factor(ts_code, datetime.strptime(hwm, "%Y%m%d").date(), api_key=api_key)
 
 def get_one(
         ts_code : str, 
-        start_date: dateType,
-        end_date: dateType,
+        start_date: Optional[dateType] = None,
+        end_date: Optional[dateType] = None,
         period: str = "daily",
         use_cache: bool = True, 
         api_key : str = ""
         ) -> pd.DataFrame:
+    """
+    Downloads daily bars for one symbol, bounded by start_date and end_date when given.
+    """
     tushare_api_key = get_api_key(api_key)
 
     pro = ts.pro_api(tushare_api_key)
     symbol_b, symbol, market = normalize_symbol(ts_code)
+    bounds = {}
+    if start_date is not None:
+        bounds["start_date"] = start_date.strftime("%Y%m%d")
+    if end_date is not None:
+        bounds["end_date"] = end_date.strftime("%Y%m%d")
+
     df_data = pd.DataFrame()
     if market == 'HK':
-        df_data = pro.hk_daily(ts_code=ts_code)
-        logger.info(f"Downloaed historical data (HK) {ts_code}: {len(df_data)}.")
+        df_data = pro.hk_daily(ts_code=ts_code, **bounds)
+        logger.info(f"Downloaed historical data (HK) {ts_code} {bounds}: {len(df_data)}.")
     else:
-        df_data = pro.daily(ts_code=ts_code)
-        logger.info(f"Downloaed historical data {ts_code}: {len(df_data)}.")
+        df_data = pro.daily(ts_code=ts_code, **bounds)
+        logger.info(f"Downloaed historical data {ts_code} {bounds}: {len(df_data)}.")
 
-    df_data = df_data.rename(columns={'trade_date':'date', 'vol':'volume', "pct_chg":"change_percent"})
+    df_data = df_data.rename(columns=BAR_COLUMNS)
     if 'ts_code' in df_data.columns:
         df_data.drop(columns=['ts_code'], inplace=True)
     return df_data
 
+def sync_bars(
+        symbol: str,
+        store: BarStore,
+        end_date: dateType,
+        api_key : str = "",
+        period: str = "daily"
+        ) -> int:
+    """
+    Incrementally syncs a bar table up to end_date.
+
+    Only trade dates after the table's high-water mark are downloaded. An empty table
+    is filled from the listing date.
+    """
+    from openbb_tushare.utils.ts_trade_calendar import get_listing_dates
+
+    list_date, _ = get_listing_dates(symbol, api_key=api_key)
+    lwm, hwm = store.water_marks(symbol)
+    rows = 0
+    if hwm is None:
+        start = list_date
+    else:
+        start = datetime.strptime(hwm, "%Y%m%d").date() + timedelta(days=1)
+        head_end = get_missing_head(symbol, lwm, api_key=api_key)
+        if head_end is not None:
+            data_df = get_one(symbol, period=period, api_key=api_key, start_date=list_date, end_date=head_end)
+            rows += store.write(symbol, data_df)
+
+    if start is None or start <= end_date:
+        data_df = get_one(symbol, period=period, api_key=api_key, start_date=start, end_date=end_date)
+        rows += store.write(symbol, data_df)
+    logger.info(f"Synced {rows} bars for {symbol} up to {end_date}.")
+    return rows
+
+def get_missing_head(symbol: str, lwm: Optional[str], api_key : str = "") -> Optional[dateType]:
+    """
+    Returns the last date of the history missing before the low-water mark, if any.
+
+    Tables warmed by a cross-sectional backfill may not reach back to the listing date.
+    """
+    from openbb_tushare.utils.ts_trade_calendar import get_listing_dates
+
+    list_date, _ = get_listing_dates(symbol, api_key=api_key)
+    if lwm is None or list_date is None:
+        return None
+    head_end = datetime.strptime(lwm, "%Y%m%d").date() - timedelta(days=1)
+    return head_end if has_sessions(symbol, list_date, head_end, api_key=api_key) else None
+
+def has_sessions(ts_code: str, start_date: dateType, end_date: dateType, api_key : str = "") -> bool:
+    """
+    Returns True if ts_code was listed and traded on at least one session in the range.
+    """
+    from openbb_tushare.utils.ts_trade_calendar import get_trade_calendar, get_listing_dates
+
+    _, _, market = normalize_symbol(ts_code)
+    list_date, delist_date = get_listing_dates(ts_code, api_key=api_key)
+    if list_date is not None:
+        start_date = max(start_date, list_date)
+    if delist_date is not None:
+        end_date = min(end_date, delist_date)
+    calendar = get_trade_calendar(market, api_key=api_key)
+    return len(calendar.trading_days(start_date, end_date)) > 0
+
 def check_cache(symbol: str, 
-        cache: TableCache,
+        store: BarStore,
         api_key : str = "",
         period: str = "daily"
         ) -> bool:
     """
     Check if the cache contains the latest data for the given symbol.
+
+    A stale cache is brought up to date with an incremental sync. Holes in the
+    middle of the cached history are only detected, from the row count, and logged:
+    repairing them is a maintenance job, see bar_gaps.repair_all_gaps.
     """
-    from openbb_tushare.utils.ak_helpers import get_list_date
-    from mysharelib.tools import last_closing_day
+    from openbb_tushare.utils.bar_gaps import has_gaps
+    from openbb_tushare.utils.ts_trade_calendar import expected_last_date
     
-    start = get_list_date(symbol)
-    end = last_closing_day()
-    cache_df = cache.fetch_date_range(start.strftime("%Y%m%d"), end.strftime("%Y%m%d"))
-    cache_df = cache_df.set_index('date')
-    cache_df.index = pd.to_datetime(cache_df.index)
-    is_cache_valid = cache_df.index.max().date() == last_closing_day()
+    end = expected_last_date(symbol, api_key=api_key)
+    if end is None:
+        return True
+    lwm, hwm = store.water_marks(symbol)
+    is_cache_valid = (
+        hwm is not None
+        and hwm >= end.strftime("%Y%m%d")
+        and get_missing_head(symbol, lwm, api_key=api_key) is None
+    )
     if not is_cache_valid:
-        logger.warning(f"Cache for {symbol} is not up-to-date. Last date in cache: {cache_df.index.max().date()}, expected: {last_closing_day()}.")
-        data_util_today_df = get_one(symbol, period=period, api_key=api_key, start_date=start, end_date=end)
-        cache.write_dataframe(data_util_today_df)
-    return is_cache_valid
\ No newline at end of file
+        logger.warning(f"Cache for {symbol} is not up-to-date. Cached range: {lwm} - {hwm}, expected up to: {end}.")
+        sync_bars(symbol, store, end_date=end, api_key=api_key, period=period)
+    if has_gaps(symbol, store, api_key=api_key):
+        logger.warning(f"Cache for {symbol} has missing sessions, run repair_bar_gaps to fill them.")
+    return is_cache_valid
+
+def download_trade_date(trade_date: dateType, market: str = "CN", api_key : str = "") -> pd.DataFrame:
+    """
+    Downloads the daily bars of every symbol for one session in a single call.
+
+    Parameters:
+        trade_date (date): Session to download.
+        market (str): "CN" for A-shares (pro.daily) or "HK" for Hong Kong (pro.hk_daily).
+        api_key (str): Tushare API key.
+    """
+    tushare_api_key = get_api_key(api_key)
+    pro = ts.pro_api(tushare_api_key)
+    day = trade_date.strftime("%Y%m%d")
+    df_data = getattr(pro, INGEST_ENDPOINTS[market])(trade_date=day)
+    logger.info(f"Downloaded {market} cross-section for {day}: {len(df_data)}.")
+    return df_data.rename(columns=BAR_COLUMNS)
+
+def record_ingested(market: str, sessions: pd.DataFrame, store: Optional[BarStore] = None) -> None:
+    """
+    Records ingested sessions and their row counts in the ingest log of the bar store.
+    """
+    if store is None:
+        store = get_bar_store()
+    store.record_ingested(market, sessions)
+
+def ingest_trade_date(
+        trade_date: dateType,
+        market: str = "CN",
+        api_key : str = "",
+        store: Optional[BarStore] = None
+    ) -> int:
+    """
+    Downloads the daily bars of every symbol for one session and splits them into the bar store.
+
+    Parameters:
+        trade_date (date): Session to ingest.
+        market (str): "CN" for A-shares (pro.daily) or "HK" for Hong Kong (pro.hk_daily).
+        api_key (str): Tushare API key.
+        store (BarStore): Bar storage backend.
+
+    Returns:
+        int: Number of bars written.
+    """
+    if store is None:
+        store = get_bar_store()
+    df_data = download_trade_date(trade_date, market=market, api_key=api_key)
+    rows = store.write_cross_section(df_data)
+    record_ingested(market, df_data, store=store)
+    return rows
+
+def get_ingested_sessions(market: str = "CN", store: Optional[BarStore] = None) -> set:
+    """
+    Returns the sessions ('YYYYMMDD') already ingested for a market into the bar store.
+    """
+    if store is None:
+        store = get_bar_store()
+    return store.ingested_sessions(market)
+
+def get_cross_section(
+        trade_date: Union[dateType, str],
+        fields: Optional[Iterable[str]] = None,
+        store: Optional[BarStore] = None
+    ) -> pd.DataFrame:
+    """
+    Returns the cached bars of every symbol on one session, e.g. all closes on a date.
+
+    Parameters:
+        trade_date (date | str): Session as a date or 'YYYYMMDD'.
+        fields (Iterable[str]): Bar columns to return besides ts_code and date. All columns by default.
+        store (BarStore): Bar storage backend.
+
+    Returns:
+        DataFrame: One row per symbol, sorted by ts_code.
+    """
+    if store is None:
+        store = get_bar_store()
+    if isinstance(trade_date, dateType):
+        trade_date = trade_date.strftime("%Y%m%d")
+    return store.read_cross_section(trade_date, columns=None if fields is None else list(fields))
+
+def backfill_daily_bars(
+        start_date: dateType,
+        end_date: dateType,
+        markets: Iterable[str] = ("CN", "HK"),
+        api_key : str = "",
+        calls_per_minute: int = INGEST_CALLS_PER_MINUTE,
+        resume: bool = True,
+        batch_sessions: int = INGEST_BATCH_SESSIONS,
+        store: Optional[BarStore] = None
+    ) -> int:
+    """
+    Warms the bar store for a date range with one cross-sectional call per session.
+
+    Parameters:
+        start_date (date): First session to ingest.
+        end_date (date): Last session to ingest.
+        markets (Iterable[str]): Markets to ingest, "CN" and/or "HK".
+        api_key (str): Tushare API key.
+        calls_per_minute (int): Upper bound of Tushare calls per minute.
+        resume (bool): Skip sessions already recorded in the ingest log.
+        batch_sessions (int): Number of sessions buffered before they are written, so that
+            each symbol is written once per batch rather than once per session.
+        store (BarStore): Bar storage backend.
+
+    Returns:
+        int: Number of bars written.
+    """
+    from openbb_tushare.utils.concurrency import RateLimiter
+    from openbb_tushare.utils.ts_trade_calendar import get_trade_calendar
+
+    if store is None:
+        store = get_bar_store()
+    limiter = RateLimiter(calls_per_minute)
+    rows = 0
+
+    def flush(market: str, batch: list) -> int:
+        if not batch:
+            return 0
+        df_data = pd.concat(batch, ignore_index=True)
+        written = store.write_cross_section(df_data)
+        record_ingested(market, df_data, store=store)
+        batch.clear()
+        return written
+
+    for market in markets:
+        calendar = get_trade_calendar("HK" if market == "HK" else "SH", api_key=api_key)
+        done = get_ingested_sessions(market, store=store) if resume else set()
+        sessions = calendar.trading_days(start_date, end_date)
+        logger.info(f"Backfilling {len(sessions)} {market} sessions from {start_date} to {end_date}.")
+        batch: list = []
+        for session in sessions:
+            session = session.astype(object)
+            if session.strftime("%Y%m%d") in done:
+                continue
+            limiter.wait()
+            batch.append(download_trade_date(session, market=market, api_key=api_key))
+            if len(batch) >= batch_sessions:
+                rows += flush(market, batch)
+        rows += flush(market, batch)
+    return rows
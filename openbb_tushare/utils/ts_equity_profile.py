@@ -10,6 +10,8 @@ from mysharelib.tools import setup_logger
 from openbb_tushare.utils.helpers import get_api_key
 from mysharelib.tools import normalize_symbol
 from mysharelib.table_cache import TableCache
+from openbb_tushare.utils.cache_meta import record_dataframe
+from openbb_tushare.utils.concurrency import get_rate_limiter
 from openbb_tushare import project_name
 
 setup_logger(project_name)
@@ -48,64 +50,145 @@ EQUITY_INFO_SCHEMA = {
     "curr_type": "TEXT"          # 货币代码 (Currency)
 }
 
-def get_hk_data(ts_code: str, pro, cache: TableCache) -> pd.DataFrame:
-    a_fields = {
-        'ts_code': ts_code,
-        'com_id': '',
-        'exchange': '',
-        'chairman': '',
-        'manager': '',
-        'secretary': '',
-        'reg_capital': 0.0,
-        'setup_date': '',
-        'province': '',
-        'city': '',
-        'introduction': '',
-        'website': '',
-        'email': '',
-        'office': '',
-        'employees': 0,
-        'main_business': '',
-        'business_scope': ''
-    }
+# Fields only A-share profiles (stock_company) have, filled in for HK rows
+A_SHARE_DEFAULTS = {
+    'com_id': '',
+    'exchange': '',
+    'chairman': '',
+    'manager': '',
+    'secretary': '',
+    'reg_capital': 0.0,
+    'setup_date': '',
+    'province': '',
+    'city': '',
+    'introduction': '',
+    'website': '',
+    'email': '',
+    'office': '',
+    'employees': 0,
+    'main_business': '',
+    'business_scope': ''
+}
+
+# Fields only HK profiles (hk_basic) have, filled in for A-share rows
+HK_DEFAULTS = {
+    'fullname': '',
+    'enname': '',
+    'cn_spell': '',
+    'market': '',
+    'list_status': '',
+    'list_date': '',
+    'delist_date': '',
+    'trade_unit': 0.0,
+    'isin': '',
+    'curr_type': ''
+}
+
+COMPANY_FIELDS = "ts_code,com_name,com_id,exchange,chairman,manager,secretary,reg_capital,setup_date,province,city,introduction,website,email,office,employees,main_business,business_scope"
+
+# Exchanges warmed by warm_equity_profiles, and the rows stock_company returns per call
+PROFILE_EXCHANGES = ("SSE", "SZSE", "BSE", "HK")
+PROFILE_PAGE_SIZE = 4500
+
+def complete_hk_profiles(data_hk: pd.DataFrame) -> pd.DataFrame:
+    """Add the A-share-only fields to hk_basic rows."""
+    return data_hk.assign(**A_SHARE_DEFAULTS)
+
+def complete_a_profiles(data: pd.DataFrame) -> pd.DataFrame:
+    """Rename stock_company rows to the profile schema and add the HK-only fields."""
+    return data.rename(columns={'com_name': 'name'}).assign(**HK_DEFAULTS)
 
+def get_hk_data(ts_code: str, pro, cache: TableCache) -> pd.DataFrame:
     data_hk = pro.hk_basic(ts_code=ts_code)
     if data_hk.empty:
         logger.warning(f"No equity profile data found for HK stock {ts_code}.")
         return pd.DataFrame()
 
-    data_a = pd.DataFrame([a_fields])
-    combined_data = pd.merge(data_hk, data_a, on=['ts_code'], how='outer')
+    combined_data = complete_hk_profiles(data_hk)
     cache.update_or_insert(combined_data)
     return combined_data
 
 def get_ss_data(ts_code: str, pro, cache: TableCache) -> pd.DataFrame:
-    csv_fields = "ts_code,com_name,com_id,exchange,chairman,manager,secretary,reg_capital,setup_date,province,city,introduction,website,email,office,employees,main_business,business_scope"
-    data = pro.stock_company(ts_code=ts_code, fields=csv_fields)
+    data = pro.stock_company(ts_code=ts_code, fields=COMPANY_FIELDS)
     if data.empty:
         logger.warning(f"No equity profile data found for HK stock {ts_code}.")
         return data
 
-    data = data.rename(columns={'com_name': 'name'})
-
-    hk_fields = {
-        'ts_code': ts_code,
-        'fullname': '',
-        'enname': '',
-        'cn_spell': '',
-        'market': '',
-        'list_status': '',
-        'list_date': '',
-        'delist_date': '',
-        'trade_unit': 0.0,
-        'isin': '',
-        'curr_type': ''
-    }
-    data_hk = pd.DataFrame([hk_fields])
-    combined_data = pd.merge(data_hk, data, on=['ts_code'], how='outer')
+    combined_data = complete_a_profiles(data)
     cache.update_or_insert(combined_data)
     return combined_data
 
+def write_profiles(cache: TableCache, data: pd.DataFrame) -> int:
+    """
+    Upserts many profiles into the equity_profile table in a single transaction.
+
+    Columns outside EQUITY_INFO_SCHEMA are dropped.
+    """
+    import sqlite3
+
+    data = data[[col for col in EQUITY_INFO_SCHEMA if col in data.columns]]
+    data = data.drop_duplicates(subset="ts_code", keep="last")
+    rows = data.astype(object).where(data.notna(), None).itertuples(index=False, name=None)
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {cache.table_name} ({', '.join(data.columns)}) "
+            f"VALUES ({', '.join(['?'] * len(data.columns))})",
+            rows,
+        )
+    return len(data)
+
+def download_companies(pro, exchange: str) -> pd.DataFrame:
+    """Downloads the stock_company rows of a whole exchange, page by page."""
+    pages = []
+    offset = 0
+    while True:
+        get_rate_limiter().wait()
+        page = pro.stock_company(exchange=exchange, fields=COMPANY_FIELDS, limit=PROFILE_PAGE_SIZE, offset=offset)
+        pages.append(page)
+        if len(page) < PROFILE_PAGE_SIZE:
+            break
+        offset += PROFILE_PAGE_SIZE
+    data = pd.concat(pages, ignore_index=True)
+    logger.info(f"Downloaded {len(data)} {exchange} company profiles in {len(pages)} calls.")
+    return data
+
+def warm_equity_profiles(exchanges=PROFILE_EXCHANGES, api_key: str = "") -> int:
+    """
+    Prefetches the profiles of every company of the given exchanges into the cache.
+
+    A-share exchanges (SSE, SZSE, BSE) come from stock_company and HK from hk_basic,
+    a few calls per exchange instead of one per symbol. Afterwards per-symbol profile
+    lookups are cache hits. Each warmed exchange is recorded in the cache metadata
+    under the equity_profile_exchange dataset, per-symbol downloads stay keyed by
+    ts_code under equity_profile.
+
+    Parameters:
+        exchanges (Iterable[str]): Exchanges to warm, among "SSE", "SZSE", "BSE" and "HK".
+        api_key (str): Tushare API key for authentication.
+
+    Returns:
+        int: Number of profiles written.
+    """
+    tushare_api_key = get_api_key(api_key)
+    pro = ts.pro_api(tushare_api_key)
+    cache = TableCache(EQUITY_INFO_SCHEMA, project=project_name, table_name="equity_profile", primary_key="ts_code")
+
+    frames = {}
+    for exchange in exchanges:
+        if exchange == "HK":
+            get_rate_limiter().wait()
+            data_hk = pro.hk_basic()
+            logger.info(f"Downloaded {len(data_hk)} HK company profiles.")
+            frames[exchange] = complete_hk_profiles(data_hk)
+        else:
+            frames[exchange] = complete_a_profiles(download_companies(pro, exchange))
+
+    rows = write_profiles(cache, pd.concat(frames.values(), ignore_index=True))
+    for exchange, data in frames.items():
+        record_dataframe("equity_profile_exchange", data, key=exchange)
+    logger.info(f"Warmed {rows} equity profiles for {', '.join(exchanges)}.")
+    return rows
+
 def get_equity_profile(ts_code: str, api_key: str = "", use_cache: bool = True) -> pd.DataFrame:
     """
     Retrieves equity profile data from a cache or downloads it from the data source.
@@ -130,11 +213,15 @@ def get_equity_profile(ts_code: str, api_key: str = "", use_cache: bool = True)
     tushare_api_key = get_api_key(api_key)
     pro = ts.pro_api(tushare_api_key)
     symbol_b, symbol, market = normalize_symbol(ts_code)
+    # Cache hits are free, only the Tushare call counts against the rate budget
+    get_rate_limiter().wait()
     df_data = pd.DataFrame()
     if market == 'HK':
         df_data = get_hk_data(ts_code, pro, cache)
     else:
         df_data = get_ss_data(ts_code, pro, cache)
+    if not df_data.empty:
+        record_dataframe("equity_profile", df_data, key=symbol)
 
     return df_data
 
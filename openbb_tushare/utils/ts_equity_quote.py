@@ -1,7 +1,10 @@
 import logging
+from typing import Iterable, List
+
 import pandas as pd
 import tushare as ts
 from mysharelib.tools import setup_logger
+from openbb_tushare.utils.concurrency import map_bounded
 from openbb_tushare.utils.helpers import get_api_key
 from mysharelib.tools import normalize_symbol
 from openbb_tushare import project_name
@@ -10,28 +13,99 @@ setup_logger(project_name)
 
 logger = logging.getLogger(__name__)
 
-def get_one(ts_code : str, use_cache: bool = True, api_key : str = "") -> pd.DataFrame:
-    tushare_api_key = get_api_key(api_key)
+# Symbols per request: the sina realtime quote takes comma-joined codes, and so does rt_hk_k
+QUOTE_CHUNK_SIZE = {"CN": 50, "HK": 100}
+QUOTE_MAX_WORKERS = 4
 
-    logger.info(f"Getting equity equote data...")
-    _, _, market = normalize_symbol(ts_code)
-    df_data = pd.DataFrame()
+CN_QUOTE_COLUMNS = {'TS_CODE':'ts_code', 'NAME':'name', 'BID':'bid', 'ASK':'ask', 'PRICE': 'last_price',
+                    'OPEN':'open', 'HIGH':'high', 'LOW':'low', 'VOLUME':'volume', 'PRE_CLOSE': 'prev_close'}
+HK_QUOTE_COLUMNS = {'ts_code':'ts_code', 'open':'open', 'high':'high', 'low':'low', 'close':'close',
+                    'vol':'volume', 'pre_close':'prev_close'}
+
+def download_quotes(ts_codes: List[str], market: str, api_key : str = "") -> pd.DataFrame:
+    """
+    Downloads the realtime quotes of several symbols of one market in a single request.
+
+    Parameters:
+        ts_codes (List[str]): Tushare codes, at most QUOTE_CHUNK_SIZE[market] of them.
+        market (str): "CN" for A-shares (ts.realtime_quote) or "HK" (pro.rt_hk_k).
+        api_key (str): Tushare API key. A-share quotes use the token set with ts.set_token.
+    """
+    codes = ",".join(ts_codes)
     if market == 'HK':
-        pro = ts.pro_api(tushare_api_key)
-        df_data = pro.rt_hk_k(ts_code)
-        # For HK market: select required columns and rename
-        df_data = df_data[['ts_code', 'open', 'high', 'low', 'close', 'vol', 'pre_close']]
-        df_data = df_data.rename(columns={'vol': 'volume', 'pre_close': 'prev_close'})
+        pro = ts.pro_api(get_api_key(api_key))
+        df_data = pro.rt_hk_k(ts_code=codes)
+        columns = HK_QUOTE_COLUMNS
     else:
+        df_data = ts.realtime_quote(ts_code=codes)
+        columns = CN_QUOTE_COLUMNS
+    if df_data is None or df_data.empty:
+        logger.warning(f"No data returned from tushare for {codes}")
+        return pd.DataFrame()
+    logger.info(f"Downloaded {len(df_data)} {market} quotes for {len(ts_codes)} symbols.")
+    return df_data[list(columns)].rename(columns=columns)
+
+def get_quotes(ts_codes: Iterable[str], use_cache: bool = True, api_key : str = "") -> pd.DataFrame:
+    """
+    Retrieves the realtime quotes of many symbols with as few requests as possible.
+
+    Symbols are grouped by market and sent in comma-joined chunks sized to each
+    endpoint's limit. The A-share and HK chunks are fetched concurrently. With
+    use_cache, only symbols missing from the quote cache are requested.
+
+    Parameters:
+        ts_codes (Iterable[str]): Symbols to quote.
+        use_cache (bool): Whether to use cached quotes, see quote_cache.QuoteCache.
+        api_key (str): Tushare API key.
+
+    Returns:
+        DataFrame: One row per quoted symbol, in the order requested. Symbols without a
+        quote are left out.
+    """
+    from openbb_tushare.utils.quote_cache import get_quote_cache
+
+    tushare_api_key = get_api_key(api_key)
+    symbols = list(dict.fromkeys(normalize_symbol(code.strip())[1] for code in ts_codes if code.strip()))
+    cache = get_quote_cache()
+    cached = {}
+    if use_cache:
+        cached = {symbol: quote for symbol in symbols if (quote := cache.get(symbol)) is not None}
+        if cached:
+            logger.info(f"Loading {len(cached)} quotes from cache...")
+
+    markets = {"CN": [], "HK": []}
+    for symbol in symbols:
+        if symbol not in cached:
+            markets["HK" if symbol.endswith(".HK") else "CN"].append(symbol)
+
+    chunks = [
+        (market, codes[i:i + QUOTE_CHUNK_SIZE[market]])
+        for market, codes in markets.items()
+        for i in range(0, len(codes), QUOTE_CHUNK_SIZE[market])
+    ]
+    if markets["CN"]:
         ts.set_token(tushare_api_key)
-        df_data = ts.realtime_quote(ts_code)
-        if df_data is None or df_data.empty:
-            logger.warning(f"No data returned from tushare for {ts_code}")
-            return pd.DataFrame()
-        
-        # For non-HK markets: select required columns and rename
-        df_data = df_data[['TS_CODE','NAME','BID','ASK','PRICE','OPEN','HIGH','LOW','VOLUME','PRE_CLOSE']]
-        df_data = df_data.rename(columns={'TS_CODE':'ts_code', 'NAME':'name', 'BID':'bid', 
-                                          'ASK':'ask', 'PRICE': 'last_price', 'OPEN':'open', 
-                                          'HIGH':'high', 'LOW':'low', 'VOLUME':'volume', 'PRE_CLOSE': 'prev_close'})
-    return df_data
+
+    frames = []
+    results = map_bounded(lambda chunk: download_quotes(chunk[1], chunk[0], tushare_api_key), chunks,
+                          max_workers=QUOTE_MAX_WORKERS)
+    for (_, codes), result in zip(chunks, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Error fetching quotes for {','.join(codes)}: {result}")
+        else:
+            frames.append(result)
+
+    # Split the combined frame back per symbol, in the order requested
+    quotes = dict(cached)
+    for df in frames:
+        for quote in df.to_dict(orient="records"):
+            quotes[quote["ts_code"]] = quote
+            cache.put(quote["ts_code"], quote, api_key=api_key)
+    found = [symbol for symbol in symbols if symbol in quotes]
+    if len(found) < len(symbols):
+        logger.warning(f"No quote for {', '.join(sorted(set(symbols) - set(found)))}")
+    return pd.DataFrame([quotes[symbol] for symbol in found])
+
+def get_one(ts_code : str, use_cache: bool = True, api_key : str = "") -> pd.DataFrame:
+    logger.info(f"Getting equity equote data...")
+    return get_quotes([ts_code], use_cache=use_cache, api_key=api_key)
@@ -4,6 +4,7 @@ import pandas as pd
 import tushare as ts
 from mysharelib.table_cache import TableCache
 from mysharelib.tools import setup_logger
+from openbb_tushare.utils.cache_meta import record_dataframe
 from openbb_tushare.utils.helpers import get_api_key
 from openbb_tushare import project_name
 
@@ -50,4 +51,5 @@ def get_symbols(use_cache: bool = True, api_key : str = "") -> pd.DataFrame:
     df_cn = pro.stock_basic(exchange='', list_status='L', fields='ts_code,symbol,name,area,industry,fullname,enname,cnspell,market,exchange,curr_type,list_status,list_date,delist_date,is_hs,act_name,act_ent_type')
     df_all = pd.concat([df_cn, df_hk], ignore_index=True)
     cache.write_dataframe(df_all)
+    record_dataframe("symbols", df_all, date_column="list_date")
     return df_all
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Historical index bars on the shared bar store.
+
+Index bars (pro.index_daily) are kept in the same bar store as the equity bars,
+keyed by the index ts_code (e.g. 000300.SH, 399001.SZ, 930050.CSI), and synced
+incrementally from the high-water mark the same way. Index codes never collide
+with equity codes, and all A-share indices trade on the SSE calendar.
+"""
+import logging
+from datetime import (
+    date as dateType,
+    datetime,
+    timedelta,
+)
+from typing import Dict, Optional, Tuple, Union
+
+import pandas as pd
+import tushare as ts
+from mysharelib.tools import setup_logger
+from openbb_tushare.utils.bar_store import BarStore, get_bar_store
+from openbb_tushare.utils.concurrency import get_rate_limiter
+from openbb_tushare.utils.helpers import get_api_key
+from openbb_tushare.utils.ts_equity_historical import BAR_COLUMNS, get_period_range
+from openbb_tushare.utils.resample import load_daily
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+# Maximum rows returned by one index_daily call
+INDEX_DAILY_LIMIT = 8000
+
+
+def build_index_codes(indices: pd.DataFrame) -> Dict[str, str]:
+    """Map each bare index code of the index catalog to its first ts_code, e.g. 000300 -> 000300.SH."""
+    codes: Dict[str, str] = {}
+    for ts_code in indices["ts_code"]:
+        codes.setdefault(ts_code.split(".")[0], ts_code)
+    return codes
+
+
+def build_index_listing(indices: pd.DataFrame) -> Dict[str, Tuple[Optional[dateType], Optional[dateType]]]:
+    """Map each ts_code of the index catalog to its (list_date, exp_date), list_date falling back to base_date."""
+    list_dates = pd.to_datetime(indices["list_date"], format="%Y%m%d", errors="coerce")
+    base_dates = pd.to_datetime(indices["base_date"], format="%Y%m%d", errors="coerce")
+    exp_dates = pd.to_datetime(indices["exp_date"], format="%Y%m%d", errors="coerce")
+    list_dates = list_dates.fillna(base_dates)
+    return {
+        code: (
+            None if pd.isna(list_date) else list_date.date(),
+            None if pd.isna(exp_date) else exp_date.date(),
+        )
+        for code, list_date, exp_date in zip(indices["ts_code"], list_dates, exp_dates)
+    }
+
+
+def resolve_index_code(symbol: str, api_key: str = "") -> str:
+    """
+    Return the ts_code of an index.
+
+    Codes with a suffix are returned as is, bare codes (e.g. 000300) are looked up
+    in the index catalog, as they cannot be told apart from equity codes.
+    """
+    from openbb_tushare.utils.reference_data import get_reference_registry
+
+    symbol = symbol.strip().upper()
+    if "." in symbol:
+        return symbol
+    codes = get_reference_registry().derived("indices", "codes", build_index_codes, api_key=api_key)
+    if symbol not in codes:
+        raise ValueError(f"Unknown index {symbol}, use its ts_code, e.g. 000300.SH.")
+    return codes[symbol]
+
+
+def get_index_listing(ts_code: str, api_key: str = "") -> Tuple[Optional[dateType], Optional[dateType]]:
+    """Return (list_date, exp_date) of an index from the cached index catalog."""
+    from openbb_tushare.utils.reference_data import get_reference_registry
+
+    listing = get_reference_registry().derived("indices", "listing", build_index_listing, api_key=api_key)
+    return listing.get(ts_code, (None, None))
+
+
+def expected_index_last_date(ts_code: str, api_key: str = "") -> Optional[dateType]:
+    """
+    Return the latest session a complete bar cache for an index should contain.
+
+    Discontinued indices stop at their expiry date.
+    """
+    from openbb_tushare.utils.ts_trade_calendar import get_trade_calendar
+
+    calendar = get_trade_calendar("SH", api_key=api_key)
+    end = calendar.last_closing_day()
+    _, exp_date = get_index_listing(ts_code, api_key=api_key)
+    if exp_date is not None and end is not None and exp_date < end:
+        end = calendar.previous_session(exp_date)
+    return end
+
+
+def download_index_bars(
+        ts_code: str,
+        start_date: Optional[dateType] = None,
+        end_date: Optional[dateType] = None,
+        api_key: str = ""
+    ) -> pd.DataFrame:
+    """
+    Downloads daily index bars, bounded by start_date and end_date when given.
+
+    index_daily returns at most INDEX_DAILY_LIMIT bars per call, latest first, so
+    longer ranges are fetched backwards from end_date.
+    """
+    pro = ts.pro_api(get_api_key(api_key))
+    bounds = {}
+    if start_date is not None:
+        bounds["start_date"] = start_date.strftime("%Y%m%d")
+    if end_date is not None:
+        bounds["end_date"] = end_date.strftime("%Y%m%d")
+
+    pages = []
+    while True:
+        get_rate_limiter().wait()
+        page = pro.index_daily(ts_code=ts_code, **bounds)
+        if page is None or page.empty:
+            break
+        pages.append(page)
+        if len(page) < INDEX_DAILY_LIMIT:
+            break
+        first = datetime.strptime(page["trade_date"].min(), "%Y%m%d").date()
+        bounds["end_date"] = (first - timedelta(days=1)).strftime("%Y%m%d")
+    data = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+    logger.info(f"Downloaded index bars {ts_code} {bounds}: {len(data)}.")
+    data = data.rename(columns=BAR_COLUMNS)
+    if "ts_code" in data.columns:
+        data = data.drop(columns=["ts_code"])
+    return data
+
+
+def sync_index_bars(ts_code: str, store: BarStore, end_date: dateType, api_key: str = "") -> int:
+    """
+    Incrementally syncs the bars of an index up to end_date.
+
+    Only trade dates after the high-water mark are downloaded. An empty index is
+    filled from its listing date.
+    """
+    _, hwm = store.water_marks(ts_code)
+    if hwm is None:
+        start, _ = get_index_listing(ts_code, api_key=api_key)
+    else:
+        start = datetime.strptime(hwm, "%Y%m%d").date() + timedelta(days=1)
+    rows = 0
+    if start is None or start <= end_date:
+        rows = store.write(ts_code, download_index_bars(ts_code, start, end_date, api_key=api_key))
+    logger.info(f"Synced {rows} bars for index {ts_code} up to {end_date}.")
+    return rows
+
+
+def get_index_historical(
+        symbol: str,
+        start_date: Union[dateType, str],
+        end_date: Union[dateType, str],
+        period: str = "daily",
+        use_cache: bool = True,
+        api_key: str = "",
+        store: Optional[BarStore] = None
+    ) -> pd.DataFrame:
+    """
+    Retrieves historical index bars from the bar store, syncing it first when stale.
+
+    Parameters:
+        symbol (str): Index ts_code, e.g. 000300.SH, or a bare code of the index catalog.
+        start_date (date | str): Start date.
+        end_date (date | str): End date.
+        period (str): "daily", "weekly" or "monthly".
+        use_cache (bool): Whether to use the cached bars. Otherwise the range is downloaded again.
+        api_key (str): Tushare API key.
+        store (BarStore): Bar storage backend, defaults to the one selected by TUSHARE_BAR_STORE.
+
+    Returns:
+        DataFrame: Bars sorted by date.
+    """
+    from mysharelib.tools import get_valid_date
+    from openbb_tushare.utils.resample import resample_bars
+
+    if store is None:
+        store = get_bar_store()
+    ts_code = resolve_index_code(symbol, api_key=api_key)
+    start_dt = get_valid_date(start_date)
+    end_dt = min(get_valid_date(end_date), datetime.now().date())
+    start = start_dt.strftime("%Y%m%d")
+    end = end_dt.strftime("%Y%m%d")
+
+    if use_cache:
+        expected = expected_index_last_date(ts_code, api_key=api_key)
+        _, hwm = store.water_marks(ts_code)
+        if expected is not None and (hwm is None or hwm < expected.strftime("%Y%m%d")):
+            sync_index_bars(ts_code, store, expected, api_key=api_key)
+        else:
+            logger.info(f"Getting index {ts_code} historical data from cache...")
+        if period != "daily":
+            return get_period_range(ts_code, store, period, start, end)
+        return load_daily(ts_code, store, start, end)
+
+    store.write(ts_code, download_index_bars(ts_code, start_dt, end_dt, api_key=api_key))
+    data = load_daily(ts_code, store, start, end)
+    if period != "daily":
+        return resample_bars(data, period)
+    return data
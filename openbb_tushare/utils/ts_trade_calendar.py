@@ -0,0 +1,184 @@
+"""
+Trading calendar and listing metadata backed by the local cache.
+
+The exchange calendars are downloaded from Tushare (trade_cal/hk_tradecal) once and
+persisted in SQLite. Lookups go through an in-memory index so that freshness checks
+do not need any network call.
+"""
+import logging
+from datetime import (
+    date as dateType,
+    datetime,
+)
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import tushare as ts
+from mysharelib.table_cache import TableCache
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_tushare.utils.helpers import get_api_key
+from openbb_tushare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+TRADE_CAL_SCHEMA = {
+    "cal_date": "TEXT PRIMARY KEY",   # Calendar date (YYYYMMDD)
+    "is_open": "INTEGER",             # 1 if the exchange is open on this date
+    "pretrade_date": "TEXT",          # Previous trading date (YYYYMMDD)
+}
+
+CALENDAR_START = "19900101"
+
+_calendars: Dict[str, "TradingCalendar"] = {}
+
+
+def get_exchange(market: str) -> str:
+    """Map a market suffix (SH/SZ/BJ/HK) to the exchange whose calendar it trades on."""
+    return "HKEX" if market == "HK" else "SSE"
+
+
+class TradingCalendar:
+    """In-memory index over one exchange calendar.
+
+    Every calendar day between the first and the last cached date gets a slot, so
+    date lookups are plain array indexing.
+    """
+
+    def __init__(self, exchange: str, cal_df: pd.DataFrame):
+        self.exchange = exchange
+        cal_df = cal_df.sort_values("cal_date")
+        days = pd.to_datetime(cal_df["cal_date"], format="%Y%m%d")
+        full_range = pd.date_range(days.iloc[0], days.iloc[-1], freq="D")
+        is_open = (
+            pd.Series(cal_df["is_open"].astype(int).values, index=days)
+            .reindex(full_range, fill_value=0)
+            .to_numpy()
+        )
+        self.first_day: dateType = full_range[0].date()
+        self.last_day: dateType = full_range[-1].date()
+        self._is_open = is_open.astype(bool)
+        # Number of sessions up to and including each calendar day
+        self._open_count = np.cumsum(is_open)
+        self.sessions = full_range[self._is_open].values.astype("datetime64[D]")
+
+    def _offset(self, day: dateType) -> int:
+        if day < self.first_day or day > self.last_day:
+            raise ValueError(f"{day} is outside the {self.exchange} calendar ({self.first_day} - {self.last_day}).")
+        return (day - self.first_day).days
+
+    def _session(self, position: int) -> Optional[dateType]:
+        if position < 0 or position >= len(self.sessions):
+            return None
+        return self.sessions[position].astype(object)
+
+    def is_open(self, day: dateType) -> bool:
+        """Return True if the exchange trades on the given day."""
+        return bool(self._is_open[self._offset(day)])
+
+    def last_closing_day(self, today: Optional[dateType] = None) -> Optional[dateType]:
+        """Return the last session strictly before today."""
+        if today is None:
+            today = datetime.now().date()
+        if today > self.last_day:
+            return self.previous_session(self.last_day)
+        offset = self._offset(today)
+        return self._session(int(self._open_count[offset] - self._is_open[offset]) - 1)
+
+    def previous_session(self, day: dateType) -> Optional[dateType]:
+        """Return the last session on or before day."""
+        return self._session(int(self._open_count[self._offset(day)]) - 1)
+
+    def next_session(self, day: dateType) -> Optional[dateType]:
+        """Return the first session strictly after day."""
+        return self._session(int(self._open_count[self._offset(day)]))
+
+    def trading_days(self, start: dateType, end: dateType) -> np.ndarray:
+        """Return the sessions between start and end (inclusive) as datetime64[D]."""
+        start = max(start, self.first_day)
+        end = min(end, self.last_day)
+        if start > end:
+            return self.sessions[:0]
+        first = self._offset(start)
+        first = int(self._open_count[first] - self._is_open[first])
+        last = int(self._open_count[self._offset(end)])
+        return self.sessions[first:last]
+
+
+def download_calendar(exchange: str, start: str, end: str, api_key: str = "") -> pd.DataFrame:
+    """Download an exchange calendar from Tushare."""
+    tushare_api_key = get_api_key(api_key)
+    pro = ts.pro_api(tushare_api_key)
+    if exchange == "HKEX":
+        data = pro.hk_tradecal(start_date=start, end_date=end)
+    else:
+        data = pro.trade_cal(exchange=exchange, start_date=start, end_date=end)
+    logger.info(f"Downloaded {exchange} trading calendar {start} - {end}: {len(data)}.")
+    return data[["cal_date", "is_open", "pretrade_date"]]
+
+
+def get_trade_calendar(market: str = "SH", api_key: str = "") -> TradingCalendar:
+    """
+    Return the trading calendar for a market (SH/SZ/BJ/HK).
+
+    The calendar is loaded from the cache once per process and refreshed from Tushare
+    only when it does not cover today.
+    """
+    exchange = get_exchange(market)
+    today = datetime.now().date()
+    calendar = _calendars.get(exchange)
+    if calendar is not None and calendar.last_day >= today:
+        return calendar
+
+    cache = TableCache(TRADE_CAL_SCHEMA, project=project_name, table_name=f"trade_cal_{exchange}", primary_key="cal_date")
+    data = cache.read_dataframe()
+    if data.empty or data["cal_date"].max() < today.strftime("%Y%m%d"):
+        data = download_calendar(exchange, CALENDAR_START, f"{today.year}1231", api_key=api_key)
+        cache.write_dataframe(data)
+
+    calendar = TradingCalendar(exchange, data)
+    _calendars[exchange] = calendar
+    return calendar
+
+
+def get_listing_dates(ts_code: str, api_key: str = "") -> Tuple[Optional[dateType], Optional[dateType]]:
+    """
+    Return (list_date, delist_date) of a symbol from the cached symbol master.
+
+    The listing dates are a view of the symbols reference table, parsed once per
+    process and again only when the symbol master changes.
+    """
+    from openbb_tushare.utils.reference_data import get_reference_registry
+
+    listing = get_reference_registry().derived("symbols", "listing", build_listing, api_key=api_key)
+    _, symbol_f, _ = normalize_symbol(ts_code)
+    return listing.get(symbol_f, (None, None))
+
+
+def build_listing(symbols: pd.DataFrame) -> Dict[str, Tuple[Optional[dateType], Optional[dateType]]]:
+    """Map each ts_code of the symbol master to its (list_date, delist_date)."""
+    list_dates = pd.to_datetime(symbols["list_date"], format="%Y%m%d", errors="coerce")
+    delist_dates = pd.to_datetime(symbols["delist_date"], format="%Y%m%d", errors="coerce")
+    return {
+        code: (
+            None if pd.isna(list_date) else list_date.date(),
+            None if pd.isna(delist_date) else delist_date.date(),
+        )
+        for code, list_date, delist_date in zip(symbols["ts_code"], list_dates, delist_dates)
+    }
+
+
+def expected_last_date(ts_code: str, api_key: str = "") -> Optional[dateType]:
+    """
+    Return the latest session a complete bar cache for ts_code should contain.
+
+    Delisted symbols stop at their delisting date.
+    """
+    _, _, market = normalize_symbol(ts_code)
+    calendar = get_trade_calendar(market, api_key=api_key)
+    end = calendar.last_closing_day()
+    _, delist_date = get_listing_dates(ts_code, api_key=api_key)
+    if delist_date is not None and end is not None and delist_date < end:
+        end = calendar.previous_session(delist_date)
+    return end
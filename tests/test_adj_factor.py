@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from mysharelib.table_cache import TableCache
+
+from openbb_tushare.utils import ts_adj_factor
+from openbb_tushare.utils.ts_adj_factor import ADJ_FACTOR_SCHEMA, adjust_bars, get_adj_factors, get_factor_version
+
+@pytest.fixture
+def bars():
+    return pd.DataFrame({
+        "date": pd.to_datetime(["20240102", "20240103", "20240104"]),
+        "open": [10.0, 5.0, 5.5],
+        "close": [10.0, 5.0, 5.5],
+        "volume": [100.0, 200.0, 300.0],
+    })
+
+@pytest.fixture
+def factors():
+    # 1:1 bonus share on 2024-01-03, no factor published for 2024-01-04 yet
+    return pd.Series([1.0, 2.0], index=pd.to_datetime(["20240102", "20240103"]))
+
+def test_hfq(bars, factors):
+    adjusted = adjust_bars(bars, factors, "hfq")
+    assert adjusted["close"].tolist() == [10.0, 10.0, 11.0]
+    assert adjusted["volume"].tolist() == bars["volume"].tolist()
+
+def test_qfq(bars, factors):
+    adjusted = adjust_bars(bars, factors, "qfq")
+    assert adjusted["close"].tolist() == [5.0, 5.0, 5.5]
+
+def test_no_adjustment(bars, factors):
+    assert adjust_bars(bars, factors, "") is bars
+
+def test_factor_memo_reloads_restated_series(tmp_path, monkeypatch):
+    cache = TableCache(ADJ_FACTOR_SCHEMA, db_path=str(tmp_path / "equity.db"), table_name="SH600000_adj", primary_key="date")
+    monkeypatch.setattr(ts_adj_factor, "get_adj_factor_cache", lambda ts_code: cache)
+    cache.write_dataframe(pd.DataFrame({"date": ["20240102", "20240103"], "adj_factor": [1.0, 2.0]}))
+    assert get_adj_factors("600000.SH").tolist() == [1.0, 2.0]
+    version = get_factor_version("600000.SH")
+
+    # A restatement rewrites a past factor, the last date and factor stay the same
+    cache.write_dataframe(pd.DataFrame({"date": ["20240101", "20240102", "20240103"], "adj_factor": [1.0, 1.5, 2.0]}))
+    assert get_adj_factors("600000.SH").tolist() == [1.0, 1.5, 2.0]
+    assert get_factor_version("600000.SH") != version
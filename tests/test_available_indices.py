@@ -0,0 +1,56 @@
+import sqlite3
+
+import pandas as pd
+
+from openbb_tushare.models.available_indices import (
+    TushareAvailableIndicesFetcher,
+    TushareAvailableIndicesQueryParams,
+)
+from openbb_tushare.utils.cache_meta import record_dataframe
+from openbb_tushare.utils.ts_available_indices import TABLE_SCHEMA, query_available_indices
+
+INDICES = pd.DataFrame({
+    "ts_code": ["000001.SH", "000300.SH", "399001.SZ", "801010.SI"],
+    "name": ["上证指数", "沪深300", "深证成指", "农林牧渔"],
+    "fullname": ["上证综合指数", "沪深300指数", "深证成份指数", "申万农林牧渔指数"],
+    "market": ["SSE", "SSE", "SZSE", "SW"],
+    "publisher": ["中证公司", "中证公司", "深交所", "申万"],
+    "category": ["综合指数", "规模指数", "规模指数", "一级行业指数"],
+})
+
+def make_catalog(tmp_path):
+    db_path = str(tmp_path / "equity.db")
+    columns = ", ".join(f'"{col}" {dtype}' for col, dtype in TABLE_SCHEMA.items())
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(f"CREATE TABLE indices ({columns})")
+        INDICES.to_sql("indices", conn, if_exists="append", index=False)
+    record_dataframe("indices", INDICES, db_path=db_path)
+    return db_path
+
+def test_filters_run_in_sql(tmp_path):
+    db_path = make_catalog(tmp_path)
+
+    assert query_available_indices(market="sse", db_path=db_path)["ts_code"].tolist() == ["000001.SH", "000300.SH"]
+    assert query_available_indices(market="SZSE,SW", db_path=db_path)["ts_code"].tolist() == ["399001.SZ", "801010.SI"]
+    assert query_available_indices(category="规模指数", publisher="中证公司", db_path=db_path)["ts_code"].tolist() == ["000300.SH"]
+    assert query_available_indices(name="成份", db_path=db_path)["ts_code"].tolist() == ["399001.SZ"]
+    assert query_available_indices(market="CSI", db_path=db_path).empty
+    assert len(query_available_indices(db_path=db_path)) == 4
+
+def test_filter_columns_are_indexed(tmp_path):
+    db_path = make_catalog(tmp_path)
+    query_available_indices(market="SSE", db_path=db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM indices WHERE market = 'SSE'").fetchall()
+    assert "idx_indices_market" in " ".join(row[-1] for row in plan)
+
+def test_records_expose_ts_code_as_symbol():
+    # Tushare names the code ts_code, the standard model requires it as symbol
+    query = TushareAvailableIndicesQueryParams()
+    records = INDICES.to_dict(orient="records")
+    data = TushareAvailableIndicesFetcher.transform_data(query, records)
+
+    assert [d.symbol for d in data] == INDICES["ts_code"].tolist()
+    assert data[1].model_dump()["symbol"] == "000300.SH"
+    assert data[1].name == "沪深300"
@@ -0,0 +1,36 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from openbb_tushare.utils.bar_gaps import get_holes, group_gaps, record_holes
+
+def business_days(start, end):
+    return pd.bdate_range(start, end).to_numpy(dtype="datetime64[D]")
+
+def test_group_gaps_merges_nearby_sessions():
+    sessions = business_days("2024-01-01", "2024-02-29")
+    missing = sessions[[2, 3, 6, 30]]
+
+    assert group_gaps(missing, sessions, max_gap_sessions=2) == [
+        (date(2024, 1, 3), date(2024, 1, 9)),
+        (date(2024, 2, 12), date(2024, 2, 12)),
+    ]
+    assert len(group_gaps(missing, sessions, max_gap_sessions=0)) == 3
+
+def test_group_gaps_bounds_range_length():
+    sessions = business_days("2024-01-01", "2024-12-31")
+    ranges = group_gaps(sessions, sessions, max_range_sessions=100)
+
+    assert len(ranges) == int(np.ceil(len(sessions) / 100))
+    assert ranges[0] == (date(2024, 1, 1), sessions[99].astype(object))
+    assert group_gaps(sessions[:0], sessions) == []
+
+def test_holes_roundtrip(tmp_path):
+    db_path = str(tmp_path / "equity.db")
+    holes = business_days("2024-01-02", "2024-01-03")
+    record_holes("600000.SH", holes, db_path)
+    record_holes("600000.SH", holes, db_path)
+
+    assert (get_holes("600000.SH", db_path) == holes).all()
+    assert len(get_holes("000001.SZ", db_path)) == 0
@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+
+from openbb_tushare.utils.bar_store import ParquetBarStore, SqliteBarStore
+
+def make_bars(dates, close):
+    return pd.DataFrame({
+        "date": dates,
+        "open": close,
+        "high": close,
+        "low": close,
+        "close": close,
+        "volume": [100.0] * len(dates),
+    })
+
+@pytest.fixture(params=["sqlite", "parquet"])
+def store(request, tmp_path):
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+        return ParquetBarStore(root=str(tmp_path / "bars"), db_path=str(tmp_path / "equity.db"))
+    return SqliteBarStore(db_path=str(tmp_path / "equity.db"))
+
+def test_empty_store(store):
+    assert store.water_marks("600000.SH") == (None, None)
+    assert store.read("600000.SH", "20240101", "20241231").empty
+
+def test_write_and_read_range(store):
+    store.write("600000.SH", make_bars(["20231229", "20240102", "20240103"], [1.0, 2.0, 3.0]))
+    assert store.water_marks("600000.SH") == ("20231229", "20240103")
+
+    data = store.read("600000.SH", "20240101", "20240131")
+    assert data["date"].dt.strftime("%Y%m%d").tolist() == ["20240102", "20240103"]
+    assert data["close"].tolist() == [2.0, 3.0]
+
+def test_write_replaces_overlapping_span(store):
+    store.write("600000.SH", make_bars(["20240102", "20240103", "20240104"], [1.0, 2.0, 3.0]))
+    store.write("600000.SH", make_bars(["20240104", "20240105"], [4.0, 5.0]))
+
+    data = store.read("600000.SH", "20240101", "20240131")
+    assert data["close"].tolist() == [1.0, 2.0, 4.0, 5.0]
+    assert store.high_water_mark("600000.SH") == "20240105"
+
+def test_write_cross_section(store):
+    bars = make_bars(["20240102", "20240102"], [1.0, 2.0]).assign(ts_code=["600000.SH", "000001.SZ"])
+    assert store.write_cross_section(bars) == 2
+    assert store.read("000001.SZ", "20240102", "20240102")["close"].tolist() == [2.0]
+
+def test_read_cross_section(store):
+    store.write("600000.SH", make_bars(["20240102", "20240103"], [1.0, 2.0]))
+    store.write("000001.SZ", make_bars(["20240102"], [3.0]))
+
+    data = store.read_cross_section("20240102", columns=["close"])
+    assert data["ts_code"].tolist() == ["000001.SZ", "600000.SH"]
+    assert data["close"].tolist() == [3.0, 1.0]
+    assert store.read_cross_section("20240105").empty
+
+def test_sqlite_migrates_legacy_tables(tmp_path):
+    import sqlite3
+
+    db_path = str(tmp_path / "equity.db")
+    with sqlite3.connect(db_path) as conn:
+        make_bars(["20240102", "20240103"], [1.0, 2.0]).to_sql("SH600000", conn, index=False)
+        make_bars(["20240102"], [3.0]).to_sql("SZ000001", conn, index=False)
+
+    store = SqliteBarStore(db_path=db_path)
+    assert store.water_marks("600000.SH") == ("20240102", "20240103")
+    assert store.migrate() == 1
+    assert store.read("000001.SZ", "20240101", "20240131")["close"].tolist() == [3.0]
+    with sqlite3.connect(db_path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "equity_bars" in tables and not tables & {"SH600000", "SZ000001"}
+
+def test_iter_read_chunks(store):
+    dates = ["20240130", "20240131", "20240201", "20240202", "20240301"]
+    store.write("600000.SH", make_bars(dates, [1.0, 2.0, 3.0, 4.0, 5.0]))
+
+    chunks = list(store.iter_read("600000.SH", "20240131", "20240301", chunk_rows=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2]
+    assert pd.concat(chunks)["close"].tolist() == [2.0, 3.0, 4.0, 5.0]
+
+    months = list(store.iter_read("600000.SH", "20240101", "20240331", by="month"))
+    assert [chunk["close"].tolist() for chunk in months] == [[1.0, 2.0], [3.0, 4.0], [5.0]]
+
+def test_writes_record_cache_meta(store):
+    from openbb_tushare.utils.cache_meta import get_meta
+
+    store.write("600000.SH", make_bars(["20231229", "20240102"], [1.0, 2.0]))
+    store.write("600000.SH", make_bars(["20240102", "20240103"], [3.0, 4.0]))
+
+    meta = get_meta(store.dataset, "600000.SH", db_path=store.db_path)
+    assert (meta.min_date, meta.max_date, meta.row_count) == ("20231229", "20240103", 3)
+    assert get_meta(store.dataset, "000001.SZ", db_path=store.db_path) is None
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from openbb_tushare.utils.cache_meta import get_meta, record_dataframe
+
+def test_record_dataframe_string_dates(tmp_path):
+    db_path = str(tmp_path / "equity.db")
+    df = pd.DataFrame({"end_date": ["20231231", "20240331", None]})
+    record_dataframe("income_statement", df, key="600000.SH", date_column="end_date", db_path=db_path)
+
+    meta = get_meta("income_statement", "600000.SH", db_path=db_path)
+    assert (meta.min_date, meta.max_date, meta.row_count) == ("20231231", "20240331", 3)
+    assert meta.last_sync > 0
+
+def test_record_dataframe_datetime_dates(tmp_path):
+    db_path = str(tmp_path / "equity.db")
+    df = pd.DataFrame({"ex_dividend_date": pd.to_datetime(["2024-06-01", "2023-06-01"])})
+    record_dataframe("historical_dividends", df, key="600000.SH", date_column="ex_dividend_date", db_path=db_path)
+
+    assert get_meta("historical_dividends", "600000.SH", db_path=db_path)[:3] == ("20230601", "20240601", 2)
+
+def test_record_dataframe_without_dates(tmp_path):
+    db_path = str(tmp_path / "equity.db")
+    record_dataframe("symbols", pd.DataFrame({"ts_code": ["600000.SH"]}), db_path=db_path)
+
+    assert get_meta("symbols", db_path=db_path)[:3] == (None, None, 1)
+    assert get_meta("indices", db_path=db_path) is None
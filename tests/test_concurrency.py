@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+import warnings
+
+import pytest
+from openbb_core.app.model.abstract.error import OpenBBError
+
+from openbb_tushare.models.equity_profile import TushareEquityProfileQueryParams
+from openbb_tushare.utils.concurrency import (
+    RateLimiter,
+    gather_bounded,
+    gather_symbols,
+    get_executor,
+    get_pool_size,
+    map_bounded,
+)
+
+def test_rate_limiter_allows_burst_then_throttles():
+    limiter = RateLimiter(calls_per_minute=60)
+    # The whole per-minute budget goes out at once
+    delays = [limiter.reserve() for _ in range(60)]
+    assert max(delays) == 0
+    # Once the bucket is empty, calls wait for the refill of one token per second
+    assert limiter.reserve() == pytest.approx(1.0, abs=0.05)
+    assert limiter.reserve() == pytest.approx(2.0, abs=0.05)
+
+def test_gather_bounded_keeps_order_and_bound():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(item):
+        with lock:
+            running.append(item)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(item)
+        if item == 3:
+            raise ValueError("bad symbol")
+        return item * 10
+
+    results = asyncio.run(gather_bounded(work, range(6), max_workers=2))
+    assert results[:3] == [0, 10, 20] and results[4:] == [40, 50]
+    assert isinstance(results[3], ValueError)
+    assert max(peak) <= 2
+
+def test_map_bounded():
+    results = map_bounded(lambda item: 1 / item, [1, 0, 4], max_workers=3)
+    assert results[0] == 1 and results[2] == 0.25
+    assert isinstance(results[1], ZeroDivisionError)
+    assert map_bounded(abs, []) == []
+
+def test_map_bounded_uses_shared_pool():
+    names = map_bounded(lambda item: threading.current_thread().name, range(3), max_workers=2)
+    assert all(name.startswith("openbb_tushare") for name in names)
+    # Nested calls from a pool thread run inline instead of waiting on the pool
+    assert get_executor().submit(map_bounded, abs, [-1, -2]).result() == [1, 2]
+
+def test_max_workers_clamped_to_pool_size():
+    assert TushareEquityProfileQueryParams(symbol="600000.SH", max_workers=1000).max_workers == get_pool_size()
+    assert TushareEquityProfileQueryParams(symbol="600000.SH", max_workers=2).max_workers == min(2, get_pool_size())
+
+def test_gather_symbols_warns_on_partial_failure():
+    def get_one(symbol):
+        if symbol == "bad":
+            raise ValueError("no data")
+        return [{"symbol": symbol, "row": i} for i in range(2)]
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        rows = asyncio.run(gather_symbols(get_one, ["a", "bad", "b"], max_workers=2))
+    assert [(r["symbol"], r["row"]) for r in rows] == [("a", 0), ("a", 1), ("b", 0), ("b", 1)]
+    assert "bad" in str(caught[0].message)
+
+    with pytest.raises(OpenBBError):
+        asyncio.run(gather_symbols(get_one, ["bad"]))
@@ -0,0 +1,37 @@
+import sqlite3
+import time
+from datetime import date
+
+import pandas as pd
+
+from openbb_tushare.utils.disclosure import recent_periods, stale_symbols, write_disclosures
+from openbb_tushare.utils.fundamentals_store import FundamentalsStore
+
+def test_recent_periods():
+    assert recent_periods(date(2024, 4, 15)) == ["20240331", "20231231"]
+    assert recent_periods(date(2024, 1, 1), count=3) == ["20231231", "20230930", "20230630"]
+
+def test_stale_symbols(tmp_path):
+    store = FundamentalsStore(str(tmp_path / "equity.db"))
+    store.write("income_statement", pd.DataFrame({
+        "ts_code": ["600000.SH", "000001.SZ", "000002.SZ"],
+        "end_date": ["20231231", "20231231", "20240331"],
+        "total_revenue": [1.0, 2.0, 3.0],
+    }))
+    # Last synced on 2024-04-10
+    synced = time.mktime((2024, 4, 10, 12, 0, 0, 0, 0, -1))
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute("UPDATE cache_meta SET last_sync = ?", (synced,))
+
+    write_disclosures(pd.DataFrame({
+        "ts_code": ["600000.SH", "000001.SZ", "000002.SZ", "601318.SH"],
+        "end_date": ["20240331"] * 4,
+        "pre_date": ["20240420", "20240428", "20240415", "20240420"],
+        # Published after the sync, not yet published, already cached, never cached
+        "actual_date": ["20240420", None, "20240415", "20240420"],
+        "modify_date": [None, "20240410,20240428", None, None],
+    }), db_path=store.db_path)
+
+    assert stale_symbols("income_statement", today=date(2024, 4, 30), db_path=store.db_path) == ["600000.SH"]
+    assert stale_symbols("income_statement", today=date(2024, 4, 19), db_path=store.db_path) == []
+    assert stale_symbols("income_statement", ["000001"], today=date(2024, 4, 30), db_path=store.db_path) == []
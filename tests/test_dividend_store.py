@@ -0,0 +1,53 @@
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from openbb_tushare.utils.cache_meta import record_meta
+from openbb_tushare.utils.dividend_store import DividendStore, is_fresh
+
+def make_dividends():
+    return pd.DataFrame({
+        "ts_code": ["600000.SH", "600000.SH", "600000.SH", "000001.SZ"],
+        "end_date": ["20221231", "20231231", "20231231", "20231231"],
+        "div_proc": ["实施", "预案", "实施", "实施"],
+        "cash_div": [0.41, 0.32, 0.32, 0.72],
+        "record_date": ["20230713", None, "20240718", "20240613"],
+        # The plan has no ex-dividend date yet
+        "ex_date": ["20230714", None, "20240719", "20240614"],
+    })
+
+def test_write_keeps_implemented_dividends(tmp_path):
+    store = DividendStore(str(tmp_path / "equity.db"))
+    assert store.write(make_dividends()) == 3
+    assert store.write(make_dividends()) == 3
+
+    result = store.read("600000")
+    assert result["ex_date"].tolist() == ["20230714", "20240719"]
+    assert store.read("600000", "20240101", "20241231")["cash_div"].tolist() == [0.32]
+
+def test_read_market_range(tmp_path):
+    store = DividendStore(str(tmp_path / "equity.db"))
+    store.write(make_dividends())
+
+    result = store.read(None, "20240601", "20240731")
+    assert result["ts_code"].tolist() == ["000001.SZ", "600000.SH"]
+    assert store.read(None, "20240701", "20240731", by="record_date")["record_date"].tolist() == ["20240718"]
+
+def test_is_fresh():
+    synced = datetime(2024, 6, 14, 18, 0).timestamp()
+    assert not is_fresh("20240614", None)
+    # Synced after the date passed
+    assert is_fresh("20240613", synced, now=synced + 30 * 86400)
+    # A date not passed yet is synced again after the TTL
+    assert is_fresh("20240620", synced, now=synced + 3600)
+    assert not is_fresh("20240620", synced, now=synced + 86400)
+
+def test_synced_dates(tmp_path):
+    store = DividendStore(str(tmp_path / "equity.db"))
+    record_meta("dividends_ex_date", "20240614", "20240614", "20240614", 1, db_path=store.db_path)
+    record_meta("dividends_record_date", "20240614", "20240614", "20240614", 1, db_path=store.db_path)
+
+    synced = store.synced_dates("ex_date", "20240601", "20240630")
+    assert list(synced) == ["20240614"]
+    assert synced["20240614"] <= time.time()
@@ -0,0 +1,105 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from openbb_tushare.utils import ts_equity_historical, ts_trade_calendar
+from openbb_tushare.utils.bar_store import SqliteBarStore
+from openbb_tushare.utils.ts_equity_historical import (
+    backfill_daily_bars,
+    get_ingested_sessions,
+    get_missing_head,
+    ingest_trade_date,
+    record_ingested,
+    sync_bars,
+)
+from openbb_tushare.utils.ts_trade_calendar import TradingCalendar
+
+CODES = ["600000.SH", "000001.SZ"]
+
+class FakePro:
+    def __init__(self):
+        self.calls = []
+
+    def daily(self, ts_code=None, trade_date=None, start_date=None, end_date=None):
+        self.calls.append({k: v for k, v in dict(ts_code=ts_code, trade_date=trade_date,
+                                                 start_date=start_date, end_date=end_date).items() if v})
+        if trade_date:
+            start_date = end_date = trade_date
+        days = pd.bdate_range(start_date, end_date).strftime("%Y%m%d")[::-1]
+        codes = [ts_code] if ts_code else CODES
+        return pd.DataFrame([
+            {"ts_code": code, "trade_date": day, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "vol": 10.0}
+            for code in codes for day in days
+        ])
+
+@pytest.fixture
+def pro(monkeypatch):
+    pro = FakePro()
+    days = pd.date_range("2024-01-01", "2024-03-31", freq="D")
+    calendar = TradingCalendar("SSE", pd.DataFrame({
+        "cal_date": days.strftime("%Y%m%d"),
+        "is_open": (days.weekday < 5).astype(int),
+        "pretrade_date": "",
+    }))
+    monkeypatch.setattr(ts_equity_historical.ts, "pro_api", lambda *args: pro)
+    monkeypatch.setattr(ts_trade_calendar, "get_trade_calendar", lambda market="SH", api_key="": calendar)
+    monkeypatch.setattr(ts_trade_calendar, "get_listing_dates", lambda ts_code, api_key="": (date(2024, 1, 2), None))
+    return pro
+
+@pytest.fixture
+def store(tmp_path):
+    return SqliteBarStore(db_path=str(tmp_path / "equity.db"))
+
+def test_sync_bars_fills_from_listing_then_from_high_water_mark(pro, store):
+    assert sync_bars("600000.SH", store, date(2024, 1, 31), api_key="token") == 22
+    assert pro.calls == [{"ts_code": "600000.SH", "start_date": "20240102", "end_date": "20240131"}]
+    assert store.water_marks("600000.SH") == ("20240102", "20240131")
+
+    # Only the sessions after the high-water mark are requested
+    pro.calls.clear()
+    assert sync_bars("600000.SH", store, date(2024, 2, 9), api_key="token") == 7
+    assert pro.calls == [{"ts_code": "600000.SH", "start_date": "20240201", "end_date": "20240209"}]
+
+    pro.calls.clear()
+    assert sync_bars("600000.SH", store, date(2024, 2, 9), api_key="token") == 0
+    assert pro.calls == []
+
+def test_sync_bars_fetches_missing_head(pro, store):
+    # A backfill left the history starting after the listing date
+    store.write("600000.SH", pd.DataFrame({"date": ["20240115", "20240116"], "close": [1.0, 1.0]}))
+    assert get_missing_head("600000.SH", "20240115", api_key="token") == date(2024, 1, 14)
+    assert get_missing_head("600000.SH", "20240102", api_key="token") is None
+
+    sync_bars("600000.SH", store, date(2024, 1, 16), api_key="token")
+    assert pro.calls == [{"ts_code": "600000.SH", "start_date": "20240102", "end_date": "20240114"}]
+    assert store.water_marks("600000.SH") == ("20240102", "20240116")
+
+def test_ingest_trade_date_splits_cross_section(pro, store):
+    assert ingest_trade_date(date(2024, 1, 3), api_key="token", store=store) == 2
+    assert pro.calls == [{"trade_date": "20240103"}]
+    assert store.water_marks("000001.SZ") == ("20240103", "20240103")
+    assert get_ingested_sessions("CN", store=store) == {"20240103"}
+    assert get_ingested_sessions("HK", store=store) == set()
+
+def test_backfill_resumes_from_ingest_log(pro, store):
+    # A previous run stopped after the first two sessions
+    record_ingested("CN", pd.DataFrame({"date": ["20240102", "20240103"]}), store=store)
+
+    assert backfill_daily_bars(date(2024, 1, 2), date(2024, 1, 7), markets=["CN"],
+                               api_key="token", batch_sessions=2, store=store) == 4
+    assert pro.calls == [{"trade_date": day} for day in ["20240104", "20240105"]]
+    assert get_ingested_sessions("CN", store=store) == {"20240102", "20240103", "20240104", "20240105"}
+
+    pro.calls.clear()
+    assert backfill_daily_bars(date(2024, 1, 2), date(2024, 1, 7), markets=["CN"], api_key="token", store=store) == 0
+    assert pro.calls == []
+
+def test_ingest_log_follows_the_store(pro, store, tmp_path):
+    other = SqliteBarStore(db_path=str(tmp_path / "other.db"))
+    ingest_trade_date(date(2024, 1, 3), api_key="token", store=store)
+
+    assert get_ingested_sessions("CN", store=other) == set()
+    pro.calls.clear()
+    backfill_daily_bars(date(2024, 1, 3), date(2024, 1, 3), markets=["CN"], api_key="token", store=other)
+    assert pro.calls == [{"trade_date": "20240103"}]
@@ -0,0 +1,60 @@
+import pandas as pd
+from mysharelib.table_cache import TableCache
+
+from openbb_tushare.utils import cache_meta, ts_equity_profile
+from openbb_tushare.utils.concurrency import RateLimiter
+from openbb_tushare.utils.ts_equity_profile import (
+    EQUITY_INFO_SCHEMA,
+    complete_a_profiles,
+    complete_hk_profiles,
+    download_companies,
+    warm_equity_profiles,
+    write_profiles,
+)
+
+class FakePro:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def stock_company(self, exchange, fields, limit, offset):
+        self.calls.append(offset)
+        codes = [f"{600000 + i}.SH" for i in range(self.rows)][offset:offset + limit]
+        return pd.DataFrame({"ts_code": codes, "com_name": codes, "employees": 10})
+
+    def hk_basic(self):
+        return pd.DataFrame({"ts_code": ["00700.HK"], "name": ["Tencent"], "enname": ["Tencent"]})
+
+def test_download_companies_pages(monkeypatch):
+    monkeypatch.setattr(ts_equity_profile, "PROFILE_PAGE_SIZE", 2)
+    monkeypatch.setattr(ts_equity_profile, "get_rate_limiter", lambda: RateLimiter(1e9))
+    pro = FakePro(rows=5)
+
+    data = download_companies(pro, "SSE")
+    assert len(data) == 5
+    assert pro.calls == [0, 2, 4]
+
+def test_write_profiles_in_one_transaction(tmp_path):
+    cache = TableCache(EQUITY_INFO_SCHEMA, db_path=str(tmp_path / "equity.db"), table_name="equity_profile", primary_key="ts_code")
+    a_shares = complete_a_profiles(pd.DataFrame({"ts_code": ["600000.SH"], "com_name": ["Pudong Bank"], "employees": [10]}))
+    hk = complete_hk_profiles(pd.DataFrame({"ts_code": ["00700.HK"], "name": ["Tencent"], "enname": ["Tencent"], "extra": [1]}))
+
+    assert write_profiles(cache, pd.concat([a_shares, hk], ignore_index=True)) == 2
+    assert write_profiles(cache, a_shares.assign(employees=20)) == 1
+
+    data = cache.read_dataframe().set_index("ts_code")
+    assert data.loc["600000.SH", "name"] == "Pudong Bank"
+    assert data.loc["600000.SH", "employees"] == 20
+    assert data.loc["00700.HK", "chairman"] == ""
+
+def test_warm_records_meta_per_exchange(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "equity.db")
+    monkeypatch.setattr(ts_equity_profile.ts, "pro_api", lambda *args: FakePro(rows=3))
+    monkeypatch.setattr(ts_equity_profile, "get_rate_limiter", lambda: RateLimiter(1e9))
+    monkeypatch.setattr(ts_equity_profile, "TableCache", lambda *args, **kwargs: TableCache(*args, **{**kwargs, "db_path": db_path}))
+    monkeypatch.setattr(cache_meta, "get_cache_path", lambda project: db_path)
+
+    assert warm_equity_profiles(["SSE", "HK"], api_key="token") == 4
+    assert cache_meta.get_meta("equity_profile_exchange", "SSE").row_count == 3
+    assert cache_meta.get_meta("equity_profile_exchange", "HK").row_count == 1
+    assert cache_meta.get_meta("equity_profile") is None
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+import pandas as pd
+
+from openbb_tushare.utils import quote_cache, ts_equity_quote
+
+class FakePro:
+    def rt_hk_k(self, ts_code):
+        codes = ts_code.split(",")
+        return pd.DataFrame({"ts_code": codes, "open": 1.0, "high": 1.0, "low": 1.0,
+                             "close": 1.0, "vol": 10.0, "pre_close": 1.0})
+
+def test_get_quotes_batches_by_market(monkeypatch):
+    requests = []
+
+    def realtime_quote(ts_code):
+        requests.append(ts_code)
+        codes = ts_code.split(",")
+        return pd.DataFrame({"TS_CODE": codes, "NAME": codes, "BID": 1.0, "ASK": 1.0, "PRICE": 1.0,
+                             "OPEN": 1.0, "HIGH": 1.0, "LOW": 1.0, "VOLUME": 1.0, "PRE_CLOSE": 1.0})
+
+    monkeypatch.setattr(ts_equity_quote, "QUOTE_CHUNK_SIZE", {"CN": 2, "HK": 2})
+    monkeypatch.setattr(quote_cache, "_quote_cache", quote_cache.QuoteCache(ttl=60))
+    monkeypatch.setattr(quote_cache, "quote_expiry", lambda market, now, ttl, api_key="": now + timedelta(seconds=ttl))
+    monkeypatch.setattr(ts_equity_quote.ts, "set_token", lambda token: None)
+    monkeypatch.setattr(ts_equity_quote.ts, "realtime_quote", realtime_quote)
+    monkeypatch.setattr(ts_equity_quote.ts, "pro_api", lambda token: FakePro())
+
+    symbols = ["600000.SH", "00700.HK", "000001.SZ", "600519.SH", "600000.SH"]
+    data = ts_equity_quote.get_quotes(symbols, api_key="token")
+
+    assert data["ts_code"].tolist() == ["600000.SH", "00700.HK", "000001.SZ", "600519.SH"]
+    assert sorted(requests) == ["600000.SH,000001.SZ", "600519.SH"]
+
+    # Cached quotes are served without another request
+    assert ts_equity_quote.get_quotes(["600519.SH", "00700.HK"], api_key="token")["ts_code"].tolist() == ["600519.SH", "00700.HK"]
+    assert len(requests) == 2
@@ -0,0 +1,76 @@
+import pandas as pd
+
+from openbb_tushare.utils import fundamentals_store
+from openbb_tushare.utils.cache_meta import get_meta
+from openbb_tushare.utils.concurrency import RateLimiter
+from openbb_tushare.utils.fundamentals_store import FundamentalsStore, ingest_period
+
+def make_income(ts_codes, end_date="20231231", revenue=100.0, ann_date="20240330"):
+    return pd.DataFrame({
+        "ts_code": ts_codes,
+        "ann_date": ann_date,
+        "end_date": end_date,
+        "end_type": "4",
+        "total_revenue": revenue,
+    })
+
+def test_write_keeps_latest_version(tmp_path):
+    store = FundamentalsStore(str(tmp_path / "equity.db"))
+    data = pd.concat([
+        make_income(["600000.SH"], revenue=100.0),
+        make_income(["600000.SH"], revenue=110.0, ann_date="20240425"),
+        make_income(["600000.SH"], end_date="20230930", revenue=70.0).assign(n_income=7.0),
+    ])
+    assert store.write("income_statement", data) == 2
+
+    result = store.read("income_statement", "600000")
+    assert result["end_date"].tolist() == ["20231231", "20230930"]
+    assert result["total_revenue"].tolist() == [110.0, 70.0]
+    assert "n_income" in store.columns("income_statement")
+    meta = get_meta("income_statement", "600000.SH", db_path=store.db_path)
+    assert (meta.min_date, meta.max_date, meta.row_count) == ("20230930", "20231231", 2)
+
+class FakePro:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def income_vip(self, period, limit, offset):
+        self.calls.append(offset)
+        codes = [f"{600000 + i}.SH" for i in range(self.rows)][offset:offset + limit]
+        return make_income(codes, end_date=period)
+
+def test_ingest_period_pages(tmp_path, monkeypatch):
+    pro = FakePro(rows=5)
+    monkeypatch.setattr(fundamentals_store, "PERIOD_PAGE_SIZE", 2)
+    monkeypatch.setattr(fundamentals_store, "get_rate_limiter", lambda: RateLimiter(1e9))
+    monkeypatch.setattr(fundamentals_store.ts, "pro_api", lambda token: pro)
+    store = FundamentalsStore(str(tmp_path / "equity.db"))
+
+    assert ingest_period("2023-12-31", ["income_statement"], api_key="token", store=store) == {"income_statement": 5}
+    assert pro.calls == [0, 2, 4]
+    assert len(store.read_period("income_statement", "20231231", ["total_revenue"])) == 5
+
+def test_as_of_returns_versions_known_then(tmp_path):
+    store = FundamentalsStore(str(tmp_path / "equity.db"))
+    store.write("income_statement", pd.concat([
+        make_income(["600000.SH", "000001.SZ"], revenue=100.0, ann_date="20240330").assign(update_flag="0"),
+        # Restatement of 600000.SH announced in August
+        make_income(["600000.SH"], revenue=90.0, ann_date="20240820").assign(update_flag="1"),
+        make_income(["600000.SH"], end_date="20240331", revenue=30.0, ann_date="20240425").assign(update_flag="0"),
+    ]))
+    # The statement table holds the latest versions only
+    assert store.read("income_statement", "600000.SH")["total_revenue"].tolist() == [30.0, 90.0]
+
+    before = store.as_of("income_statement", ["600000.SH", "000001.SZ"], "20240329")
+    assert before.empty
+
+    april = store.as_of("income_statement", ["600000.SH", "000001.SZ"], "2024-04-30")
+    assert april[["ts_code", "end_date", "total_revenue"]].values.tolist() == [
+        ["000001.SZ", "20231231", 100.0],
+        ["600000.SH", "20240331", 30.0],
+        ["600000.SH", "20231231", 100.0],
+    ]
+
+    september = store.as_of("income_statement", ["600000.SH"], "20240901")
+    assert september["total_revenue"].tolist() == [30.0, 90.0]
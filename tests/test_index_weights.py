@@ -0,0 +1,90 @@
+from datetime import date
+
+import pandas as pd
+
+from openbb_tushare.utils import index_weights
+from openbb_tushare.utils.concurrency import RateLimiter
+from openbb_tushare.utils.index_weights import IndexWeights, IndexWeightStore, sync_index_weights
+from openbb_tushare.utils.ts_index_historical import build_index_codes, build_index_listing
+
+def make_weights():
+    return pd.DataFrame({
+        "index_code": "000300.SH",
+        "trade_date": ["20240131", "20240131", "20240229", "20240229", "20240329"],
+        "con_code": ["600519.SH", "300750.SZ", "600519.SH", "601318.SH", "600519.SH"],
+        "weight": [6.0, 3.0, 5.5, 2.5, 5.0],
+    })
+
+def test_store_as_of(tmp_path):
+    store = IndexWeightStore(str(tmp_path / "equity.db"))
+    assert store.write(make_weights()) == 5
+
+    snapshot = store.as_of("000300.SH", "20240315")
+    assert snapshot["trade_date"].unique().tolist() == ["20240229"]
+    assert snapshot["con_code"].tolist() == ["600519.SH", "601318.SH"]
+    assert store.as_of("000300.SH", "20231231").empty
+
+def test_index_weights_as_of():
+    weights = IndexWeights(make_weights())
+    assert weights.as_of("20240130").empty
+    assert weights.as_of("20240131")["con_code"].tolist() == ["600519.SH", "300750.SZ"]
+    assert weights.as_of(date(2024, 3, 28))["trade_date"].unique().tolist() == ["20240229"]
+    assert weights.weights("20241231").to_dict() == {"600519.SH": 0.05}
+
+def test_sync_fetches_outside_window(tmp_path, monkeypatch):
+    calls = []
+
+    class Pro:
+        def index_weight(self, index_code, start_date, end_date):
+            calls.append((start_date, end_date))
+            return make_weights()[lambda df: df["trade_date"].between(start_date, end_date)]
+
+    monkeypatch.setattr(index_weights.ts, "pro_api", lambda *args: Pro())
+    monkeypatch.setattr(index_weights, "get_rate_limiter", lambda: RateLimiter(1e9))
+    store = IndexWeightStore(str(tmp_path / "equity.db"))
+
+    assert sync_index_weights("000300.SH", "20240201", "20240331", api_key="token", store=store) == 3
+    assert store.synced_window("000300.SH") == ("20240201", "20240331")
+    calls.clear()
+    assert sync_index_weights("000300.SH", "20240215", "20240320", api_key="token", store=store) == 0
+    assert calls == []
+    # Only the days before the window are fetched
+    sync_index_weights("000300.SH", "20240101", "20240301", api_key="token", store=store)
+    assert calls == [("20240101", "20240131")]
+    assert store.synced_window("000300.SH") == ("20240101", "20240331")
+
+def test_sync_without_cache_extends_window(tmp_path, monkeypatch):
+    calls = []
+
+    class Pro:
+        def index_weight(self, index_code, start_date, end_date):
+            calls.append((start_date, end_date))
+            return make_weights()[lambda df: df["trade_date"].between(start_date, end_date)]
+
+    monkeypatch.setattr(index_weights.ts, "pro_api", lambda *args: Pro())
+    monkeypatch.setattr(index_weights, "get_rate_limiter", lambda: RateLimiter(1e9))
+    store = IndexWeightStore(str(tmp_path / "equity.db"))
+
+    sync_index_weights("000300.SH", "20240101", "20240331", api_key="token", store=store)
+    calls.clear()
+    # A refetch inside the window does not shrink it
+    sync_index_weights("000300.SH", "20240215", "20240229", api_key="token", use_cache=False, store=store)
+    assert calls == [("20240215", "20240229")]
+    assert store.synced_window("000300.SH") == ("20240101", "20240331")
+    # A refetch past the window also fetches the gap to it
+    calls.clear()
+    sync_index_weights("000300.SH", "20240501", "20240510", api_key="token", use_cache=False, store=store)
+    assert calls == [("20240401", "20240510")]
+    assert store.synced_window("000300.SH") == ("20240101", "20240510")
+
+def test_index_catalog_views():
+    indices = pd.DataFrame({
+        "ts_code": ["000300.SH", "000300.CSI", "930050.CSI"],
+        "list_date": ["20050408", None, None],
+        "base_date": ["20041231", "20041231", "20140630"],
+        "exp_date": [None, None, "20200101"],
+    })
+    assert build_index_codes(indices) == {"000300": "000300.SH", "930050": "930050.CSI"}
+    listing = build_index_listing(indices)
+    assert listing["000300.SH"] == (date(2005, 4, 8), None)
+    assert listing["930050.CSI"] == (date(2014, 6, 30), date(2020, 1, 1))
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from openbb_tushare.utils import ts_trade_calendar
+from openbb_tushare.utils.quote_cache import MARKET_TZ, QuoteCache, quote_expiry
+from openbb_tushare.utils.ts_trade_calendar import TradingCalendar, get_trade_calendar
+
+@pytest.fixture(autouse=True)
+def calendar(monkeypatch):
+    # 2024-10-01..07 is the National Day holiday
+    days = pd.date_range("2024-09-28", "2024-10-12", freq="D")
+    holiday = (days >= "2024-10-01") & (days <= "2024-10-07")
+    cal_df = pd.DataFrame({
+        "cal_date": days.strftime("%Y%m%d"),
+        "is_open": ((days.weekday < 5) & ~holiday).astype(int),
+        "pretrade_date": "",
+    })
+    calendar = TradingCalendar("SSE", cal_df)
+    monkeypatch.setattr(ts_trade_calendar, "get_trade_calendar", lambda market="SH", api_key="": calendar)
+    return calendar
+
+def at(month, day, hour, minute=0, second=0):
+    return datetime(2024, month, day, hour, minute, second, tzinfo=MARKET_TZ)
+
+def test_quote_expiry_in_session():
+    assert quote_expiry("CN", at(9, 30, 10), 5) == at(9, 30, 10, 0, 5)
+    # 15:30 is after the A-share close but still within the HK afternoon session
+    assert quote_expiry("HK", at(10, 8, 15, 30), 5) == at(10, 8, 15, 30, 5)
+
+def test_quote_expiry_outside_session():
+    assert quote_expiry("CN", at(9, 30, 9), 5) == at(9, 30, 9, 30)
+    assert quote_expiry("CN", at(9, 30, 12), 5) == at(9, 30, 13)
+    # After the close a quote is held over the holiday until the next open
+    assert quote_expiry("CN", at(9, 30, 15, 30), 5) == at(10, 8, 9, 30)
+    assert quote_expiry("HK", at(10, 3, 10), 5) == at(10, 8, 9, 30)
+
+def test_quote_cache_ttl_and_lru():
+    cache = QuoteCache(ttl=5, max_entries=2)
+    now = at(9, 30, 10).timestamp()
+    cache.put("600000.SH", {"last_price": 1.0}, now=now)
+    cache.put("000001.SZ", {"last_price": 2.0}, now=now)
+    assert cache.get("600000.SH", now=now + 1) == {"last_price": 1.0}
+
+    cache.put("600519.SH", {"last_price": 3.0}, now=now)
+    assert cache.get("000001.SZ", now=now + 1) is None
+    assert len(cache) == 2
+    assert cache.get("600000.SH", now=now + 6) is None
+
+def test_put_passes_api_key(monkeypatch, calendar):
+    keys = []
+
+    def get_trade_calendar(market="SH", api_key=""):
+        keys.append(api_key)
+        return calendar
+
+    monkeypatch.setattr(ts_trade_calendar, "get_trade_calendar", get_trade_calendar)
+    QuoteCache(ttl=5).put("600000.SH", {"last_price": 1.0}, now=at(9, 30, 10).timestamp(), api_key="token")
+    assert keys == ["token"]
+
+def test_cold_calendar_without_key_falls_back_to_ttl(monkeypatch):
+    from openbb_tushare.utils import helpers
+
+    class EmptyCache:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def read_dataframe(self):
+            return pd.DataFrame()
+
+    # Real calendar loader, nothing cached and no key in the environment
+    monkeypatch.setattr(ts_trade_calendar, "get_trade_calendar", get_trade_calendar)
+    monkeypatch.setattr(ts_trade_calendar, "_calendars", {})
+    monkeypatch.setattr(ts_trade_calendar, "TableCache", EmptyCache)
+    monkeypatch.setattr(helpers, "load_dotenv", lambda: None)
+    monkeypatch.delenv("TUSHARE_API_KEY", raising=False)
+
+    cache = QuoteCache(ttl=5)
+    now = at(9, 30, 15, 30).timestamp()
+    cache.put("600000.SH", {"last_price": 1.0}, now=now)
+    assert cache.get("600000.SH", now=now + 1) == {"last_price": 1.0}
+    assert cache.get("600000.SH", now=now + 6) is None
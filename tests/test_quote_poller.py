@@ -0,0 +1,68 @@
+import asyncio
+
+import pandas as pd
+
+from openbb_tushare.utils.quote_poller import QuotePoller
+
+class FakeQuotes:
+    def __init__(self):
+        self.prices = {"600000.SH": 10.0, "000001.SZ": 20.0, "00700.HK": 300.0}
+        self.calls = []
+
+    def __call__(self, symbols, use_cache=True, api_key=""):
+        self.calls.append(sorted(symbols))
+        return pd.DataFrame([{"ts_code": s, "last_price": self.prices[s], "volume": 1.0} for s in symbols])
+
+def test_poller_shares_polls_and_pushes_changes():
+    async def scenario():
+        fetch = FakeQuotes()
+        poller = QuotePoller(interval=0.01, fetch=fetch)
+        first = poller.subscribe(["600000.SH", "000001.SZ"])
+        second = poller.subscribe(["600000.SH", "00700.HK"])
+
+        # The first tick reports every symbol once, in one upstream call for all subscribers
+        assert [row["ts_code"] for row in await first.__anext__()] == ["600000.SH", "000001.SZ"]
+        assert [row["ts_code"] for row in await second.__anext__()] == ["600000.SH", "00700.HK"]
+        assert fetch.calls[0] == ["000001.SZ", "00700.HK", "600000.SH"]
+
+        fetch.prices["00700.HK"] = 301.0
+        assert await second.__anext__() == [{"ts_code": "00700.HK", "last_price": 301.0, "volume": 1.0}]
+        assert first._queue.empty()
+
+        first.close()
+        assert poller.symbols == ["600000.SH", "00700.HK"]
+        await poller.stop()
+        assert poller.symbols == []
+
+    asyncio.run(scenario())
+
+def test_poller_snapshot_for_late_subscriber():
+    async def scenario():
+        poller = QuotePoller(interval=60, fetch=FakeQuotes())
+        async with poller.subscribe(["600000.SH"]) as first:
+            await first.__anext__()
+            late = poller.subscribe(["600000.SH"])
+            assert [row["last_price"] for row in await late.__anext__()] == [10.0]
+            quiet = poller.subscribe(["600000.SH"], snapshot=False)
+            assert quiet._queue.empty()
+        await poller.stop()
+
+    asyncio.run(scenario())
+
+def test_poller_forgets_unsubscribed_symbols():
+    async def scenario():
+        poller = QuotePoller(interval=60, fetch=FakeQuotes())
+        first = poller.subscribe(["600000.SH", "000001.SZ"])
+        second = poller.subscribe(["600000.SH"])
+        await first.__anext__()
+
+        first.close()
+        assert list(poller._last) == ["600000.SH"]
+        # Rows of a poll that was in flight when the symbol left are not kept either
+        poller.diff([{"ts_code": "000001.SZ", "last_price": 20.0, "volume": 1.0}])
+        assert list(poller._last) == ["600000.SH"]
+        second.close()
+        assert poller._last == {}
+        await poller.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,56 @@
+import os
+
+import pandas as pd
+
+from openbb_tushare.utils.cache_meta import record_dataframe
+from openbb_tushare.utils.reference_data import ReferenceRegistry, ReferenceTable
+
+SYMBOLS = pd.DataFrame({
+    "ts_code": ["600000.SH", "00700.HK"],
+    "name": ["浦发银行", "腾讯控股"],
+    "market": ["主板", None],
+    "exchange": ["SSE", "HKEX"],
+})
+
+def make_registry(tmp_path, loads):
+    db_path = str(tmp_path / "equity.db")
+
+    def load_symbols(use_cache, api_key=""):
+        loads.append(use_cache)
+        return SYMBOLS
+
+    tables = {"symbols": ReferenceTable(load_symbols, ("market", "exchange"))}
+    return ReferenceRegistry(tables, db_path=db_path), db_path
+
+def test_tables_are_compacted_and_memoized(tmp_path):
+    loads = []
+    registry, _ = make_registry(tmp_path, loads)
+
+    data = registry.get("symbols")
+    assert isinstance(data["exchange"].dtype, pd.CategoricalDtype)
+    assert registry.get("symbols") is data
+    assert registry.lookup("symbols", "600000.SH")["exchange"] == "SSE"
+    assert registry.lookup("symbols", "00700")["name"] == "腾讯控股"
+    assert registry.lookup("symbols", "000001.SZ") is None
+    assert loads == [True]
+
+def test_reload_only_after_new_sync(tmp_path):
+    loads = []
+    registry, db_path = make_registry(tmp_path, loads)
+    record_dataframe("symbols", SYMBOLS, db_path=db_path)
+    data = registry.get("symbols")
+    view = registry.derived("symbols", "codes", lambda df: set(df["ts_code"]))
+
+    # Another dataset written: the file changed, the symbols did not
+    record_dataframe("indices", SYMBOLS, db_path=db_path)
+    os.utime(db_path, (0, 12345))
+    assert registry.get("symbols") is data
+
+    record_dataframe("symbols", SYMBOLS, db_path=db_path)
+    os.utime(db_path, (0, 23456))
+    assert registry.get("symbols") is not data
+    assert registry.derived("symbols", "codes", lambda df: set(df["ts_code"])) is not view
+    assert loads == [True, True]
+
+    registry.get("symbols", use_cache=False)
+    assert loads == [True, True, False]
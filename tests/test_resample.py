@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from openbb_tushare.utils.resample import resample_bars
+
+@pytest.fixture
+def daily():
+    # 2024-09-30 is the last session before the National Day holiday
+    dates = ["20240926", "20240927", "20240930", "20241008", "20241009"]
+    return pd.DataFrame({
+        "date": pd.to_datetime(dates),
+        "open": [10.0, 11.0, 12.0, 13.0, 14.0],
+        "high": [10.5, 11.5, 12.5, 13.5, 14.5],
+        "low": [9.5, 10.5, 11.5, 12.5, 13.5],
+        "close": [10.2, 11.2, 12.2, 13.2, 14.2],
+        "pre_close": [10.0, 10.2, 11.2, 12.2, 13.2],
+        "volume": [100.0, 200.0, 300.0, 400.0, 500.0],
+        "amount": [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+
+def test_weekly(daily):
+    bars = resample_bars(daily, "weekly")
+    assert bars["date"].dt.strftime("%Y%m%d").tolist() == ["20240927", "20240930", "20241009"]
+    first = bars.iloc[0]
+    assert (first["open"], first["high"], first["low"], first["close"]) == (10.0, 11.5, 9.5, 11.2)
+    assert first["volume"] == 300.0
+    assert bars["pre_close"].tolist() == [10.0, 11.2, 12.2]
+    assert bars["change"].iloc[2] == pytest.approx(2.0)
+    assert bars["change_percent"].iloc[2] == pytest.approx(2.0 / 12.2 * 100)
+
+def test_monthly(daily):
+    bars = resample_bars(daily, "monthly")
+    assert bars["date"].dt.strftime("%Y%m%d").tolist() == ["20240930", "20241009"]
+    assert bars["amount"].tolist() == [6.0, 9.0]
+
+def test_monthly_without_pre_close(daily):
+    bars = resample_bars(daily.drop(columns=["pre_close"]), "monthly", pre_close=9.0)
+    assert bars["pre_close"].tolist() == [9.0, 12.2]
+
+def test_get_resampled_rebuilds_after_gap_repair(tmp_path, daily):
+    from openbb_tushare.utils import resample
+    from openbb_tushare.utils.bar_store import SqliteBarStore
+
+    def marks():
+        return store.water_marks("600000.SH") + (store.row_count("600000.SH"),)
+
+    store = SqliteBarStore(db_path=str(tmp_path / "equity.db"))
+    bars = daily.assign(date=daily["date"].dt.strftime("%Y%m%d"))
+    # 2024-09-27 is missing
+    store.write("600000.SH", bars.drop(index=1))
+    resample._memo.clear()
+    weekly = resample.get_resampled("600000.SH", "weekly", store, marks())
+    assert weekly["volume"].iloc[0] == 100.0
+
+    # Filling the hole leaves the water marks unchanged
+    store.write("600000.SH", bars.iloc[[1]])
+    weekly = resample.get_resampled("600000.SH", "weekly", store, marks())
+    assert weekly["volume"].iloc[0] == 300.0
+
+    # Rows appended after the high-water mark only recompute the trailing bucket
+    store.write("600000.SH", bars.iloc[[4]].assign(date="20241010", volume=50.0))
+    weekly = resample.get_resampled("600000.SH", "weekly", store, marks())
+    assert weekly["volume"].tolist() == [300.0, 300.0, 950.0]
@@ -0,0 +1,79 @@
+import pandas as pd
+
+from openbb_tushare.utils import fundamentals_store
+from openbb_tushare.utils.statement_mapping import infer_fiscal_year_end, map_statement
+from openbb_tushare.utils.ts_balance_sheet import get_balance_sheet
+
+def test_map_a_share_statement():
+    data = pd.DataFrame({
+        "ts_code": "600000.SH",
+        "end_date": ["20231231", "20230930"],
+        "end_type": ["4", "3"],
+        "total_revenue": [4.0, 3.0],
+        "n_income": [1.0, 0.7],
+        "basic_eps": [0.5, 0.3],
+        "unmapped_field": [1, 2],
+    })
+    result = map_statement("income_statement", data)
+    assert list(result.columns) == [
+        "total_revenue", "net_income", "basic_earnings_per_share", "fiscal_year", "period_ending", "fiscal_period",
+    ]
+    assert result["fiscal_period"].tolist() == ["FY", "Q3"]
+    assert result["fiscal_year"].tolist() == [2023, 2023]
+    assert result["period_ending"].iloc[1] == pd.Timestamp("2023-09-30")
+
+def test_map_hk_line_items():
+    data = pd.DataFrame({
+        "ts_code": "00700.HK",
+        "end_date": ["20230630", "20230630", "20231231", "20231231", "20231231"],
+        "name": "腾讯控股",
+        "ind_name": ["总资产", "总负债", "总资产", "总负债", "未知科目"],
+        "ind_value": ["100", "60", 120.0, 70.0, 1.0],
+    })
+    result = map_statement("balance_sheet", data)
+    assert result[["total_assets", "total_liabilities"]].values.tolist() == [[120.0, 70.0], [100.0, 60.0]]
+    assert result["fiscal_period"].tolist() == ["FY", "Q2"]
+
+def test_map_hk_march_year_end():
+    data = pd.DataFrame({
+        "ts_code": "00992.HK",
+        "end_date": ["20240331", "20231231", "20230930", "20230630"],
+        "ind_name": "总资产",
+        "ind_value": [4.0, 3.0, 2.0, 1.0],
+    })
+    assert map_statement("balance_sheet", data)["fiscal_period"].tolist() == ["Q1", "FY", "Q3", "Q2"]
+
+    result = map_statement("balance_sheet", data, fiscal_year_end=3)
+    assert result["fiscal_period"].tolist() == ["FY", "Q3", "Q2", "Q1"]
+    assert result["fiscal_year"].tolist() == [2024, 2024, 2024, 2024]
+
+def test_infer_fiscal_year_end():
+    income = pd.DataFrame({
+        "end_date": ["20240331", "20230930", "20230331", "20220930"],
+        "total_revenue": [120.0, 55.0, 100.0, 50.0],
+    })
+    assert infer_fiscal_year_end(income) == 3
+    assert infer_fiscal_year_end(income.assign(end_date=["20231231", "20230630", "20221231", "20220630"])) == 12
+    assert infer_fiscal_year_end(pd.DataFrame({"end_date": ["20240630", "20230630"]})) == 6
+    assert infer_fiscal_year_end(pd.DataFrame()) == 12
+
+def test_hk_annual_statements_use_fiscal_year_end(monkeypatch):
+    statements = {
+        "income_statement": pd.DataFrame({
+            "ts_code": "00992.HK",
+            "end_date": ["20240331", "20230930", "20230331"],
+            "total_revenue": [120.0, 55.0, 100.0],
+        }),
+        "balance_sheet": pd.DataFrame({
+            "ts_code": "00992.HK",
+            "end_date": ["20240331", "20230930", "20230331"],
+            "total_assets": [3.0, 2.0, 1.0],
+        }),
+    }
+    monkeypatch.setattr(fundamentals_store, "load_statement", lambda statement, *args, **kwargs: statements[statement])
+
+    result = get_balance_sheet("00992.HK", period="annual", api_key="token")
+    assert result["total_assets"].tolist() == [3.0, 1.0]
+    assert result["fiscal_period"].tolist() == ["FY", "FY"]
+    assert result["fiscal_year"].tolist() == [2024, 2023]
+    assert get_balance_sheet("00992.HK", period="quarter", api_key="token")["fiscal_period"].tolist() == ["FY", "Q2", "FY"]
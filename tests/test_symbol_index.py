@@ -0,0 +1,36 @@
+import pandas as pd
+
+from openbb_tushare.utils.symbol_index import SymbolIndex
+
+SYMBOLS = pd.DataFrame({
+    "ts_code": ["000001.SZ", "600000.SH", "601318.SH", "00700.HK", "000002.SZ"],
+    "symbol": ["000001", "600000", "601318", "00700", "000002"],
+    "name": ["平安银行", "浦发银行", "中国平安", "腾讯控股", "万科A"],
+    "cnspell": ["payh", "pfyh", "zgpa", None, "wka"],
+    "enname": [None, None, None, "Tencent Holdings Ltd.", None],
+})
+
+def test_exact_code_ranks_first():
+    index = SymbolIndex(SYMBOLS)
+    result = index.search("600000")
+    assert result["ts_code"].tolist() == ["600000.SH"]
+
+def test_prefix_and_limit():
+    index = SymbolIndex(SYMBOLS)
+    assert index.search("0000", limit=1)["ts_code"].tolist() == ["000001.SZ"]
+    # Code prefixes first, then the substring hit
+    assert index.search("0000")["ts_code"].tolist() == ["000001.SZ", "000002.SZ", "600000.SH"]
+    # Pinyin prefix before the pinyin substring
+    assert index.search("PA")["ts_code"].tolist() == ["000001.SZ", "601318.SH"]
+
+def test_substring_on_names():
+    index = SymbolIndex(SYMBOLS)
+    # Prefix hit on the name ranks before the substring hit
+    assert index.search("平安")["ts_code"].tolist() == ["000001.SZ", "601318.SH"]
+    assert index.search("holdings")["ts_code"].tolist() == ["00700.HK"]
+    assert index.search("银行", is_symbol=True).empty
+
+def test_empty_query_returns_first_rows():
+    index = SymbolIndex(SYMBOLS)
+    assert len(index.search("", limit=2)) == 2
+    assert len(index.search("")) == len(SYMBOLS)
@@ -16,7 +16,7 @@ def table_cache(test_db_path):
     #db_path = ':memory:'
     db_path = test_db_path
     table_name = 'equity_info'
-    cache = TableCache(table_schema, db_path, table_name)
+    cache = TableCache(table_schema, db_path=db_path, table_name=table_name)
     test_data = pd.DataFrame({
         'symbol': ['AAPL', 'MSFT', 'GOOGL'],
         'name': ['Apple', 'Microsoft', 'Google'],
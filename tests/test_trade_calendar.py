@@ -0,0 +1,40 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from openbb_tushare.utils.ts_trade_calendar import TradingCalendar
+
+@pytest.fixture
+def calendar():
+    # 2024-09-30 (Mon) is open, 2024-10-01..07 is the National Day holiday
+    days = pd.date_range("2024-09-28", "2024-10-12", freq="D")
+    holiday = (days >= "2024-10-01") & (days <= "2024-10-07")
+    is_open = ((days.weekday < 5) & ~holiday).astype(int)
+    cal_df = pd.DataFrame({
+        "cal_date": days.strftime("%Y%m%d"),
+        "is_open": is_open,
+        "pretrade_date": "",
+    })
+    return TradingCalendar("SSE", cal_df)
+
+def test_is_open(calendar):
+    assert calendar.is_open(date(2024, 9, 30))
+    assert not calendar.is_open(date(2024, 10, 1))
+    # Make-up working Saturdays stay closed on the exchange
+    assert not calendar.is_open(date(2024, 10, 12))
+
+def test_last_closing_day(calendar):
+    assert calendar.last_closing_day(date(2024, 10, 8)) == date(2024, 9, 30)
+    assert calendar.last_closing_day(date(2024, 10, 9)) == date(2024, 10, 8)
+
+def test_previous_and_next_session(calendar):
+    assert calendar.previous_session(date(2024, 10, 5)) == date(2024, 9, 30)
+    assert calendar.previous_session(date(2024, 10, 8)) == date(2024, 10, 8)
+    assert calendar.next_session(date(2024, 9, 30)) == date(2024, 10, 8)
+    assert calendar.next_session(date(2024, 10, 11)) is None
+
+def test_trading_days(calendar):
+    sessions = calendar.trading_days(date(2024, 9, 29), date(2024, 10, 9))
+    assert [str(d) for d in sessions] == ["2024-09-30", "2024-10-08", "2024-10-09"]
+    assert len(calendar.trading_days(date(2024, 10, 1), date(2024, 10, 7))) == 0